@@ -14,6 +14,9 @@ from openmdao.lib.casehandlers.dbcase import DBCaseIterator, DBCaseRecorder, \
 from openmdao.lib.casehandlers.dumpcase import DumpCaseRecorder
 from openmdao.lib.casehandlers.listcase import ListCaseRecorder, \
                                                ListCaseIterator
+from openmdao.lib.casehandlers.tablecase import TableCaseIterator, \
+                                                TableCaseRecorder, \
+                                                case_table_to_dict
 
 from openmdao.lib.casehandlers.caseset import CaseArray, CaseSet, \
                                               caseiter_to_caseset
@@ -4,7 +4,10 @@ DB (Python's sqlite.)
 
 import sys
 import sqlite3
+import time
 import uuid
+from ast import literal_eval
+from itertools import groupby
 from cPickle import dumps, loads, HIGHEST_PROTOCOL, UnpicklingError
 from optparse import OptionParser
 
@@ -30,6 +33,31 @@ def _query_split(query):
     else:
         raise ValueError("No allowable operator found in query '%s'" % query)
 
+def _selector_sql(selectors, attrs):
+    """Returns a tuple of the form (clauses, args), where clauses is a list
+    of SQL conditions for those selectors whose left-hand side is one of the
+    column names in `attrs`, and args is the list of values to be bound to
+    them. A right-hand side that isn't a column name is bound as a value.
+    """
+    clauses = []
+    args = []
+    for sel in selectors or []:
+        lhs, rel, rhs = _query_split(sel)
+        if lhs not in attrs:
+            continue
+        if rel == '==':
+            rel = '='
+        if rhs in attrs:
+            clauses.append("%s%s%s" % (lhs, rel, rhs))
+        else:
+            try:
+                value = literal_eval(rhs)
+            except (ValueError, SyntaxError):
+                value = rhs
+            clauses.append("%s%s?" % (lhs, rel))
+            args.append(value)
+    return (clauses, args)
+
 
 class DBCaseIterator(object):
     """Pulls Cases from a relational DB (sqlite). It doesn't support
@@ -39,7 +67,8 @@ class DBCaseIterator(object):
     
     implements(ICaseIterator)
     
-    def __init__(self, dbfile=':memory:', selectors=None, connection=None):
+    def __init__(self, dbfile=':memory:', selectors=None, connection=None,
+                 limit=None, offset=0):
         if connection is not None:
             self._dbfile = dbfile
             self._connection = connection
@@ -47,6 +76,8 @@ class DBCaseIterator(object):
             self._connection = None
             self.dbfile = dbfile
         self.selectors = selectors
+        self.limit = limit    # Maximum number of cases to return.
+        self.offset = offset  # Number of selected cases to skip.
         self._connection.text_factory = sqlite3.OptimizedUnicode
 
     @property
@@ -68,49 +99,58 @@ class DBCaseIterator(object):
         return self._next_case()
 
     def _next_case(self):
-        """ Generator which returns Cases one at a time. """
+        """ Generator which returns Cases one at a time. All Cases are
+        retrieved by a single query, ordered by case id.
+        """
         # figure out which selectors are for cases and which are for variables
-        sql = ["SELECT * FROM cases"]
-        if self.selectors is not None:
-            for sel in self.selectors:
-                rhs,rel,lhs = _query_split(sel)
-                if rhs in _casetable_attrs:
-                    if len(sql) == 1:
-                        sql.append("WHERE %s%s%s" % (rhs,rel,lhs))
-                    else:
-                        sql.append("AND %s%s%s" % (rhs,rel,lhs))
+        case_clauses, case_args = _selector_sql(self.selectors,
+                                                _casetable_attrs)
+        var_clauses, var_args = _selector_sql(self.selectors,
+                                              _vartable_attrs)
+        
+        sql = ["SELECT id,uuid,parent,label,msg,retries,name,sense,value",
+               "FROM cases JOIN casevars ON casevars.case_id=cases.id"]
+        args = []
+        if self.limit is not None or self.offset:
+            # Paging applies to cases, not variable rows.
+            sub = ["SELECT id FROM cases"]
+            if case_clauses:
+                sub.append("WHERE %s" % ' AND '.join(case_clauses))
+            sub.append("ORDER BY id LIMIT ? OFFSET ?")
+            clauses = ["id IN (%s)" % ' '.join(sub)]
+            args.extend(case_args)
+            args.append(-1 if self.limit is None else self.limit)
+            args.append(self.offset)
+        else:
+            clauses = case_clauses
+            args.extend(case_args)
+        clauses.extend(var_clauses)
+        args.extend(var_args)
+        if clauses:
+            sql.append("WHERE %s" % ' AND '.join(clauses))
+        sql.append("ORDER BY id, var_id")
             
-        casecur = self._connection.cursor()
-        casecur.execute(' '.join(sql))
-          
-        sql = ['SELECT var_id,name,case_id,sense,value from casevars WHERE case_id=%s']
-        if self.selectors is not None:
-            for sel in self.selectors:
-                rhs,rel,lhs = _query_split(sel)
-                if rhs in _vartable_attrs:
-                    sql.append("AND %s%s%s" % (rhs,rel,lhs))
-        combined = ' '.join(sql)
-        varcur = self._connection.cursor()
+        cur = self._connection.cursor()
+        cur.execute(' '.join(sql), args)
         
-        for cid,text_id,parent,label,msg,retries,model_id,timeEnter in casecur:
-            varcur.execute(combined % cid)
+        for cid, rows in groupby(cur, lambda row: row[0]):
             inputs = []
             outputs = []
-            for var_id, vname, case_id, sense, value in varcur:
+            for cid, text_id, parent, label, msg, retries, \
+                vname, sense, value in rows:
                 if not isinstance(value, (float,int,str)):
                     try:
                         value = loads(str(value))
                     except UnpicklingError as err:
                         raise UnpicklingError("can't unpickle value '%s' for case '%s' from database: %s" %
-                                              (vname, cname, str(err)))
+                                              (vname, text_id, str(err)))
                 if sense=='i':
                     inputs.append((vname, value))
                 else:
                     outputs.append((vname, value))
-            if len(inputs) > 0 or len(outputs) > 0:
-                yield Case(inputs=inputs, outputs=outputs,
-                           retries=retries,msg=msg,label=label,
-                           case_uuid=text_id, parent_uuid=parent)
+            yield Case(inputs=inputs, outputs=outputs,
+                       retries=retries,msg=msg,label=label,
+                       case_uuid=text_id, parent_uuid=parent)
 
     def get_attributes(self, io_only=True):
         """ We need a custom get_attributes because we aren't using Traits to
@@ -145,19 +185,37 @@ class DBCaseIterator(object):
 class DBCaseRecorder(object):
     """Records Cases to a relational DB (sqlite). Values other than floats,
     ints or strings are pickled and are opaque to SQL queries.
+    
+    By default each Case is committed as soon as it is recorded. When
+    recording many small Cases, setting `batch_size` greater than 1 groups
+    that many Cases into a single transaction, and `flush_interval` (in
+    seconds) limits how long recorded Cases may stay uncommitted. Pending
+    Cases are always committed by :meth:`close`, :meth:`flush` and
+    :meth:`get_iterator`. If `wal` is True, a file-based DB uses
+    write-ahead logging so that readers don't block the recorder.
     """
     
     implements(ICaseRecorder)
     
-    def __init__(self, dbfile=':memory:', model_id='', append=False):
+    def __init__(self, dbfile=':memory:', model_id='', append=False,
+                 batch_size=1, flush_interval=None, wal=False):
         self.dbfile = dbfile  # this creates the connection
         self.model_id = model_id
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        
+        self._pending = []  # casevars rows not yet inserted.
+        self._num_pending = 0  # Cases not yet committed.
+        self._last_flush = time.time()
         
         if append:
             exstr = 'if not exists'
         else:
             exstr = ''
         
+        if wal and dbfile != ':memory:':
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            
         self._connection.execute("""
         create table %s cases(
          id INTEGER PRIMARY KEY,
@@ -178,6 +236,12 @@ class DBCaseRecorder(object):
          sense TEXT,
          value BLOB
          )""" % exstr)
+        
+        self._connection.execute("""
+        create index if not exists casevars_case_id on casevars(case_id)""")
+        self._connection.execute("""
+        create index if not exists casevars_name on casevars(name)""")
+        self._connection.commit()
 
     @property
     def dbfile(self):
@@ -213,41 +277,46 @@ class DBCaseRecorder(object):
         # insert the inputs and outputs into the vars table.  Pickle them if they're not one of the
         # built-in types int, float, or str.
         
-        for name,value in case.items(iotype='in'):
-            if isinstance(value, (float,int,str)):
-                v = (None, name, case_id, 'i', value)
-            else:
-                if isinstance(value, TraitDictObject):
-                    value = dict(value)
-                elif isinstance(value, TraitListObject):
-                    value = list(value)
-                v = (None, name, case_id, 'i', 
-                     sqlite3.Binary(dumps(value,HIGHEST_PROTOCOL)))
-            cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)", 
-                        v)
-        for name,value in case.items(iotype='out'):
-            if isinstance(value, (float,int,str)):
-                v = (None, name, case_id, 'o', value)
-            else:
-                if isinstance(value, TraitDictObject):
-                    value = dict(value)
-                elif isinstance(value, TraitListObject):
-                    value = list(value)
-                v = (None, name, case_id, 'o', 
-                     sqlite3.Binary(dumps(value,HIGHEST_PROTOCOL)))
-            cur.execute("insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)", 
-                        v)
+        for sense, iotype in (('i', 'in'), ('o', 'out')):
+            for name,value in case.items(iotype=iotype):
+                if not isinstance(value, (float,int,str)):
+                    if isinstance(value, TraitDictObject):
+                        value = dict(value)
+                    elif isinstance(value, TraitListObject):
+                        value = list(value)
+                    value = sqlite3.Binary(dumps(value,HIGHEST_PROTOCOL))
+                self._pending.append((None, name, case_id, sense, value))
+                
+        self._num_pending += 1
+        if self._num_pending >= self.batch_size or \
+           (self.flush_interval is not None and \
+            time.time() - self._last_flush >= self.flush_interval):
+            self.flush()
+    
+    def flush(self):
+        """Insert any pending variable values and commit the current
+        transaction."""
+        if self._connection is None:
+            return
+        if self._pending:
+            self._connection.executemany(
+                "insert into casevars(var_id,name,case_id,sense,value) values(?,?,?,?,?)", 
+                self._pending)
+            self._pending = []
         self._connection.commit()
+        self._num_pending = 0
+        self._last_flush = time.time()
     
     def close(self):
         """Commit and close DB connection if not using ``:memory:``."""
+        self.flush()
         if self._connection is not None and self._dbfile != ':memory:':
-            self._connection.commit()
             self._connection.close()
             self._connection = None
 
     def get_iterator(self):
         """Return a DBCaseIterator that points to our current DB."""
+        self.flush()
         return DBCaseIterator(dbfile=self._dbfile, connection=self._connection)
 
     def get_attributes(self, io_only=True):
@@ -322,40 +391,33 @@ def case_db_to_dict(dbname, varnames, case_sql='', var_sql='', include_errors=Fa
     connection = sqlite3.connect(dbname)
     vardict = dict([(name,[]) for name in varnames])
 
-    sql = ["SELECT id FROM cases"]
     qlist = []
     if case_sql:
         qlist.append(case_sql)
     if not include_errors:
         qlist.append("msg = ''")
-            
-    if qlist:
-        sql.append("WHERE %s" % ' AND '.join(qlist))
-        
-    casecur = connection.cursor()
-    casecur.execute(' '.join(sql))
-    
-    sql = ["SELECT name, value from casevars WHERE case_id=%s"]
-    vars_added = False
-    for i,name in enumerate(vardict.keys()):
-        if i==0:
-            sql.append("AND (")
-        else:
-            sql.append("OR")
-        sql.append("name='%s'" % name)
-        vars_added = True
-    if vars_added: sql.append(")")
     
+    sql = ["SELECT case_id, name, value FROM casevars"]
+    args = []
+    clauses = []
+    if qlist:
+        clauses.append("case_id IN (SELECT id FROM cases WHERE %s)" 
+                       % ' AND '.join(qlist))
+    if vardict:
+        clauses.append("name IN (%s)" % ','.join(['?']*len(vardict)))
+        args.extend(vardict.keys())
     if var_sql:
-        sql.append(" AND %s" % var_sql)
-    combined = ' '.join(sql)
+        clauses.append("(%s)" % var_sql)
+    if clauses:
+        sql.append("WHERE %s" % ' AND '.join(clauses))
+    sql.append("ORDER BY case_id, var_id")
     
     varcur = connection.cursor()
+    varcur.execute(' '.join(sql), args)
     
-    for case_id in casecur:
+    for case_id, rows in groupby(varcur, lambda row: row[0]):
         casedict = {}
-        varcur.execute(combined % case_id)
-        for vname, value in varcur:
+        for case_id, vname, value in rows:
             if not isinstance(value, (float,int,str)):
                 try:
                     value = loads(str(value))
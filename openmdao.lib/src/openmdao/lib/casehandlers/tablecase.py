@@ -0,0 +1,466 @@
+"""A CaseRecorder and CaseIterator that store the cases in a wide table of a
+relational DB (Python's sqlite), with one row per case and one column per
+variable. Array values are stored as raw little-endian BLOBs so that a whole
+column can be pulled out of the DB as a single numpy array.
+"""
+
+import sqlite3
+from ast import literal_eval
+from cPickle import dumps, loads, HIGHEST_PROTOCOL, UnpicklingError
+
+import numpy
+
+from enthought.traits.trait_handlers import TraitListObject, TraitDictObject
+
+# pylint: disable-msg=E0611,F0401
+from openmdao.main.interfaces import implements, ICaseRecorder, ICaseIterator
+from openmdao.main.case import Case
+
+from openmdao.lib.casehandlers.dbcase import _query_split
+
+_casetable_attrs = ['id', 'uuid', 'parent', 'label', 'msg', 'retries',
+                    'model_id', 'timeEnter']
+
+# Column kinds and their sqlite column types.
+_sql_types = {
+    'int': 'INTEGER',
+    'float': 'REAL',
+    'str': 'TEXT',
+    'array': 'BLOB',
+    'pickle': 'BLOB',
+}
+
+
+def _value_kind(value):
+    """Returns a tuple of the form (kind, dtype, shape) describing how
+    `value` is stored.
+    """
+    if isinstance(value, numpy.ndarray) and value.dtype.kind in 'biufc':
+        dtype = value.dtype.newbyteorder('<').str
+        shape = ','.join([str(dim) for dim in value.shape])
+        return ('array', dtype, shape)
+    if isinstance(value, float):
+        return ('float', '', '')
+    if isinstance(value, int):
+        return ('int', '', '')
+    if isinstance(value, basestring):
+        return ('str', '', '')
+    return ('pickle', '', '')
+
+
+def _get_shape(shape):
+    """Converts a stored shape string back to a tuple."""
+    if shape:
+        return tuple([int(dim) for dim in shape.split(',')])
+    return ()
+
+
+def _encode(value, kind, dtype):
+    """Converts `value` to the form stored in the DB."""
+    if kind == 'array':
+        return sqlite3.Binary(value.astype(dtype).tostring())
+    if kind == 'pickle':
+        if isinstance(value, TraitDictObject):
+            value = dict(value)
+        elif isinstance(value, TraitListObject):
+            value = list(value)
+        return sqlite3.Binary(dumps(value, HIGHEST_PROTOCOL))
+    return value
+
+
+def _decode(value, name, kind, dtype, shape):
+    """Converts a value read from the DB back to its original form."""
+    if kind == 'array':
+        return numpy.frombuffer(str(value), dtype=dtype).reshape(shape).copy()
+    if kind == 'pickle':
+        try:
+            return loads(str(value))
+        except UnpicklingError as err:
+            raise UnpicklingError("can't unpickle value '%s' from database: %s"
+                                  % (name, str(err)))
+    return value
+
+
+def _read_columns(connection):
+    """Returns a list of tuples of the form
+    (col, name, sense, kind, dtype, shape) for each variable column in the DB.
+    """
+    cur = connection.cursor()
+    cur.execute("SELECT col, name, sense, kind, dtype, shape FROM columns"
+                " ORDER BY col")
+    return [(col, name, sense, kind, dtype, _get_shape(shape))
+            for col, name, sense, kind, dtype, shape in cur]
+
+
+def _selector_sql(selectors, columns):
+    """Returns a tuple containing a WHERE clause and the list of values to
+    be bound to it, built from a list of selectors of the form 'lhs<op>rhs',
+    where lhs is either a case attribute or a variable name.
+    """
+    clauses = []
+    args = []
+    for sel in selectors or []:
+        lhs, rel, rhs = _query_split(sel)
+        if rel == '==':
+            rel = '='
+        if lhs in _casetable_attrs:
+            cols = [lhs]
+        else:
+            cols = ['c%d' % col for col, name, sense, kind, dtype, shape
+                    in columns if name == lhs and kind in ('int', 'float', 'str')]
+            if not cols:
+                raise ValueError("selector '%s' doesn't refer to a case"
+                                 " attribute or a scalar variable" % sel)
+        try:
+            value = literal_eval(rhs)
+        except (ValueError, SyntaxError):
+            value = rhs
+        clauses.append('(%s)' % ' OR '.join(['%s%s?' % (col, rel)
+                                             for col in cols]))
+        args.extend([value]*len(cols))
+    if clauses:
+        return ('WHERE %s' % ' AND '.join(clauses), args)
+    return ('', args)
+
+
+class TableCaseIterator(object):
+    """Pulls Cases from a wide table in a relational DB (sqlite) written by
+    a :class:`TableCaseRecorder`. It supports a series of boolean selectors,
+    e.g., 'comp1.x<=3', that are ANDed together. The left-hand side of each
+    selector must be a case attribute or the name of a scalar variable.
+    Whole columns can be retrieved with :meth:`get_column`.
+    """
+
+    implements(ICaseIterator)
+
+    def __init__(self, dbfile=':memory:', selectors=None, connection=None):
+        if connection is not None:
+            self._dbfile = dbfile
+            self._connection = connection
+        else:
+            self._connection = None
+            self.dbfile = dbfile
+        self.selectors = selectors
+        self._connection.text_factory = sqlite3.OptimizedUnicode
+
+    @property
+    def dbfile(self):
+        """The name of the database. This can be a filename or :memory: for
+        an in-memory database.
+        """
+        return self._dbfile
+
+    @dbfile.setter
+    def dbfile(self, value):
+        """Set the DB file and connect to it."""
+        self._dbfile = value
+        if self._connection:
+            self._connection.close()
+        self._connection = sqlite3.connect(value)
+
+    def __iter__(self):
+        return self._next_case()
+
+    def _next_case(self):
+        """ Generator which returns Cases one at a time. """
+        columns = _read_columns(self._connection)
+        where, args = _selector_sql(self.selectors, columns)
+        names = _casetable_attrs + ['c%d' % col[0] for col in columns]
+        cur = self._connection.cursor()
+        cur.execute('SELECT %s FROM cases %s ORDER BY id'
+                    % (','.join(names), where), args)
+
+        nattrs = len(_casetable_attrs)
+        for row in cur:
+            cid, text_id, parent, label, msg, retries, model_id, timeEnter = \
+                row[:nattrs]
+            inputs = []
+            outputs = []
+            for value, (col, name, sense, kind, dtype, shape) in \
+                    zip(row[nattrs:], columns):
+                if value is None:
+                    continue
+                value = _decode(value, name, kind, dtype, shape)
+                if sense == 'i':
+                    inputs.append((name, value))
+                else:
+                    outputs.append((name, value))
+            if len(inputs) > 0 or len(outputs) > 0:
+                yield Case(inputs=inputs, outputs=outputs,
+                           retries=retries, msg=msg, label=label,
+                           case_uuid=text_id, parent_uuid=parent)
+
+    def get_column(self, name, include_errors=False):
+        """Returns the values of variable `name` for all selected cases that
+        contain it. Array values that have the same dtype and shape in every
+        case are returned as a single numpy array whose first index is the
+        case. Other values are returned in a list.
+
+        name: str
+            Name of the variable.
+
+        include_errors: bool (optional) [False]
+            If True, include data from cases that reported an error.
+        """
+        return case_table_to_dict(self._dbfile, [name], self.selectors,
+                                  include_errors,
+                                  connection=self._connection)[name]
+
+    def get_attributes(self, io_only=True):
+        """ We need a custom get_attributes because we aren't using Traits to
+        manage our changeable settings. This is unfortunate and should be
+        changed to something that automates this somehow."""
+
+        attrs = {}
+        attrs['type'] = type(self).__name__
+        variables = []
+
+        attr = {}
+        attr['name'] = "dbfile"
+        attr['type'] = type(self.dbfile).__name__
+        attr['value'] = str(self.dbfile)
+        attr['connected'] = ''
+        attr['desc'] = 'Name of the database file to be iterated. Default ' + \
+                       'is ":memory:", which reads the database from memory.'
+        variables.append(attr)
+
+        attr = {}
+        attr['name'] = "selectors"
+        attr['type'] = type(self.selectors).__name__
+        attr['value'] = str(self.selectors)
+        attr['connected'] = ''
+        attr['desc'] = 'List of selectors to apply to the case selection.'
+        variables.append(attr)
+
+        attrs["Inputs"] = variables
+        return attrs
+
+
+class TableCaseRecorder(object):
+    """Records Cases to a wide table in a relational DB (sqlite), one row
+    per Case and one column per variable. Ints, floats and strings are
+    stored as native SQL values, numeric arrays as raw little-endian BLOBs,
+    and anything else is pickled. A column is added the first time a
+    variable is recorded (or when the dtype or shape of an array changes).
+    """
+
+    implements(ICaseRecorder)
+
+    def __init__(self, dbfile=':memory:', model_id='', append=False):
+        self.dbfile = dbfile  # this creates the connection
+        self.model_id = model_id
+
+        if append:
+            exstr = 'if not exists'
+        else:
+            exstr = ''
+
+        self._connection.execute("""
+        create table %s cases(
+         id INTEGER PRIMARY KEY,
+         uuid TEXT,
+         parent TEXT,
+         label TEXT,
+         msg TEXT,
+         retries INTEGER,
+         model_id TEXT,
+         timeEnter TEXT
+         )""" % exstr)
+
+        self._connection.execute("""
+        create table %s columns(
+         col INTEGER PRIMARY KEY,
+         name TEXT,
+         sense TEXT,
+         kind TEXT,
+         dtype TEXT,
+         shape TEXT
+         )""" % exstr)
+
+        # Maps (name, sense, kind, dtype, shape) to column number.
+        self._columns = {}
+        cur = self._connection.cursor()
+        cur.execute("SELECT col, name, sense, kind, dtype, shape FROM columns")
+        for row in cur:
+            self._columns[tuple(row[1:])] = row[0]
+        self._connection.commit()
+
+    @property
+    def dbfile(self):
+        """The name of the database. This can be a filename or :memory: for
+        an in-memory database.
+        """
+        return self._dbfile
+
+    @dbfile.setter
+    def dbfile(self, value):
+        """Set the DB file and connect to it."""
+        self._dbfile = value
+        self._connection = sqlite3.connect(value)
+
+    def startup(self):
+        """ Opens the database for recording."""
+        pass
+
+    def _get_column(self, name, sense, value):
+        """Returns the column and kind used to store `value`, adding a new
+        column to the cases table if necessary.
+        """
+        kind, dtype, shape = _value_kind(value)
+        key = (name, sense, kind, dtype, shape)
+        col = self._columns.get(key)
+        if col is None:
+            cur = self._connection.cursor()
+            cur.execute("insert into columns(col,name,sense,kind,dtype,shape)"
+                        " values (?,?,?,?,?,?)", (None,)+key)
+            col = cur.lastrowid
+            cur.execute("alter table cases add column c%d %s"
+                        % (col, _sql_types[kind]))
+            self._columns[key] = col
+        return (col, kind, dtype)
+
+    def record(self, case):
+        """Record the given Case."""
+        if self._connection is None:
+            raise RuntimeError('Attempt to record on closed recorder')
+
+        names = ['id', 'uuid', 'parent', 'label', 'msg', 'retries', 'model_id']
+        values = [None, case.uuid, case.parent_uuid, case.label,
+                  case.msg or '', case.retries, self.model_id]
+
+        for sense, iotype in (('i', 'in'), ('o', 'out')):
+            for name, value in case.items(iotype=iotype):
+                col, kind, dtype = self._get_column(name, sense, value)
+                names.append('c%d' % col)
+                values.append(_encode(value, kind, dtype))
+
+        self._connection.execute(
+            "insert into cases(%s,timeEnter) values (%s,DATETIME('NOW'))"
+            % (','.join(names), ','.join(['?']*len(names))), values)
+        self._connection.commit()
+
+    def close(self):
+        """Commit and close DB connection if not using ``:memory:``."""
+        if self._connection is not None and self._dbfile != ':memory:':
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
+
+    def get_iterator(self):
+        """Return a TableCaseIterator that points to our current DB."""
+        return TableCaseIterator(dbfile=self._dbfile,
+                                 connection=self._connection)
+
+    def get_attributes(self, io_only=True):
+        """ We need a custom get_attributes because we aren't using Traits to
+        manage our changeable settings. This is unfortunate and should be
+        changed to something that automates this somehow."""
+
+        attrs = {}
+        attrs['type'] = type(self).__name__
+        variables = []
+
+        attr = {}
+        attr['name'] = "dbfile"
+        attr['id'] = attr['name']
+        attr['type'] = type(self.dbfile).__name__
+        attr['value'] = str(self.dbfile)
+        attr['connected'] = ''
+        attr['desc'] = 'Name of the database file to be recorded. Default ' + \
+                       'is ":memory:", which writes the database to memory.'
+        variables.append(attr)
+
+        attrs["Inputs"] = variables
+        return attrs
+
+
+def case_table_to_dict(dbname, varnames, selectors=None, include_errors=False,
+                       connection=None):
+    """
+    Retrieve the values of specified variables from a sqlite DB written
+    by a :class:`TableCaseRecorder`, using one query for all of them.
+
+    Returns a dict keyed on variable name. Each entry is a numpy array if all
+    of the returned values of that variable are numbers of the same type, or
+    are arrays with the same dtype and shape, and a list otherwise.
+
+    Only data from cases containing ALL of the specified variables will
+    be returned so that all data values with the same index will correspond
+    to the same case.
+
+    dbname: str
+        The name of the sqlite DB file.
+
+    varnames: list[str]
+        Iterator of names of variables to be retrieved.
+
+    selectors: list[str] (optional)
+        Selectors of the form used by :class:`TableCaseIterator`.
+
+    include_errors: bool (optional) [False]
+        If True, include data from cases that reported an error.
+
+    connection: sqlite3.Connection (optional)
+        Connection to use instead of connecting to `dbname`.
+    """
+    if connection is None:
+        connection = sqlite3.connect(dbname)
+    columns = _read_columns(connection)
+
+    where, args = _selector_sql(selectors, columns)
+    qlist = [where[len('WHERE '):]] if where else []
+    if not include_errors:
+        qlist.append("msg = ''")
+
+    varcols = {}
+    for name in varnames:
+        varcols[name] = [column for column in columns if column[1] == name]
+        if not varcols[name]:
+            qlist.append('0')  # Nothing can match.
+        else:
+            qlist.append('(%s)' % ' OR '.join(['c%d IS NOT NULL' % column[0]
+                                               for column in varcols[name]]))
+
+    sql = ['SELECT', ','.join(['c%d' % column[0] for name in varnames
+                                                 for column in varcols[name]]
+                              or ['id']),
+           'FROM cases']
+    if qlist:
+        sql.append('WHERE %s' % ' AND '.join(qlist))
+    sql.append('ORDER BY id')
+
+    cur = connection.cursor()
+    cur.execute(' '.join(sql), args)
+    rows = cur.fetchall()
+
+    vardict = {}
+    start = 0
+    for name in varnames:
+        cols = varcols[name]
+        end = start + len(cols)
+        
+        # Index of the column holding the value in each row.
+        used = [[i for i, val in enumerate(row[start:end])
+                 if val is not None][0] for row in rows]
+        if len(set(used)) == 1:
+            i = used[0]
+            col, vname, sense, kind, dtype, shape = cols[i]
+            data = [row[start+i] for row in rows]
+            if kind == 'array':
+                vardict[name] = numpy.frombuffer(
+                    ''.join([str(val) for val in data]),
+                    dtype=dtype).reshape((len(data),)+shape).copy()
+            elif kind in ('int', 'float'):
+                vardict[name] = numpy.array(data)
+            else:
+                vardict[name] = [_decode(val, name, kind, dtype, shape)
+                                 for val in data]
+        else:
+            vardict[name] = []
+            for row, i in zip(rows, used):
+                col, vname, sense, kind, dtype, shape = cols[i]
+                vardict[name].append(_decode(row[start+i], name, kind,
+                                             dtype, shape))
+        start = end
+
+    return vardict
@@ -113,6 +113,36 @@ class DBCaseRecorderTestCase(unittest.TestCase):
             self.assertEqual(case['comp1.y'], i*2.)
             self.assertEqual(case['comp1.z'], i*1.5)
             
+    def test_batched(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            dfile = os.path.join(tmpdir, 'junk.db')
+            recorder = DBCaseRecorder(dfile, batch_size=4, wal=True)
+            for i in range(10):
+                inputs = [('comp1.x', i), ('comp1.y', i*2.)]
+                outputs = [('comp1.z', i*1.5)]
+                recorder.record(Case(inputs=inputs, outputs=outputs, label='case%s'%i))
+                
+            # Only complete batches are visible to other connections.
+            self.assertEqual(len(list(DBCaseIterator(dfile))), 8)
+            recorder.close()
+            cases = list(DBCaseIterator(dfile))
+            self.assertEqual(len(cases), 10)
+            for i,case in enumerate(cases):
+                self.assertEqual(case.label, 'case%s'%i)
+                self.assertEqual(case['comp1.z'], i*1.5)
+        finally:
+            try:
+                shutil.rmtree(tmpdir)
+            except OSError:
+                logging.error("problem removing directory %s" % tmpdir)
+        
+        # get_iterator() commits any pending cases.
+        recorder = DBCaseRecorder(batch_size=100)
+        for i in range(10):
+            recorder.record(Case(inputs=[('comp1.x', i)]))
+        self.assertEqual(len(list(recorder.get_iterator())), 10)
+            
     def test_query(self):
         recorder = DBCaseRecorder()
         for i in range(10):
@@ -129,6 +159,26 @@ class DBCaseRecorderTestCase(unittest.TestCase):
                 self.assertTrue(value >= 0 and value<3)
         self.assertEqual(count, 3)
 
+    def test_paging(self):
+        recorder = DBCaseRecorder()
+        for i in range(10):
+            inputs = [('comp1.x', i), ('comp1.y', i*2.)]
+            recorder.record(Case(inputs=inputs, label='case%s'%i))
+            
+        iterator = DBCaseIterator(connection=recorder._connection,
+                                  selectors=["label!='case5'"],
+                                  limit=4, offset=3)
+        self.assertEqual([case.label for case in iterator],
+                         ['case3', 'case4', 'case6', 'case7'])
+        
+        iterator.limit = None
+        iterator.offset = 8
+        iterator.selectors = ["name='comp1.y'"]
+        self.assertEqual([case.label for case in iterator],
+                         ['case8', 'case9'])
+        for case in iterator:
+            self.assertEqual(case.keys(), ['comp1.y'])
+
     def test_tables_already_exist(self):
         dbdir = tempfile.mkdtemp()
         dbname = os.path.join(dbdir,'junk_dbfile')
@@ -0,0 +1,163 @@
+"""
+Test for TableCaseRecorder and TableCaseIterator.
+"""
+
+import unittest
+import StringIO
+import os
+import tempfile
+import logging
+import shutil
+
+import numpy
+
+from openmdao.main.api import Assembly, Case, set_as_top
+from openmdao.test.execcomp import ExecComp
+from openmdao.lib.casehandlers.api import TableCaseIterator, ListCaseIterator, \
+                                          TableCaseRecorder, DumpCaseRecorder, \
+                                          case_table_to_dict
+from openmdao.lib.drivers.api import SimpleCaseIterDriver
+from openmdao.main.uncertain_distributions import NormalDistribution
+from openmdao.main.datatypes.api import List, Dict, Array
+
+
+class TableCaseRecorderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.top = top = set_as_top(Assembly())
+        driver = top.add('driver', SimpleCaseIterDriver())
+        top.add('comp1', ExecComp(exprs=['z=x+y']))
+        top.add('comp2', ExecComp(exprs=['z=x+1']))
+        top.comp1.add('a_dict', Dict({}, iotype='in'))
+        top.comp1.add('a_list', List([], iotype='in'))
+        top.comp1.add('a_array', Array(numpy.zeros(3), iotype='in'))
+        top.connect('comp1.z', 'comp2.x')
+        driver.workflow.add(['comp1', 'comp2'])
+        
+        # now create some Cases
+        outputs = ['comp1.z', 'comp2.z']
+        cases = []
+        for i in range(10):
+            inputs = [('comp1.x', i), ('comp1.y', i*2), 
+                      ('comp1.a_dict', {'a' : 'b'}),
+                      ('comp1.a_list', ['a', 'b']),
+                      ('comp1.a_array', numpy.arange(3.)*i)]
+            cases.append(Case(inputs=inputs, outputs=outputs, label='case%s'%i))
+        driver.iterator = ListCaseIterator(cases)
+        
+        self.tmpdir = tempfile.mkdtemp()
+        self.dbname = os.path.join(self.tmpdir, 'junk.db')
+        
+    def tearDown(self):
+        try:
+            shutil.rmtree(self.tmpdir)
+        except OSError:
+            logging.error("problem removing directory %s" % self.tmpdir)
+
+    def test_inoutDB(self):
+        recorder = TableCaseRecorder()
+        self.top.driver.recorders = [recorder]
+        self.top.run()
+        
+        # now use the DB as source of Cases
+        self.top.driver.iterator = recorder.get_iterator()
+        
+        sout = StringIO.StringIO()
+        self.top.driver.recorders = [DumpCaseRecorder(sout)]
+        self.top.run()
+        expected = [
+            'Case: case8',
+            '   uuid: ad4c1b76-64fb-11e0-95a8-001e8cf75fe',
+            '   inputs:',
+            "      comp1.a_array: [  0.   8.  16.]",
+            "      comp1.a_dict: {'a': 'b'}",
+            "      comp1.a_list: ['a', 'b']",
+            '      comp1.x: 8',
+            '      comp1.y: 16',
+            '   outputs:',
+            '      comp1.z: 24.0',
+            '      comp2.z: 25.0',
+            ]
+        lines = sout.getvalue().split('\n')
+        for index, line in enumerate(lines):
+            if line.startswith('Case: case8'):
+                for i in range(len(expected)):
+                    if expected[i].startswith('   uuid:'):
+                        self.assertTrue(lines[index+i].startswith('   uuid:'))
+                    elif expected[i].startswith('      comp1.a_array:'):
+                        self.assertTrue(lines[index+i].startswith('      comp1.a_array:'))
+                    else:
+                        self.assertEqual(lines[index+i], expected[i])
+                break
+        else:
+            self.fail("couldn't find the expected Case")
+    
+    def test_columns(self):
+        recorder = TableCaseRecorder(self.dbname)
+        self.top.driver.recorders = [recorder]
+        self.top.run()
+        recorder.close()
+        
+        data = case_table_to_dict(self.dbname, ['comp1.x', 'comp1.a_array',
+                                                'comp2.z'])
+        self.assertTrue(isinstance(data['comp1.a_array'], numpy.ndarray))
+        self.assertEqual(data['comp1.a_array'].shape, (10, 3))
+        self.assertEqual(data['comp1.a_array'][4][2], 8.)
+        self.assertEqual(list(data['comp1.x']), range(10))
+        self.assertEqual(list(data['comp2.z']), [3.*i+1. for i in range(10)])
+        
+        iterator = TableCaseIterator(self.dbname, selectors=['comp1.x>=5',
+                                                             "label!='case9'"])
+        self.assertEqual([case.label for case in iterator],
+                         ['case5', 'case6', 'case7', 'case8'])
+        self.assertEqual(list(iterator.get_column('comp1.y')), [10, 12, 14, 16])
+
+    def test_pickle_conversion(self):
+        recorder = TableCaseRecorder()
+        for i in range(10):
+            inputs = [('comp1.x', i), ('comp1.y', i*2.)]
+            outputs = [('comp1.z', i*1.5), ('comp2.normal', NormalDistribution(float(i),0.5))]
+            recorder.record(Case(inputs=inputs, outputs=outputs, label='case%s'%i))
+        iterator = recorder.get_iterator()
+        for i,case in enumerate(iterator):
+            self.assertTrue(isinstance(case['comp2.normal'], NormalDistribution))
+            self.assertEqual(case['comp2.normal'].mu, float(i))
+            self.assertEqual(case['comp2.normal'].sigma, 0.5)
+            self.assertTrue(isinstance(case['comp1.y'], float))
+            self.assertEqual(case['comp1.y'], i*2.)
+            self.assertEqual(case['comp1.z'], i*1.5)
+            
+    def test_changing_types(self):
+        recorder = TableCaseRecorder(self.dbname)
+        recorder.record(Case(inputs=[('x', 1), ('a', numpy.zeros(2))]))
+        recorder.record(Case(inputs=[('x', 2.5), ('a', numpy.ones(3))]))
+        recorder.close()
+        
+        recorder = TableCaseRecorder(self.dbname, append=True)
+        recorder.record(Case(inputs=[('x', 3)]))
+        recorder.close()
+
+        cases = list(TableCaseIterator(self.dbname))
+        self.assertEqual([case['x'] for case in cases], [1, 2.5, 3])
+        self.assertEqual(list(cases[1]['a']), [1., 1., 1.])
+        
+        data = case_table_to_dict(self.dbname, ['x', 'a'])
+        self.assertEqual(data['x'], [1, 2.5])
+        self.assertEqual(len(data['a']), 2)
+
+    def test_close(self):
+        case = Case(inputs=[('str', 'Normal String'),
+                            ('unicode', u'Unicode String'),
+                            ('list', ['Hello', 'world'])])  # Check pickling.
+        recorder = TableCaseRecorder(self.dbname)
+        recorder.record(case)
+        recorder.close()
+        self.assertRaises(RuntimeError, recorder.record, case)
+        for case in TableCaseIterator(self.dbname):
+            self.assertEqual(case['str'], 'Normal String')
+            self.assertEqual(case['unicode'], u'Unicode String')
+            self.assertEqual(case['list'], ['Hello', 'world'])
+
+            
+if __name__ == '__main__':
+    unittest.main()
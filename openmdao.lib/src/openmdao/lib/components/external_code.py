@@ -19,6 +19,7 @@ from openmdao.main.rbac import AccessController, RoleError, rbac, remote_access
 from openmdao.main.resource import ResourceAllocationManager as RAM
 
 from openmdao.util.filexfer import filexfer, pack_zipfile, unpack_zipfile
+from openmdao.util.resultcache import ResultCache
 from openmdao.util import shellproc
 
 
@@ -42,14 +43,34 @@ class ExternalCode(ComponentWithDerivatives):
     resources = Dict({}, iotype='in',
                      desc='Resources required to run this component.')
     poll_delay = Float(0., low=0., units='s', iotype='in',
-                       desc='Delay between polling for command completion.'
-                            ' A value of zero will use an internally computed'
-                            ' default.')
+                       desc='Not used; command completion is detected'
+                            ' immediately. Retained for compatibility.')
     timeout = Float(0., low=0., iotype='in', units='s',
                     desc='Maximum time to wait for command completion.'
                          ' A value of zero implies an infinite wait.')
+    cache_dir = Str('', iotype='in',
+                    desc='Directory for cached results. If set, a command'
+                         ' whose command line, environment and input files'
+                         ' match a previous successful run is not executed;'
+                         ' the recorded output files are restored instead.'
+                         ' Relative paths are evaluated from the'
+                         " component's execution directory.")
+    cache_max_size = Int(100 << 20, low=0, iotype='in',
+                         desc='Maximum total size (bytes) of cached files.'
+                              ' Least recently used results are discarded.'
+                              ' A value of zero implies no limit.')
     timed_out = Bool(False, iotype='out', desc='True if the command timed-out.')
     return_code = Int(0, iotype='out', desc='Return code from the command.')
+    command_time = Float(0., iotype='out', units='s',
+                         desc='Time spent running the command.')
+    overhead_time = Float(0., iotype='out', units='s',
+                          desc='Time spent in execute() other than running'
+                               ' the command, such as file checks, server'
+                               ' allocation and file transfers.')
+    cache_hits = Int(0, iotype='out',
+                     desc='Number of runs satisfied from the results cache.')
+    cache_misses = Int(0, iotype='out',
+                       desc='Number of runs not found in the results cache.')
 
     def __init__(self):
         super(ExternalCode, self).__init__()
@@ -72,7 +93,8 @@ class ExternalCode(ComponentWithDerivatives):
         """
         Don't allow setting of 'command' or 'resources' by a remote client.
         """
-        if path in ('command', 'resources', 'get_access_controller') \
+        if path in ('command', 'resources', 'cache_dir',
+                    'get_access_controller') \
            and remote_access():
             self.raise_exception('%r may not be set() remotely' % path,
                                  RuntimeError)
@@ -95,6 +117,12 @@ class ExternalCode(ComponentWithDerivatives):
         is allocated and the command is run on that server.
         Otherwise the command is run locally.
 
+        If `cache_dir` has been specified, the command isn't run if a
+        previous successful run had the same command, environment variables,
+        and input files (including stdin). Instead, the output files (and
+        stdout and stderr if redirected to files) from that run are restored.
+        This assumes the command is a deterministic function of these inputs.
+
         When running remotely, the following resources are set:
 
         ================ =====================================
@@ -136,8 +164,10 @@ class ExternalCode(ComponentWithDerivatives):
             such.
 
         """
+        start_time = time.time()
         self.return_code = -12345678
         self.timed_out = False
+        self.command_time = 0.
 
         # Remove existing output (but not in/out) files.
         for metadata in self.external_files:
@@ -158,11 +188,24 @@ class ExternalCode(ComponentWithDerivatives):
 
         return_code = None
         error_msg = ''
+        cache = None
         try:
-            if self.resources:
-                return_code, error_msg = self._execute_remote()
-            else:
-                return_code, error_msg = self._execute_local()
+            if self.cache_dir:
+                cache = ResultCache(self.cache_dir, self.cache_max_size)
+                key = self._cache_key()
+                if cache.restore(key) is not None:
+                    self._logger.debug('restored results %s', key)
+                    self.cache_hits += 1
+                    return_code = 0
+                    cache = None  # Nothing to store.
+                else:
+                    self.cache_misses += 1
+
+            if return_code is None:
+                if self.resources:
+                    return_code, error_msg = self._execute_remote()
+                else:
+                    return_code, error_msg = self._execute_local()
 
             if return_code is None:
                 if self._stop:
@@ -185,8 +228,48 @@ class ExternalCode(ComponentWithDerivatives):
 
             if self.check_external_outputs:
                 self.check_files(inputs=False)
+
+            if cache is not None:
+                cache.store(key, self._cache_outputs(), return_code)
         finally:
             self.return_code = -999999 if return_code is None else return_code
+            self.overhead_time = time.time() - start_time - self.command_time
+            self._logger.debug('command time %.3f sec, overhead %.3f sec',
+                               self.command_time, self.overhead_time)
+
+    def _cache_key(self):
+        """ Return results cache key for the current inputs. """
+        paths = []
+        for metadata in self.external_files:
+            if metadata.get('input', False):
+                paths.extend(sorted(glob.glob(metadata.path)))
+        for pathname, obj in sorted(self.items(iotype='in', recurse=True)):
+            if isinstance(obj, FileRef):
+                path = self.get_metadata(pathname, 'local_path')
+                if path:
+                    paths.append(path)
+        if self.stdin and self.stdin != self.DEV_NULL:
+            paths.append(self.stdin)
+        outputs = [metadata.path for metadata in self.external_files
+                                 if metadata.get('output', False)]
+        items = [self.command, sorted(self.env_vars.items()),
+                 self.stdout, self.stderr, outputs]
+        return ResultCache.make_key(items, paths)
+
+    def _cache_outputs(self):
+        """ Return paths of output files to be cached. """
+        paths = []
+        for metadata in self.external_files:
+            if metadata.get('output', False):
+                paths.extend(sorted(glob.glob(metadata.path)))
+        for pathname, obj in sorted(self.items(iotype='out', recurse=True)):
+            if isinstance(obj, FileRef) and os.path.exists(obj.path):
+                paths.append(obj.path)
+        for path in (self.stdout, self.stderr):
+            if isinstance(path, basestring) and path != self.DEV_NULL \
+               and os.path.exists(path) and path not in paths:
+                paths.append(path)
+        return paths
 
     def check_files(self, inputs):
         """
@@ -265,6 +348,7 @@ class ExternalCode(ComponentWithDerivatives):
             self._process = None
 
         et = time.time() - start_time
+        self.command_time = et
         if et >= 60:  #pragma no cover
             self._logger.info('elapsed time: %.1f sec.', et)
 
@@ -352,6 +436,7 @@ class ExternalCode(ComponentWithDerivatives):
             return_code, error_msg = \
                 self._server.execute_command(rdesc)
             et = time.time() - start_time
+            self.command_time = et
             if et >= 60:  #pragma no cover
                 self._logger.info('elapsed time: %.1f sec.', et)
 
@@ -2,6 +2,8 @@
 
 from copy import deepcopy
 
+from numpy import array
+
 # pylint: disable-msg=E0611,F0401
 from enthought.traits.trait_base import not_none
 from enthought.traits.has_traits import _clone_trait
@@ -64,6 +66,7 @@ class MetaModel(Component):
         self._training_data = {}
         self._training_input_history = []
         self._const_inputs = {}  # dict of constant training inputs indices and their values
+        self._trained = {}  # output name -> (surrogate, number of training cases, constant input indices)
         self._train = False
         self._new_train_data = False
         self._failed_training_msgs = []
@@ -84,6 +87,7 @@ class MetaModel(Component):
     def _reset_training_data_fired(self):
         self._training_input_history = []
         self._const_inputs = {}
+        self._trained = {}
         self._failed_training_msgs = []
 
         # remove output history from training_data
@@ -111,7 +115,7 @@ class MetaModel(Component):
                     if inp_val is not None:
                         inputs.append(inp_val)
             #print "inputs", inputs
-            self._training_input_history.append(inputs)
+            self._add_training_inputs(inputs)
 
             for output_name in self.surrogate_output_names():
                 #grab value from case data
@@ -148,7 +152,7 @@ class MetaModel(Component):
                 else:
                     self._failed_training_msgs.append(str(err))
             else:  # if no exceptions are generated, save the data
-                self._training_input_history.append(inputs)
+                self._add_training_inputs(inputs)
                 self.update_outputs_from_model()
                 case_outputs = []
 
@@ -172,39 +176,7 @@ class MetaModel(Component):
                 
             #print '%s predicting' % self.get_pathname()
             if self._new_train_data:
-                if len(self._training_input_history) < 2:
-                    self.raise_exception("ERROR: need at least 2 training points!",
-                                         RuntimeError)
-
-                # figure out if we have any constant training inputs
-                tcases = self._training_input_history
-                in_hist = tcases[0][:]
-                # start off assuming every input is constant
-                idxlist = range(len(in_hist))
-                self._const_inputs = dict(zip(idxlist, in_hist))
-                for i in idxlist:
-                    val = in_hist[i]
-                    for case in range(1, len(tcases)):
-                        if val != tcases[case][i]:
-                            del self._const_inputs[i]
-                            break
-
-                if len(self._const_inputs) == len(in_hist):
-                    self.raise_exception("ERROR: all training inputs are constant.")
-                elif len(self._const_inputs) > 0:
-                    # some inputs are constant, so we have to remove them from the training set
-                    training_input_history = []
-                    for inputs in self._training_input_history:
-                        training_input_history.append([val for i, val in enumerate(inputs)
-                                                       if i not in self._const_inputs])
-                else:
-                    training_input_history = self._training_input_history
-                for name, output_history in self._training_data.items():
-                    surrogate = self._get_surrogate(name)
-                    if surrogate is not None:
-                        surrogate.train(training_input_history, output_history)
-
-                self._new_train_data = False
+                self._train_surrogates()
 
             inputs = []
             for i, name in enumerate(self.surrogate_input_names()):
@@ -225,6 +197,129 @@ class MetaModel(Component):
                 else:
                     setattr(self, name, surrogate.predict(inputs))
 
+    def _add_training_inputs(self, inputs):
+        """Add the inputs of a training case to the training input history,
+        keeping track of which training inputs are still constant."""
+        if self._training_input_history:
+            for i, val in self._const_inputs.items():
+                if inputs[i] != val:
+                    del self._const_inputs[i]
+        else:
+            # start off assuming every input is constant
+            self._const_inputs = dict(enumerate(inputs))
+        self._training_input_history.append(inputs)
+
+    def _strip_const_inputs(self, cases):
+        """Return the training input cases without the constant inputs."""
+        if not self._const_inputs:
+            return cases
+        return [[val for i, val in enumerate(inputs) if i not in self._const_inputs]
+                for inputs in cases]
+
+    def _train_surrogates(self):
+        """Train each surrogate on the training data collected so far,
+        leaving out any training inputs that are constant. A surrogate
+        that was already trained on part of the data, with the same
+        constant inputs, just has the new cases added to it if it supports
+        `add_points`."""
+        tcases = self._training_input_history
+        if len(tcases) < 2:
+            self.raise_exception("ERROR: need at least 2 training points!",
+                                 RuntimeError)
+
+        if len(self._const_inputs) == len(tcases[0]):
+            self.raise_exception("ERROR: all training inputs are constant.")
+
+        const = frozenset(self._const_inputs)
+        for name, output_history in self._training_data.items():
+            surrogate = self._get_surrogate(name)
+            if surrogate is None:
+                continue
+            trained = self._trained.get(name)
+            if trained is not None and trained[0] is surrogate and \
+               trained[2] == const and hasattr(surrogate, 'add_points'):
+                start = trained[1]
+                if start < len(tcases):
+                    surrogate.add_points(self._strip_const_inputs(tcases[start:]),
+                                         output_history[start:])
+            else:
+                surrogate.train(self._strip_const_inputs(tcases), output_history)
+            self._trained[name] = (surrogate, len(tcases), const)
+
+        self._new_train_data = False
+
+    def predict_many(self, inputs):
+        """Predict the outputs for many sets of inputs with a single call to
+        each surrogate, without setting any of the MetaModel's variables.
+        Surrogates are trained first if there is new training data.
+
+        inputs: dict or 2D array
+            If a dict, maps input names to sequences of values, one per
+            point. Inputs that aren't given keep their current value.
+            Otherwise, one row per point with a column for each name in
+            `surrogate_input_names()`.
+
+        Returns a dict mapping each output name to its predicted values,
+        as returned by the surrogate's `predict_many`, or a list of the
+        values from `predict` if the surrogate doesn't have `predict_many`.
+        Outputs without a surrogate are not included.
+        """
+        if self.default_surrogate is None and not self._surrogate_overrides:
+            self.raise_exception("predict_many requires surrogates for the "
+                                 "outputs", RuntimeError)
+        if self._new_train_data:
+            self._train_surrogates()
+
+        names = self.surrogate_input_names()
+        if isinstance(inputs, dict):
+            if not inputs:
+                self.raise_exception("predict_many requires values for at "
+                                     "least one input", ValueError)
+            unknown = sorted(set(inputs) - set(names))
+            if unknown:
+                self.raise_exception("predict_many: %s not surrogate inputs"
+                                     % unknown, ValueError)
+            lengths = set([len(vals) for vals in inputs.values()])
+            if len(lengths) > 1:
+                self.raise_exception("predict_many requires the same number "
+                                     "of values for each input, got %s"
+                                     % dict([(name, len(vals)) for name, vals
+                                             in sorted(inputs.items())]),
+                                     ValueError)
+            npoints = lengths.pop()
+            columns = []
+            for name in names:
+                vals = inputs.get(name, _missing)
+                if vals is _missing:
+                    vals = [getattr(self, name)]*npoints
+                columns.append(vals)
+            inputs = array(columns, dtype=float).T
+        else:
+            inputs = array(inputs, dtype=float).reshape(-1, len(names))
+
+        keep = []
+        for i, name in enumerate(names):
+            cval = self._const_inputs.get(i, _missing)
+            if cval is _missing:
+                keep.append(i)
+            else:
+                changed = inputs[:, i] != cval
+                if changed.any():
+                    self.raise_exception("ERROR: training input '%s' was a constant value of (%s) but the value has changed to (%s)." %
+                                         (name, cval, inputs[changed.argmax(), i]), ValueError)
+        inputs = inputs[:, keep]
+
+        outputs = {}
+        for name in self._training_data:
+            surrogate = self._get_surrogate(name)
+            if surrogate is None:
+                continue
+            if hasattr(surrogate, 'predict_many'):
+                outputs[name] = surrogate.predict_many(inputs)
+            else:
+                outputs[name] = [surrogate.predict(list(row)) for row in inputs]
+        return outputs
+
     def _post_run(self):
         self._train = False
         super(MetaModel, self)._post_run()
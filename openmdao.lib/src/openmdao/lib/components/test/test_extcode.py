@@ -115,6 +115,51 @@ class TestCase(unittest.TestCase):
                 
         SimulationRoot.chroot(ORIG_DIR)
         
+    def test_cache(self):
+        logging.debug('')
+        logging.debug('test_cache')
+
+        sleeper = set_as_top(Sleeper())
+        sleeper.env_filename = ENV_FILE
+        sleeper.env_vars = {'SLEEP_DATA': 'Hello world!'}
+        sleeper.external_files.append(
+            FileMetadata(path=ENV_FILE, output=True))
+        sleeper.infile = FileRef(INP_FILE, sleeper, input=True)
+        sleeper.stderr = None
+        sleeper.cache_dir = 'results-cache'
+        try:
+            sleeper.run()
+            self.assertEqual((sleeper.cache_hits, sleeper.cache_misses), (0, 1))
+
+            os.remove(ENV_FILE)
+            sleeper.run()
+            self.assertEqual(sleeper.return_code, 0)
+            self.assertEqual(sleeper.command_time, 0)
+            self.assertEqual((sleeper.cache_hits, sleeper.cache_misses), (1, 1))
+            with open(ENV_FILE, 'rU') as inp:
+                data = inp.readline().rstrip()
+            self.assertEqual(data, sleeper.env_vars['SLEEP_DATA'])
+            with sleeper.outfile.open() as inp:
+                self.assertEqual(inp.read(), INP_DATA)
+
+            # Different environment isn't a hit.
+            sleeper.env_vars = {'SLEEP_DATA': 'Goodbye world!'}
+            sleeper.run()
+            self.assertEqual((sleeper.cache_hits, sleeper.cache_misses), (1, 2))
+            with open(ENV_FILE, 'rU') as inp:
+                data = inp.readline().rstrip()
+            self.assertEqual(data, sleeper.env_vars['SLEEP_DATA'])
+
+            # Different input file isn't a hit.
+            with open(INP_FILE, 'w') as out:
+                out.write('Something else')
+            sleeper.infile = FileRef(INP_FILE, sleeper, input=True)
+            sleeper.run()
+            self.assertEqual((sleeper.cache_hits, sleeper.cache_misses), (1, 3))
+        finally:
+            if os.path.exists('results-cache'):
+                shutil.rmtree('results-cache')
+
     def test_normal(self):
         logging.debug('')
         logging.debug('test_normal')
@@ -131,6 +176,8 @@ class TestCase(unittest.TestCase):
 
         self.assertEqual(sleeper.return_code, 0)
         self.assertEqual(sleeper.timed_out, False)
+        self.assertTrue(sleeper.command_time > 0)
+        self.assertTrue(sleeper.overhead_time >= 0)
         self.assertEqual(os.path.exists(ENV_FILE), True)
 
         with open(ENV_FILE, 'rU') as inp:
@@ -222,6 +269,8 @@ class TestCase(unittest.TestCase):
 
         self.assertEqual(sleeper.return_code, 0)
         self.assertEqual(sleeper.timed_out, False)
+        self.assertTrue(sleeper.command_time > 0)
+        self.assertTrue(sleeper.overhead_time >= 0)
         self.assertEqual(os.path.exists(ENV_FILE), True)
 
         with open(ENV_FILE, 'r') as inp:
@@ -5,8 +5,8 @@ import unittest
 from enthought.traits.api import HasTraits
 
 from openmdao.lib.datatypes.api import Float
-from openmdao.main.api import Assembly, Component, set_as_top, Case
-from openmdao.main.interfaces import implements, ICaseRecorder
+from openmdao.main.api import Assembly, Component, Container, set_as_top, Case
+from openmdao.main.interfaces import implements, ICaseRecorder, ISurrogate
 
 from openmdao.main.uncertain_distributions import NormalDistribution
 
@@ -105,6 +105,48 @@ class DummyError(Component):
     def execute(self): 
         self.raise_exception("Test Error",RuntimeError)
 
+class CountingSurrogate(Container):
+    implements(ISurrogate)
+
+    def __init__(self):
+        super(CountingSurrogate, self).__init__()
+        self.trained = []
+        self.added = []
+
+    def get_uncertain_value(self, value):
+        return value
+
+    def train(self, X, Y):
+        self.trained.append(len(X))
+        self.width = len(X[0])
+
+    def add_points(self, X, Y):
+        self.added.append(len(X))
+
+    def predict(self, X):
+        return 0.
+
+    def predict_many(self, X):
+        return [0.]*len(X)
+
+
+class TrainOnlySurrogate(Container):
+    implements(ISurrogate)
+
+    def __init__(self):
+        super(TrainOnlySurrogate, self).__init__()
+        self.trained = []
+
+    def get_uncertain_value(self, value):
+        return value
+
+    def train(self, X, Y):
+        self.trained.append(len(X))
+
+    def predict(self, X):
+        return 0.
+
+
 class Sim(Assembly):
     def configure(self):
 
@@ -363,9 +405,139 @@ class MetaModelTestCase(unittest.TestCase):
                              "metamodel: ERROR: training input 'b' was a constant value of (2.2) but the value has changed to (4.8).")
         else:
             self.fail("Exception expected")
-        
-        
-    def test_warm_start(self): 
+
+    def test_predict_many(self):
+        avals = [1., 2., 3., 4.]
+        bvals = [2.2]*4
+        asm = self._trained_asm(avals, bvals)
+
+        # rows are ordered by surrogate_input_names()
+        points = [{'a': 1.5, 'b': 2.2}, {'a': 2.5, 'b': 2.2}, {'a': 3.5, 'b': 2.2}]
+        names = asm.metamodel.surrogate_input_names()
+        outputs = asm.metamodel.predict_many([[point[name] for name in names]
+                                              for point in points])
+        self.assertEqual(sorted(outputs.keys()), ['c', 'd'])
+        for i, point in enumerate(points):
+            asm.metamodel.a = point['a']
+            asm.metamodel.b = point['b']
+            asm.metamodel.run()
+            assert_rel_error(self, outputs['c'][i].mu, asm.metamodel.c.mu, 1e-6)
+            assert_rel_error(self, outputs['d'][i].sigma, asm.metamodel.d.sigma, 1e-6)
+
+        # inputs not given keep their current value
+        many = asm.metamodel.predict_many({'a': [1.5, 3.5]})
+        self.assertEqual(len(many['c']), 2)
+        assert_rel_error(self, many['c'][1].mu, outputs['c'][2].mu, 1e-6)
+
+        try:
+            asm.metamodel.predict_many({'a': [1.5, 2.5], 'b': [2.2, 4.8]})
+        except Exception as err:
+            self.assertEqual(str(err),
+                             "metamodel: ERROR: training input 'b' was a constant value of (2.2) but the value has changed to (4.8).")
+        else:
+            self.fail("Exception expected")
+
+    def test_predict_many_bad_inputs(self):
+        asm = self._trained_asm([1., 2., 3., 4.], [2.2]*4)
+
+        try:
+            asm.metamodel.predict_many({})
+        except ValueError as err:
+            self.assertEqual(str(err),
+                             "metamodel: predict_many requires values for at least one input")
+        else:
+            self.fail("ValueError expected")
+
+        try:
+            asm.metamodel.predict_many({'a': [1.5, 2.5], 'b': [2.2]})
+        except ValueError as err:
+            self.assertEqual(str(err),
+                             "metamodel: predict_many requires the same number of values for each input, got {'a': 2, 'b': 1}")
+        else:
+            self.fail("ValueError expected")
+
+        try:
+            asm.metamodel.predict_many({'a': [1.5], 'z': [1.]})
+        except ValueError as err:
+            self.assertEqual(str(err),
+                             "metamodel: predict_many: ['z'] not surrogate inputs")
+        else:
+            self.fail("ValueError expected")
+
+    def test_predict_many_fallback(self):
+        metamodel = MetaModel()
+        metamodel.name = 'meta'
+        metamodel.model = Simple()
+        metamodel.sur_c = TrainOnlySurrogate()
+        metamodel.recorder = DumbRecorder()
+        for a, b in [(1., 2.), (2., 3.)]:
+            metamodel.a = a
+            metamodel.b = b
+            metamodel.train_next = True
+            metamodel.run()
+
+        # c is predicted point by point, d has no surrogate
+        outputs = metamodel.predict_many([[1.5, 2.5], [2.5, 3.5], [3., 3.]])
+        self.assertEqual(outputs, {'c': [0., 0., 0.]})
+
+    def test_add_points(self):
+        metamodel = MetaModel()
+        metamodel.name = 'meta'
+        metamodel.model = Simple()
+        metamodel.sur_c = CountingSurrogate()
+        metamodel.sur_d = CountingSurrogate()
+        metamodel.recorder = DumbRecorder()
+
+        def train(a, b):
+            metamodel.a = a
+            metamodel.b = b
+            metamodel.train_next = True
+            metamodel.run()
+
+        train(1., 2.)
+        train(2., 2.)
+        metamodel.run()
+        self.assertEqual(metamodel.sur_c.trained, [2])
+        self.assertEqual(metamodel.sur_c.width, 1)
+
+        # only the new cases are added
+        train(3., 2.)
+        train(4., 2.)
+        metamodel.run()
+        metamodel.run()
+        self.assertEqual(metamodel.sur_c.trained, [2])
+        self.assertEqual(metamodel.sur_c.added, [2])
+        self.assertEqual(metamodel.sur_d.added, [2])
+
+        # b is no longer constant, so retrain with both inputs
+        train(5., 3.)
+        metamodel.run()
+        self.assertEqual(metamodel.sur_c.trained, [2, 5])
+        self.assertEqual(metamodel.sur_c.width, 2)
+        self.assertEqual(metamodel.sur_c.added, [2])
+
+        # a new surrogate is trained on all of the data
+        metamodel.sur_d = CountingSurrogate()
+        train(6., 4.)
+        metamodel.run()
+        self.assertEqual(metamodel.sur_c.added, [2, 1])
+        self.assertEqual(metamodel.sur_d.trained, [6])
+
+        metamodel.reset_training_data = True
+        train(1., 2.)
+        train(2., 3.)
+        metamodel.run()
+        self.assertEqual(metamodel.sur_c.trained, [2, 5, 2])
+
+        # surrogates without add_points are retrained on all of the data
+        metamodel.sur_d = TrainOnlySurrogate()
+        train(3., 4.)
+        metamodel.run()
+        train(4., 5.)
+        metamodel.run()
+        self.assertEqual(metamodel.sur_d.trained, [3, 4])
+
+    def test_warm_start(self):
         metamodel = MetaModel()
         metamodel.name = 'meta'
         metamodel.default_surrogate = KrigingSurrogate()
@@ -3,7 +3,7 @@ Support for calculating one or more scalar averages across one or more
 regions in a domain.
 """
 
-from math import cos, sin, sqrt
+import numpy
 
 from openmdao.lib.datatypes.domain.flow import CELL_CENTER
 from openmdao.lib.datatypes.domain.zone import CYLINDRICAL
@@ -250,16 +250,16 @@ def _calc_weights(scheme, domain, regions):
             else:
                 zone_weights = _curve_weights_1d(scheme, domain, region)
         else:
-            zone_weights = [1.]
+            zone_weights = numpy.ones(1)
 
         zone_name = region[0]
         zone = getattr(domain, zone_name)
-        zone_weights *= zone.symmetry_instances  # Adjust for symmetry.
         if zone_name in weights:
             raise RuntimeError('Zone %r used more than once' % zone_name)
         else:
             weights[zone_name] = zone_weights
-        weight_total += sum(zone_weights)
+        # Adjust for symmetry.
+        weight_total += float(zone_weights.sum()) * zone.symmetry_instances
 
     return (weights, weight_total)
 
@@ -279,24 +279,24 @@ def _surface_weights_3d(scheme, domain, region):
     cell_center = flow.grid_location == CELL_CENTER
 
     if cylindrical:
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+        c1 = grid.z
+        c2 = grid.r
+        c3 = grid.t
     else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
+        c1 = grid.x
+        c2 = grid.y
+        c3 = grid.z
 
     if scheme == 'mass':
         try:
             if cylindrical:
-                mom_c1 = flow.momentum.z.item
-                mom_c2 = flow.momentum.r.item
-                mom_c3 = flow.momentum.t.item
+                mom_c1 = flow.momentum.z
+                mom_c2 = flow.momentum.r
+                mom_c3 = flow.momentum.t
             else:
-                mom_c1 = flow.momentum.x.item
-                mom_c2 = flow.momentum.y.item
-                mom_c3 = flow.momentum.z.item
+                mom_c1 = flow.momentum.x
+                mom_c2 = flow.momentum.y
+                mom_c3 = flow.momentum.z
         except AttributeError:
             raise AttributeError("For mass averaging zone %s is missing"
                                  " 'momentum'." % zone_name)
@@ -313,20 +313,18 @@ def _surface_weights_3d(scheme, domain, region):
         face_normal = _kface_normal
         face_value = _kface_cell_value if cell_center else _kface_node_value
 
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-                sc1, sc2, sc3 = face_normal(c1, c2, c3, i, j, k, cylindrical)
-                if scheme == 'mass':
-                    loc = (i, j, k)
-                    rvu = face_value(mom_c1, loc)
-                    rvv = face_value(mom_c2, loc)
-                    rvw = face_value(mom_c3, loc)
-                    weights.append(rvu*sc1 + rvv*sc2 + rvw*sc3)
-                else:
-                    weights.append(sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3))
-    return weights
+    shape = (imax-imin, jmax-jmin, kmax-kmin)
+    c1, c2, c3 = [_block(c, shape) for c in (c1, c2, c3)]
+    sc1, sc2, sc3 = face_normal(c1, c2, c3, imin, jmin, kmin, cylindrical)
+    if scheme == 'mass':
+        loc = (imin, jmin, kmin)
+        rvu = face_value(_block(mom_c1, shape), loc)
+        rvv = face_value(_block(mom_c2, shape), loc)
+        rvw = face_value(_block(mom_c3, shape), loc)
+        weights = rvu*sc1 + rvv*sc2 + rvw*sc3
+    else:
+        weights = numpy.sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3)
+    return weights.ravel()
 
 
 def _surface_weights_2d(scheme, domain, region):
@@ -339,59 +337,61 @@ def _surface_weights_2d(scheme, domain, region):
     cell_center = flow.grid_location == CELL_CENTER
 
     if cylindrical:
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+        c1 = grid.z
+        c2 = grid.r
+        c3 = grid.t
     else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
+        c1 = grid.x
+        c2 = grid.y
+        c3 = grid.z
 
     if scheme == 'mass':
         try:
             if cylindrical:
-                mom_c1 = None if flow.momentum.z is None else flow.momentum.z.item
-                mom_c2 = flow.momentum.r.item
-                mom_c3 = flow.momentum.t.item
+                mom_c1 = flow.momentum.z
+                mom_c2 = flow.momentum.r
+                mom_c3 = flow.momentum.t
             else:
-                mom_c1 = flow.momentum.x.item
-                mom_c2 = flow.momentum.y.item
-                mom_c3 = None if flow.momentum.z is None else flow.momentum.z.item
+                mom_c1 = flow.momentum.x
+                mom_c2 = flow.momentum.y
+                mom_c3 = flow.momentum.z
         except AttributeError:
             raise AttributeError("For mass averaging zone %s is missing"
                                  " 'momentum'." % zone_name)
 
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-                sc1, sc2, sc3 = _cell_normal(c1, c2, c3, i, j, cylindrical)
-                if scheme == 'mass':
-                    ip1 = i + 1
-                    jp1 = j + 1
-                    if cell_center:
-                        # Cell value is value.
+    shape = (imax-imin, jmax-jmin)
+    c1, c2, c3 = [_block(c, shape) for c in (c1, c2, c3)]
+    i, j = imin, jmin
+    sc1, sc2, sc3 = _cell_normal(c1, c2, c3, i, j, cylindrical)
+    if scheme == 'mass':
+        mom_c1, mom_c2, mom_c3 = [_block(mom, shape)
+                                  for mom in (mom_c1, mom_c2, mom_c3)]
+        ip1 = i + 1
+        jp1 = j + 1
+        if cell_center:
+            # Cell value is value.
 # FIXME: built-in ghosts
-                        rvu = 0. if mom_c1 is None else mom_c1(ip1, jp1)
-                        rvv = mom_c2(ip1, jp1)
-                        rvw = 0. if mom_c1 is None else mom_c3(ip1, jp1)
-                    else:
-                        # Average across vertices.
-                        if mom_c1 is None:
-                            rvu = 0.
-                        else:
-                            rvu = 0.25 * (mom_c1(i, j) + mom_c1(ip1, j) + \
-                                          mom_c1(i, jp1) + mom_c1(ip1, jp1))
-                        rvv = 0.25 * (mom_c2(i, j) + mom_c2(ip1, j) + \
-                                      mom_c2(i, jp1) + mom_c2(ip1, jp1))
-                        if mom_c3 is None:
-                            rvw = 0.
-                        else:
-                            rvw = 0.25 * (mom_c3(i, j) + mom_c3(ip1, j) + \
-                                          mom_c3(i, jp1) + mom_c3(ip1, jp1))
-                    weights.append(rvu*sc1 + rvv*sc2 + rvw*sc3)
-                else:
-                    weights.append(sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3))
-    return weights
+            rvu = 0. if mom_c1 is None else mom_c1(ip1, jp1)
+            rvv = mom_c2(ip1, jp1)
+            rvw = 0. if mom_c1 is None else mom_c3(ip1, jp1)
+        else:
+            # Average across vertices.
+            if mom_c1 is None:
+                rvu = 0.
+            else:
+                rvu = 0.25 * (mom_c1(i, j) + mom_c1(ip1, j) + \
+                              mom_c1(i, jp1) + mom_c1(ip1, jp1))
+            rvv = 0.25 * (mom_c2(i, j) + mom_c2(ip1, j) + \
+                          mom_c2(i, jp1) + mom_c2(ip1, jp1))
+            if mom_c3 is None:
+                rvw = 0.
+            else:
+                rvw = 0.25 * (mom_c3(i, j) + mom_c3(ip1, j) + \
+                              mom_c3(i, jp1) + mom_c3(ip1, jp1))
+        weights = rvu*sc1 + rvv*sc2 + rvw*sc3
+    else:
+        weights = numpy.sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3)
+    return weights.ravel()
 
 
 def _curve_weights_3d(scheme, domain, region):
@@ -404,9 +404,9 @@ def _curve_weights_3d(scheme, domain, region):
     if cylindrical:
         raise NotImplementedError('curve weights for cylindrical coordinates')
     else:
-        x = grid.x.item
-        y = grid.y.item
-        z = grid.z.item
+        x = grid.x
+        y = grid.y
+        z = grid.z
 
     if scheme == 'mass':
         raise NotImplementedError('curve mass averaging')
@@ -424,24 +424,22 @@ def _curve_weights_3d(scheme, domain, region):
         imax += 1
         jmax += 1
 
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-                if along_i:
-                    dx = x(i+1, j, k) - x(i, j, k)
-                    dy = y(i+1, j, k) - y(i, j, k)
-                    dz = z(i+1, j, k) - z(i, j, k)
-                elif along_j:
-                    dx = x(i, j+1, k) - x(i, j, k)
-                    dy = y(i, j+1, k) - y(i, j, k)
-                    dz = z(i, j+1, k) - z(i, j, k)
-                else:
-                    dx = x(i, j, k+1) - x(i, j, k)
-                    dy = y(i, j, k+1) - y(i, j, k)
-                    dz = z(i, j, k+1) - z(i, j, k)
-                weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
+    shape = (imax-imin, jmax-jmin, kmax-kmin)
+    x, y, z = [_block(c, shape) for c in (x, y, z)]
+    i, j, k = imin, jmin, kmin
+    if along_i:
+        dx = x(i+1, j, k) - x(i, j, k)
+        dy = y(i+1, j, k) - y(i, j, k)
+        dz = z(i+1, j, k) - z(i, j, k)
+    elif along_j:
+        dx = x(i, j+1, k) - x(i, j, k)
+        dy = y(i, j+1, k) - y(i, j, k)
+        dz = z(i, j+1, k) - z(i, j, k)
+    else:
+        dx = x(i, j, k+1) - x(i, j, k)
+        dy = y(i, j, k+1) - y(i, j, k)
+        dz = z(i, j, k+1) - z(i, j, k)
+    return numpy.sqrt(dx*dx + dy*dy + dz*dz).ravel()
 
 
 def _curve_weights_2d(scheme, domain, region):
@@ -454,9 +452,9 @@ def _curve_weights_2d(scheme, domain, region):
     if cylindrical:
         raise NotImplementedError('curve weights for cylindrical coordinates')
     else:
-        x = grid.x.item
-        y = grid.y.item
-        z = None if grid.z is None else grid.z.item
+        x = grid.x
+        y = grid.y
+        z = grid.z
 
     if scheme == 'mass':
         raise NotImplementedError('curve mass averaging')
@@ -468,19 +466,18 @@ def _curve_weights_2d(scheme, domain, region):
         along_i = False
         imax += 1
 
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-                if along_i:
-                    dx = x(i+1, j) - x(i, j)
-                    dy = y(i+1, j) - y(i, j)
-                    dz = 0. if z is None else z(i+1, j) - z(i, j)
-                else:
-                    dx = x(i, j+1) - x(i, j)
-                    dy = y(i, j+1) - y(i, j)
-                    dz = 0. if z is None else z(i, j+1) - z(i, j)
-                weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
+    shape = (imax-imin, jmax-jmin)
+    x, y, z = [_block(c, shape) for c in (x, y, z)]
+    i, j = imin, jmin
+    if along_i:
+        dx = x(i+1, j) - x(i, j)
+        dy = y(i+1, j) - y(i, j)
+        dz = 0. if z is None else z(i+1, j) - z(i, j)
+    else:
+        dx = x(i, j+1) - x(i, j)
+        dy = y(i, j+1) - y(i, j)
+        dz = 0. if z is None else z(i, j+1) - z(i, j)
+    return numpy.sqrt(dx*dx + dy*dy + dz*dz).ravel()
 
 
 def _curve_weights_1d(scheme, domain, region):
@@ -493,20 +490,20 @@ def _curve_weights_1d(scheme, domain, region):
     if cylindrical:
         raise NotImplementedError('curve weights for cylindrical coordinates')
     else:
-        x = grid.x.item
-        y = None if grid.y is None else grid.y.item
-        z = None if grid.z is None else grid.z.item
+        x = grid.x
+        y = grid.y
+        z = grid.z
 
     if scheme == 'mass':
         raise NotImplementedError('curve mass averaging')
 
-    weights = []
-    for i in range(imin, imax):
-        dx = x(i+1) - x(i)
-        dy = 0. if y is None else y(i+1) - y(i)
-        dz = 0. if z is None else z(i+1) - z(i)
-        weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
+    shape = (imax-imin,)
+    x, y, z = [_block(c, shape) for c in (x, y, z)]
+    i = imin
+    dx = x(i+1) - x(i)
+    dy = 0. if y is None else y(i+1) - y(i)
+    dz = 0. if z is None else z(i+1) - z(i)
+    return numpy.sqrt(dx*dx + dy*dy + dz*dz).ravel()
 
 
 def _calc_metric(name, domain, region, weights, reference_state):
@@ -521,30 +518,33 @@ def _calc_metric(name, domain, region, weights, reference_state):
 
     # Could be volume, surface, curve, or point.
     dim = _get_dimension(region)
-    if dim == 3:
-        if geometry not in ('volume', 'any'):
-            raise RuntimeError('metric %r not applicable to volumes')
-        total = _volume(metric, integrate, zone, region, weights)
-    elif dim == 2:
-        if geometry not in ('surface', 'any'):
-            raise RuntimeError('metric %r not applicable to surfaces')
-        if len(region) == 7:
-            total = _surface_3d(metric, integrate, zone, region, weights)
-        else:
-            total = _surface_2d(metric, integrate, zone, region, weights)
-    elif dim == 1:
-        if geometry not in ('curve', 'any'):
-            raise RuntimeError('metric %r not applicable to curves')
-        if len(region) == 7:
-            total = _curve_3d(metric, integrate, zone, region, weights)
-        elif len(region) == 5:
-            total = _curve_2d(metric, integrate, zone, region, weights)
+    # Report invalid arithmetic (such as zero density) as an error rather
+    # than returning NaN or infinity.
+    with numpy.errstate(divide='raise', invalid='raise'):
+        if dim == 3:
+            if geometry not in ('volume', 'any'):
+                raise RuntimeError('metric %r not applicable to volumes')
+            total = _volume(metric, integrate, zone, region, weights)
+        elif dim == 2:
+            if geometry not in ('surface', 'any'):
+                raise RuntimeError('metric %r not applicable to surfaces')
+            if len(region) == 7:
+                total = _surface_3d(metric, integrate, zone, region, weights)
+            else:
+                total = _surface_2d(metric, integrate, zone, region, weights)
+        elif dim == 1:
+            if geometry not in ('curve', 'any'):
+                raise RuntimeError('metric %r not applicable to curves')
+            if len(region) == 7:
+                total = _curve_3d(metric, integrate, zone, region, weights)
+            elif len(region) == 5:
+                total = _curve_2d(metric, integrate, zone, region, weights)
+            else:
+                total = _curve_1d(metric, integrate, zone, region, weights)
         else:
-            total = _curve_1d(metric, integrate, zone, region, weights)
-    else:
-        if geometry != 'any':
-            raise RuntimeError('metric %r not applicable to points')
-        total = _point(metric, zone, region)
+            if geometry != 'any':
+                raise RuntimeError('metric %r not applicable to points')
+            total = _point(metric, zone, region)
 
     if reference_state is None:
         return total
@@ -615,13 +615,13 @@ def _surface_3d(metric, integrate, zone, region, weights):
     cell_center = flow.grid_location == CELL_CENTER
 
     if cylindrical: 
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+        c1 = grid.z
+        c2 = grid.r
+        c3 = grid.t
     else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
+        c1 = grid.x
+        c2 = grid.y
+        c3 = grid.z
 
     if imin == imax: 
         face = 'i'
@@ -636,51 +636,45 @@ def _surface_3d(metric, integrate, zone, region, weights):
         kmax += 1
         get_normal = _kface_normal
 
+    shape = (imax-imin, jmax-jmin, kmax-kmin)
+    i, j, k = imin, jmin, kmin
+
     normal = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
+    if integrate:
+        c1, c2, c3 = [_block(c, shape) for c in (c1, c2, c3)]
+        normal = get_normal(c1, c2, c3, i, j, k, cylindrical)
 
-                if integrate:
-                    normal = get_normal(c1, c2, c3, i, j, k, cylindrical)
-    
-                if cell_center:
+    calculate = lambda *loc: _calculate(metric, loc, shape, normal)
+
+    if cell_center:
 # FIXME: built-in ghosts
-                    # Average across cells sharing surface.
-                    val = metric.calculate((i+1, j+1, k+1), normal)
-                    if face == 'i':
-                        val += metric.calculate((i, j+1, k+1), normal)
-                    elif face == 'j':
-                        val += metric.calculate((i+1, j, k+1), normal)
-                    else:
-                        val += metric.calculate((i+1, j+1, k), normal)
-                    val *= 0.5
-                else:
-                    # Average across vertices.
-                    val = metric.calculate((i, j, k), normal)
-                    if face == 'i':
-                        val += metric.calculate((i, j+1, k), normal)
-                        val += metric.calculate((i, j+1, k+1), normal)
-                        val += metric.calculate((i, j, k+1), normal)
-                    elif face == 'j':
-                        val += metric.calculate((i+1, j, k), normal)
-                        val += metric.calculate((i+1, j, k+1), normal)
-                        val += metric.calculate((i, j, k+1), normal)
-                    else:
-                        val += metric.calculate((i+1, j, k), normal)
-                        val += metric.calculate((i+1, j+1, k), normal)
-                        val += metric.calculate((i, j+1, k), normal)
-                    val *= 0.25
+        # Average across cells sharing surface.
+        val = calculate(i+1, j+1, k+1)
+        if face == 'i':
+            val += calculate(i, j+1, k+1)
+        elif face == 'j':
+            val += calculate(i+1, j, k+1)
+        else:
+            val += calculate(i+1, j+1, k)
+        val *= 0.5
+    else:
+        # Average across vertices.
+        val = calculate(i, j, k)
+        if face == 'i':
+            val += calculate(i, j+1, k)
+            val += calculate(i, j+1, k+1)
+            val += calculate(i, j, k+1)
+        elif face == 'j':
+            val += calculate(i+1, j, k)
+            val += calculate(i+1, j, k+1)
+            val += calculate(i, j, k+1)
+        else:
+            val += calculate(i+1, j, k)
+            val += calculate(i+1, j+1, k)
+            val += calculate(i, j+1, k)
+        val *= 0.25
 
-                if integrate:
-                    total += val
-                else:
-                    weight = weights[weight_index]
-                    weight_index += 1
-                    total += val * weight
-    return total
+    return _total(val, integrate, weights)
 
 
 def _surface_2d(metric, integrate, zone, region, weights):
@@ -692,42 +686,37 @@ def _surface_2d(metric, integrate, zone, region, weights):
     cell_center = flow.grid_location == CELL_CENTER
 
     if cylindrical: 
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+        c1 = grid.z
+        c2 = grid.r
+        c3 = grid.t
     else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
+        c1 = grid.x
+        c2 = grid.y
+        c3 = grid.z
+
+    shape = (imax-imin, jmax-jmin)
+    i, j = imin, jmin
 
     normal = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
+    if integrate:
+        c1, c2, c3 = [_block(c, shape) for c in (c1, c2, c3)]
+        normal = _cell_normal(c1, c2, c3, i, j, cylindrical)
 
-            if integrate:
-                normal = _cell_normal(c1, c2, c3, i, j, cylindrical)
-    
-            if cell_center:
+    calculate = lambda *loc: _calculate(metric, loc, shape, normal)
+
+    if cell_center:
 # FIXME: built-in ghosts
-                # Cell value is value.
-                val = metric.calculate((i+1, j+1), normal)
-            else:
-                # Average across vertices.
-                val  = metric.calculate((i, j), normal)
-                val += metric.calculate((i, j+1), normal)
-                val += metric.calculate((i+1, j+1), normal)
-                val += metric.calculate((i+1, j), normal)
-                val *= 0.25
-
-            if integrate:
-                total += val
-            else:
-                weight = weights[weight_index]
-                weight_index += 1
-                total += val * weight
-    return total
+        # Cell value is value.
+        val = calculate(i+1, j+1)
+    else:
+        # Average across vertices.
+        val  = calculate(i, j)
+        val += calculate(i, j+1)
+        val += calculate(i+1, j+1)
+        val += calculate(i+1, j)
+        val *= 0.25
+
+    return _total(val, integrate, weights)
 
 
 def _curve_3d(metric, integrate, zone, region, weights):
@@ -739,13 +728,13 @@ def _curve_3d(metric, integrate, zone, region, weights):
     cell_center = flow.grid_location == CELL_CENTER
 
     if cylindrical: 
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+        c1 = grid.z
+        c2 = grid.r
+        c3 = grid.t
     else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
+        c1 = grid.x
+        c2 = grid.y
+        c3 = grid.z
 
     if imin != imax:
         edge = 'i'
@@ -763,51 +752,45 @@ def _curve_3d(metric, integrate, zone, region, weights):
         jmax += 1
         get_length = _kedge_length
 
+    shape = (imax-imin, jmax-jmin, kmax-kmin)
+    i, j, k = imin, jmin, kmin
+
     length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
+    if integrate:
+        c1, c2, c3 = [_block(c, shape) for c in (c1, c2, c3)]
+        length = get_length(c1, c2, c3, (i, j, k), cylindrical)
 
-                if integrate:
-                    length = get_length(c1, c2, c3, (i, j, k), cylindrical)
+    calculate = lambda *loc: _calculate(metric, loc, shape, length)
 
-                if cell_center:
+    if cell_center:
 # FIXME: built-in ghosts
-                    # Average across cells sharing edge.
-                    val = metric.calculate((i+1, j+1, k+1), length)
-                    if edge == 'i':
-                        val += metric.calculate((i+1, j, k+1), length)
-                        val += metric.calculate((i+1, j+1, k), length)
-                        val += metric.calculate((i+1, j, k), length)
-                    elif edge == 'j':
-                        val += metric.calculate((i, j+1, k+1), length)
-                        val += metric.calculate((i+1, j+1, k), length)
-                        val += metric.calculate((i, j+1, k), length)
-                    else:
-                        val += metric.calculate((i, j+1, k+1), length)
-                        val += metric.calculate((i+1, j, k+1), length)
-                        val += metric.calculate((i, j, k+1), length)
-                    val *= 0.25
-                else:
-                    # Average across vertices.
-                    val = metric.calculate((i, j, k), length)
-                    if edge == 'i':
-                        val += metric.calculate((i+1, j, k), length)
-                    elif edge == 'j':
-                         val +=metric.calculate((i, j+1, k), length)
-                    else:
-                         val +=metric.calculate((i, j, k+1), length)
-                    val *= 0.5
+        # Average across cells sharing edge.
+        val = calculate(i+1, j+1, k+1)
+        if edge == 'i':
+            val += calculate(i+1, j, k+1)
+            val += calculate(i+1, j+1, k)
+            val += calculate(i+1, j, k)
+        elif edge == 'j':
+            val += calculate(i, j+1, k+1)
+            val += calculate(i+1, j+1, k)
+            val += calculate(i, j+1, k)
+        else:
+            val += calculate(i, j+1, k+1)
+            val += calculate(i+1, j, k+1)
+            val += calculate(i, j, k+1)
+        val *= 0.25
+    else:
+        # Average across vertices.
+        val = calculate(i, j, k)
+        if edge == 'i':
+            val += calculate(i+1, j, k)
+        elif edge == 'j':
+            val += calculate(i, j+1, k)
+        else:
+            val += calculate(i, j, k+1)
+        val *= 0.5
 
-                if integrate:
-                    total += val
-                else:
-                    weight = weights[weight_index]
-                    weight_index += 1
-                    total += val * weight
-    return total
+    return _total(val, integrate, weights)
 
 
 def _curve_2d(metric, integrate, zone, region, weights):
@@ -819,13 +802,13 @@ def _curve_2d(metric, integrate, zone, region, weights):
     cell_center = flow.grid_location == CELL_CENTER
 
     if cylindrical: 
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+        c1 = grid.z
+        c2 = grid.r
+        c3 = grid.t
     else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
+        c1 = grid.x
+        c2 = grid.y
+        c3 = grid.z
 
     if imin != imax:
         edge = 'i'
@@ -836,40 +819,35 @@ def _curve_2d(metric, integrate, zone, region, weights):
         imax += 1
         get_length = _jedge_length
 
+    shape = (imax-imin, jmax-jmin)
+    i, j = imin, jmin
+
     length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
+    if integrate:
+        c1, c2, c3 = [_block(c, shape) for c in (c1, c2, c3)]
+        length = get_length(c1, c2, c3, (i, j), cylindrical)
 
-            if integrate:
-                length = get_length(c1, c2, c3, (i, j), cylindrical)
+    calculate = lambda *loc: _calculate(metric, loc, shape, length)
 
-            if cell_center:
+    if cell_center:
 # FIXME: built-in ghosts
-                # Average across cells sharing edge.
-                val = metric.calculate((i+1, j+1), length)
-                if edge == 'i':
-                    val += metric.calculate((i+1, j), length)
-                else:
-                    val += metric.calculate((i, j+1), length)
-                val *= 0.5
-            else:
-                # Average across vertices.
-                val = metric.calculate((i, j), length)
-                if edge == 'i':
-                    val += metric.calculate((i+1, j), length)
-                else:
-                    val += metric.calculate((i, j+1), length)
-                val *= 0.5
+        # Average across cells sharing edge.
+        val = calculate(i+1, j+1)
+        if edge == 'i':
+            val += calculate(i+1, j)
+        else:
+            val += calculate(i, j+1)
+        val *= 0.5
+    else:
+        # Average across vertices.
+        val = calculate(i, j)
+        if edge == 'i':
+            val += calculate(i+1, j)
+        else:
+            val += calculate(i, j+1)
+        val *= 0.5
 
-            if integrate:
-                total += val
-            else:
-                weight = weights[weight_index]
-                weight_index += 1
-                total += val * weight
-    return total
+    return _total(val, integrate, weights)
 
 
 def _curve_1d(metric, integrate, zone, region, weights):
@@ -881,41 +859,100 @@ def _curve_1d(metric, integrate, zone, region, weights):
     cell_center = flow.grid_location == CELL_CENTER
 
     if cylindrical:
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+        c1 = grid.z
+        c2 = grid.r
+        c3 = grid.t
     else:
-        c1 = grid.x.item
-        c2 = None if grid.y is None else grid.y.item
-        c3 = None if grid.z is None else grid.z.item
+        c1 = grid.x
+        c2 = grid.y
+        c3 = grid.z
 
     get_length = _iedge_length
 
+    shape = (imax-imin,)
+    i = imin
+
     length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
+    if integrate:
+        c1, c2, c3 = [_block(c, shape) for c in (c1, c2, c3)]
+        length = get_length(c1, c2, c3, (i,), cylindrical)
 
-        if integrate:
-            length = get_length(c1, c2, c3, (i,), cylindrical)
+    calculate = lambda *loc: _calculate(metric, loc, shape, length)
 
-        if cell_center:
+    if cell_center:
 # FIXME: built-in ghosts
-            # Cell value is value.
-            val = metric.calculate((i+1,), length)
-        else:
-            # Average across vertices.
-            val  = metric.calculate((i,), length)
-            val += metric.calculate((i+1,), length)
-            val *= 0.5
+        # Cell value is value.
+        val = calculate(i+1)
+    else:
+        # Average across vertices.
+        val  = calculate(i)
+        val += calculate(i+1)
+        val *= 0.5
+
+    return _total(val, integrate, weights)
+
+
+def _block(arr, shape):
+    """
+    Returns a function which returns the `shape` block of `arr` values
+    starting at the given indices (or None if `arr` is None). This lets the
+    normal and length calculations process a whole region at once.
+    """
+    if arr is None:
+        return None
 
-        if integrate:
-            total += val
+    def block(*loc):
+        index = tuple([slice(start, start+size)
+                       for start, size in zip(loc, shape)])
+        values = arr[index]
+        if values.shape != shape:
+            raise IndexError('index %s out of bounds for shape %s'
+                             % (loc, arr.shape))
+        return numpy.asarray(values, dtype=numpy.float64)
+    return block
+
+
+def _calculate(metric, loc, shape, geom):
+    """
+    Returns array of `metric` values for the `shape` block of locations
+    starting at `loc`. `geom` is None or the corresponding normals/lengths.
+    Metrics without :meth:`calculate_array` are evaluated one location at
+    a time.
+    """
+    if hasattr(metric, 'calculate_array'):
+        index = tuple([slice(start, start+size)
+                       for start, size in zip(loc, shape)])
+        # Always copy, since the result may be a view of zone data.
+        values = numpy.zeros(shape)
+        values += metric.calculate_array(index, geom)
+        return values
+
+    values = numpy.zeros(shape)
+    for offset in numpy.ndindex(*shape):
+        if geom is None:
+            item_geom = None
+        elif isinstance(geom, tuple):
+            item_geom = tuple([_item(value, offset) for value in geom])
         else:
-            weight = weights[weight_index]
-            weight_index += 1
-            total += val * weight
-    return total
+            item_geom = _item(geom, offset)
+        item_loc = tuple([start+delta for start, delta in zip(loc, offset)])
+        values[offset] = metric.calculate(item_loc, item_geom)
+    return values
+
+
+def _item(value, offset):
+    """ Returns element `offset` of `value`, or `value` if it's a scalar. """
+    if numpy.ndim(value):
+        return value.item(*offset)
+    return value
+
+
+def _total(values, integrate, weights):
+    """ Returns sum of `values`, weighted if not integrating. """
+    if integrate:
+        return float(values.sum())
+    else:
+        return float(numpy.dot(values.ravel(), weights))
 
 
 def _point(metric, zone, region):
@@ -1100,22 +1137,22 @@ def _iedge_length(c1, c2, c3, loc, cylindrical):
             i, j, k = loc
             ip1 = i + 1
             theta = c3(ip1, j, k) - c3(i, j, k)
-            dx = c2(ip1, j, k) * cos(theta) - c2(i, j, k)
-            dy = c2(ip1, j, k) * sin(theta)
+            dx = c2(ip1, j, k) * numpy.cos(theta) - c2(i, j, k)
+            dy = c2(ip1, j, k) * numpy.sin(theta)
             dz = c1(ip1, j, k) - c1(i, j, k)
         elif len(loc) > 1:
             i, j = loc
             ip1 = i + 1
             theta = c3(ip1, j) - c3(i, j)
-            dx = c2(ip1, j) * cos(theta) - c2(i, j)
-            dy = c2(ip1, j) * sin(theta)
+            dx = c2(ip1, j) * numpy.cos(theta) - c2(i, j)
+            dy = c2(ip1, j) * numpy.sin(theta)
             dz = 0. if c1 is None else c1(ip1, j) - c1(i, j)
         else:
             i, = loc
             ip1 = i + 1
             theta = c3(ip1) - c3(i)
-            dx = c2(ip1) * cos(theta) - c2(i)
-            dy = c2(ip1) * sin(theta)
+            dx = c2(ip1) * numpy.cos(theta) - c2(i)
+            dy = c2(ip1) * numpy.sin(theta)
             dz = 0. if c1 is None else c1(ip1) - c1(i)
     else:
         if len(loc) > 2:
@@ -1137,7 +1174,7 @@ def _iedge_length(c1, c2, c3, loc, cylindrical):
             dy = 0. if c2 is None else c2(ip1) - c2(i)
             dz = 0. if c3 is None else c3(ip1) - c3(i)
 
-    return sqrt(dx*dx + dy*dy + dz*dz)
+    return numpy.sqrt(dx*dx + dy*dy + dz*dz)
 
 
 def _jedge_length(c1, c2, c3, loc, cylindrical):
@@ -1147,15 +1184,15 @@ def _jedge_length(c1, c2, c3, loc, cylindrical):
             i, j, k = loc
             jp1 = j + 1
             theta = c3(i, jp1, k) - c3(i, j, k)
-            dx = c2(i, jp1, k) * cos(theta) - c2(i, j, k)
-            dy = c2(i, jp1, k) * sin(theta)
+            dx = c2(i, jp1, k) * numpy.cos(theta) - c2(i, j, k)
+            dy = c2(i, jp1, k) * numpy.sin(theta)
             dz = c1(i, jp1, k) - c1(i, j, k)
         else:
             i, j = loc
             jp1 = j + 1
             theta = c3(i, jp1) - c3(i, j)
-            dx = c2(i, jp1) * cos(theta) - c2(i, j)
-            dy = c2(i, jp1) * sin(theta)
+            dx = c2(i, jp1) * numpy.cos(theta) - c2(i, j)
+            dy = c2(i, jp1) * numpy.sin(theta)
             dz = 0. if c1 is None else c1(i, jp1) - c1(i, j)
     else:
         if len(loc) > 2:
@@ -1171,7 +1208,7 @@ def _jedge_length(c1, c2, c3, loc, cylindrical):
             dy = c2(i, jp1) - c2(i, j)
             dz = 0. if c3 is None else c3(i, jp1) - c3(i, j)
 
-    return sqrt(dx*dx + dy*dy + dz*dz)
+    return numpy.sqrt(dx*dx + dy*dy + dz*dz)
 
 
 def _kedge_length(c1, c2, c3, loc, cylindrical):
@@ -1180,15 +1217,15 @@ def _kedge_length(c1, c2, c3, loc, cylindrical):
     kp1 = k + 1
     if cylindrical:
         theta = c3(i, j, kp1) - c3(i, j, k)
-        dx = c2(i, j, kp1) * cos(theta) - c2(i, j, k)
-        dy = c2(i, j, kp1) * sin(theta)
+        dx = c2(i, j, kp1) * numpy.cos(theta) - c2(i, j, k)
+        dy = c2(i, j, kp1) * numpy.sin(theta)
         dz = c1(i, j, kp1) - c1(i, j, k)
     else:
         dx = c1(i, j, kp1) - c1(i, j, k)
         dy = c2(i, j, kp1) - c2(i, j, k)
         dz = c3(i, j, kp1) - c3(i, j, k)
 
-    return sqrt(dx*dx + dy*dy + dz*dz)
+    return numpy.sqrt(dx*dx + dy*dy + dz*dz)
 
 
 def _iface_cell_value(arr, loc):
@@ -0,0 +1,54 @@
+"""
+Measure time to read a Plot3D grid and Q file and extract a surface,
+reading whole arrays and using memory-mapped arrays.
+"""
+
+import os
+import tempfile
+import time
+
+from openmdao.lib.datatypes.domain import read_plot3d_q, write_plot3d_q
+from openmdao.lib.datatypes.domain.test.wedge import create_wedge_3d
+
+
+def extract(grid_file, q_file, memmap):
+    """ Return seconds to read and extract a surface, and the surface. """
+    start = time.time()
+    domain = read_plot3d_q(grid_file, q_file, multiblock=False, memmap=memmap)
+    surface = domain.zone_1.extract(0, -1, 0, -1, 0, 0)
+    density = surface.flow_solution.density.sum()
+    return (time.time() - start, density)
+
+
+def main():
+    """ Report read times for a range of grid sizes. """
+    tmpdir = tempfile.mkdtemp()
+    grid_file = os.path.join(tmpdir, 'grid.xyz')
+    q_file = os.path.join(tmpdir, 'grid.q')
+    try:
+        print '%16s %10s %12s %12s %8s' % ('shape', 'size (MB)', 'read (s)',
+                                           'memmap (s)', 'speedup')
+        for shape in ((50, 50, 50), (100, 100, 100), (200, 100, 200)):
+            wedge = create_wedge_3d(shape, 5., 0.5, 2., 30.)
+            write_plot3d_q(wedge, grid_file, q_file)
+            del wedge
+            size = os.path.getsize(grid_file) + os.path.getsize(q_file)
+
+            read_time, expected = extract(grid_file, q_file, False)
+            memmap_time, density = extract(grid_file, q_file, True)
+            if density != expected:
+                raise RuntimeError('Results differ: %s vs. %s'
+                                   % (density, expected))
+
+            print '%16s %10.1f %12.3f %12.3f %8.1f' \
+                  % ('%dx%dx%d' % shape, size / 1e6, read_time, memmap_time,
+                     read_time / memmap_time)
+    finally:
+        for path in (grid_file, q_file):
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
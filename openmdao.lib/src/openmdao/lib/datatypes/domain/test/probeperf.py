@@ -0,0 +1,76 @@
+"""
+Measure :meth:`mesh_probe` time on surfaces of a large cube, evaluating
+metrics one location at a time (as done originally) and on whole blocks of
+locations.
+"""
+
+import time
+
+from openmdao.lib.datatypes.domain import mesh_probe
+from openmdao.lib.datatypes.domain.metrics import create_scalar_metric, \
+                                                  get_metric, list_metrics, \
+                                                  register_metric
+from openmdao.lib.datatypes.domain.test.cube import create_cube
+
+
+def scalar_metric(name):
+    """
+    Register and return the name of a version of metric `name` without
+    :meth:`calculate_array`.
+    """
+    if name not in list_metrics():
+        create_scalar_metric(name)
+    cls, integrate, geometry = get_metric(name)
+
+    class Scalar(object):
+        """ Evaluates metric one location at a time. """
+
+        def __init__(self, zone, zone_name, reference_state):
+            self.metric = cls(zone, zone_name, reference_state)
+
+        def calculate(self, loc, geom):
+            return self.metric.calculate(loc, geom)
+
+        def dimensionalize(self, value):
+            return self.metric.dimensionalize(value)
+
+    scalar_name = 'scalar_' + name
+    register_metric(scalar_name, Scalar, integrate, geometry)
+    return scalar_name
+
+
+def probe(domain, regions, variables, weighting_scheme):
+    """ Return seconds to probe and the metric values. """
+    start = time.time()
+    values = mesh_probe(domain, regions, variables, weighting_scheme)
+    return (time.time() - start, values)
+
+
+def main():
+    """ Report probe times for surfaces of a large cube. """
+    cube = create_cube((101, 101, 51), 5., 4., 3.)
+    names = ('area', 'density', 'mass_flow')
+    vector = [(name, None) for name in names]
+    scalar = [(scalar_metric(name), None) for name in names]
+
+    print '%-12s %8s %12s %12s %8s' % ('region', 'weights', 'scalar (s)',
+                                        'vector (s)', 'speedup')
+    for label, region in (('I surface', ('xyzzy', 50, 50, 0, -1, 0, -1)),
+                          ('J surface', ('xyzzy', 0, -1, 50, 50, 0, -1)),
+                          ('K surface', ('xyzzy', 0, -1, 0, -1, 25, 25))):
+        for weighting_scheme in ('area', 'mass'):
+            vector_time, expected = probe(cube, [region], vector,
+                                          weighting_scheme)
+            scalar_time, values = probe(cube, [region], scalar,
+                                        weighting_scheme)
+            for value, expect in zip(values, expected):
+                if abs(value - expect) > 1e-9 * max(abs(expect), 1.):
+                    raise RuntimeError('Results differ: %s vs. %s'
+                                       % (values, expected))
+            print '%-12s %8s %12.3f %12.3f %8.1f' \
+                  % (label, weighting_scheme, scalar_time, vector_time,
+                     scalar_time / vector_time)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,8 @@ import logging
 import os.path
 import unittest
 
+import numpy
+
 from openmdao.lib.datatypes.domain import read_plot3d_q, write_plot3d_q, \
                                           read_plot3d_f, write_plot3d_f, \
                                           read_plot3d_shape, write_plot3d_grid
@@ -129,6 +131,52 @@ class TestCase(unittest.TestCase):
         self.assertTrue(domain.is_equivalent(wedge, logger=logger))
 
 
+    def test_memmap(self):
+        logging.debug('')
+        logging.debug('test_memmap')
+
+        logger = logging.getLogger()
+        wedge = create_wedge_3d((30, 20, 10), 5., 0.5, 2., 30.)
+        wedge2 = create_wedge_3d((29, 19, 9), 5., 2.5, 4., 30.)
+        wedge.add_domain(wedge2)
+
+        # Big-endian binary.
+        write_plot3d_q(wedge, 'be-binary.xyz', 'be-binary.q', logger=logger,
+                       big_endian=True, unformatted=False)
+        domain = read_plot3d_q('be-binary.xyz', 'be-binary.q', logger=logger,
+                               big_endian=True, unformatted=False,
+                               memmap=True)
+        self.assertTrue(isinstance(domain.zone_1.grid_coordinates.x,
+                                   numpy.memmap))
+        self.assertTrue(isinstance(domain.zone_2.flow_solution.momentum.z,
+                                   numpy.memmap))
+        domain.rename_zone('xyzzy', domain.zone_1)
+        self.assertTrue(domain.is_equivalent(wedge, logger=logger))
+
+        # Little-endian unformatted.
+        write_plot3d_q(domain, 'unformatted.xyz', 'unformatted.q',
+                       logger=logger)
+        expected = read_plot3d_q('unformatted.xyz', 'unformatted.q',
+                                 logger=logger)
+        domain = read_plot3d_q('unformatted.xyz', 'unformatted.q',
+                               logger=logger, memmap=True)
+        self.assertTrue(isinstance(domain.zone_2.grid_coordinates.z,
+                                   numpy.memmap))
+        self.assertTrue(domain.is_equivalent(expected, logger=logger))
+
+        # Extraction and modification of mapped data.
+        extracted = domain.zone_1.extract(0, -1, 5, 5, 0, -1)
+        self.assertTrue(extracted.is_equivalent(
+                            expected.zone_1.extract(0, -1, 5, 5, 0, -1),
+                            logger=logger))
+        domain.zone_1.flow_solution.density[0, 0, 0] = 42.
+        del domain, extracted
+        domain = read_plot3d_q('unformatted.xyz', 'unformatted.q',
+                               logger=logger, memmap=True)
+        self.assertTrue(domain.is_equivalent(expected, logger=logger))
+
+        del domain
+
     def test_f_3d(self):
         logging.debug('')
         logging.debug('test_f_3d')
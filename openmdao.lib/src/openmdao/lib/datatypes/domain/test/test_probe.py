@@ -10,6 +10,7 @@ import unittest
 from math import pi
 
 from openmdao.lib.datatypes.domain import mesh_probe
+from openmdao.lib.datatypes.domain.metrics import MassFlow, register_metric
 from openmdao.lib.datatypes.domain.test import restart, overflow
 from openmdao.lib.datatypes.domain.test.cube import create_cube
 from openmdao.lib.datatypes.domain.test.wedge import create_wedge_3d
@@ -19,6 +20,23 @@ from openmdao.util.testutil import assert_raises, assert_rel_error
 ORIG_DIR = os.getcwd()
 
 
+class ScalarMassFlow(object):
+    """ :class:`MassFlow` without :meth:`calculate_array`. """
+
+    def __init__(self, zone, zone_name, reference_state):
+        self.metric = MassFlow(zone, zone_name, reference_state)
+
+    def calculate(self, loc, normal):
+        """ Return metric value. """
+        return self.metric.calculate(loc, normal)
+
+    def dimensionalize(self, value):
+        """ Dimensionalize `value`. """
+        return self.metric.dimensionalize(value)
+
+register_metric('scalar_mass_flow', ScalarMassFlow, True, 'surface')
+
+
 class TestCase(unittest.TestCase):
     """ Test :class:`Domain` mesh_probe() operations. """
 
@@ -237,6 +255,22 @@ class TestCase(unittest.TestCase):
         assert_rel_error(self, metrics[5], -149.525, 0.00001)
         assert_rel_error(self, metrics[6], -262.976, 0.00001)
 
+    def test_scalar(self):
+        # Verify metrics without calculate_array() match vectorized ones.
+        logging.debug('')
+        logging.debug('test_scalar')
+
+        domain = restart.read('lpc-test', logging.getLogger())
+        variables = [('mass_flow', 'lbm/s'), ('scalar_mass_flow', 'lbm/s')]
+        for regions in ([('zone_1', 2, 2, 0, -1, 0, -1),
+                         ('zone_2', 2, 2, 0, -1, 0, -1)],
+                        [('zone_1', 0, -1, 2, 2, 0, -1)],
+                        [('zone_1', 0, -1, 0, -1, 2, 2)]):
+            for weighting_scheme in ('area', 'mass'):
+                vector, scalar = mesh_probe(domain, regions, variables,
+                                            weighting_scheme)
+                assert_rel_error(self, scalar, vector, 1e-12)
+
     def test_errors(self):
         logging.debug('')
         logging.debug('test_errors')
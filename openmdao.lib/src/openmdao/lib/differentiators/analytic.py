@@ -3,12 +3,14 @@
 
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import zeros, dot, linalg
+    from numpy import arange, dot, linalg, ndarray, zeros
+    from scipy.sparse import csc_matrix, dok_matrix
+    from scipy.sparse.linalg import gmres, splu, spilu, LinearOperator
 except ImportError as err:
     import logging
     logging.warn("In %s: %r" % (__file__, err))
     
-from openmdao.lib.datatypes.api import Enum, Bool
+from openmdao.lib.datatypes.api import Enum, Bool, Float
 from openmdao.lib.differentiators.chain_rule import ChainRule
 from openmdao.main.api import Driver, Assembly
 from openmdao.main.driver import Run_Once
@@ -45,6 +47,33 @@ def _d_conn(expr_txt, target, ascope):
     return source, expr_deriv
 
 
+def _size(value):
+    """ Returns the number of unknowns for a float or array variable."""
+    
+    if isinstance(value, ndarray):
+        return value.size
+    return 1
+
+
+def _set_block(matrix, row, col, value, size=1):
+    """ Stores a derivative in a system matrix, with its first element at
+    (row, col). Derivatives involving array variables are matrix blocks,
+    dense or sparse. A scalar derivative between two arrays of the given
+    size applies to each element, so it goes on the block diagonal."""
+    
+    if hasattr(value, 'tocoo'):
+        block = value.tocoo()
+        matrix[row + block.row, col + block.col] = block.data
+        
+    elif isinstance(value, ndarray):
+        value = value.reshape(size, -1)
+        matrix[row:row + value.shape[0], col:col + value.shape[1]] = value
+        
+    else:
+        index = arange(size)
+        matrix[row + index, col + index] = value
+        
+
 @stub_if_missing_deps('numpy')
 class Analytic(ChainRule):
     """ Differentiates a driver's workflow using one of the analytic
@@ -53,8 +82,10 @@ class Analytic(ChainRule):
     implements(IDifferentiator)
     
     # pylint: disable-msg=E1101
-    mode = Enum('direct', ['direct', 'adjoint'], iotype = 'in',
-                 desc='Choose forward or adjoint mode.')
+    mode = Enum('direct', ['direct', 'adjoint', 'auto'], iotype = 'in',
+                 desc='Choose forward or adjoint mode. auto - adjoint ' + \
+                 'if there are fewer objectives and constraints than ' + \
+                 'parameters, otherwise forward.')
     
     approach = Enum('functional', ['functional', 'residual', 'hybrid'],
                      iotype = 'in', desc = 'Approach for assembling the ' + \
@@ -66,6 +97,16 @@ class Analytic(ChainRule):
     sparse = Bool(False, iotype = 'in', desc='Set to True for sparse ' + \
                   'storage of matrices.')
     
+    linear_solver = Enum('lu', ['lu', 'gmres'], iotype = 'in',
+                         desc = 'Method for solving the linear system.\n' + \
+                         'lu - direct LU factorization (sparse if ' + \
+                         'sparse is True); ' + \
+                         'gmres - GMRES iterations, preconditioned with ' + \
+                         'an incomplete LU factorization.')
+    
+    gmres_tol = Float(1.0e-10, low=0.0, iotype = 'in',
+                      desc = 'Relative tolerance for the GMRES linear solver.')
+    
     def __init__(self):
         
         super(Analytic, self).__init__()
@@ -84,6 +125,10 @@ class Analytic(ChainRule):
         # Bookkeeping index/name
         self.var_list = []
         
+        # Number of elements in each unknown, and index of its first element
+        self.var_sizes = {}
+        self.var_offsets = {}
+        
     def get_derivative(self, output_name, wrt):
         """Returns the derivative of output_name with respect to wrt.
         
@@ -127,15 +172,25 @@ class Analytic(ChainRule):
         index = 1
         
         self.var_list = []
+        self.var_sizes = {}
 
         # Count recursively to get n_var and var_list
         self._edge_counter(self._parent, self._parent, index)
-        n_var = len(self.var_list)
+        
+        # Array variables contribute one unknown per element
+        self.var_offsets = {}
+        n_var = 0
+        for name in self.var_list:
+            self.var_offsets[name] = n_var
+            n_var += self.var_sizes[name]
                 
         n_param = len(self.param_names)
         n_eq = len(self.function_names)
         
-        self.LHS = zeros((n_var, n_var), 'd')
+        if self.sparse:
+            self.LHS = dok_matrix((n_var, n_var), 'd')
+        else:
+            self.LHS = zeros((n_var, n_var), 'd')
         
         #if self.mode == 'adjoint':
         #    self.EQS = zeros((n_var, n_param), 'd')
@@ -174,7 +229,7 @@ class Analytic(ChainRule):
                         
                 elif input_name in self.var_list:
                     
-                    i_var = self.var_list.index(input_name)
+                    i_var = self.var_offsets[input_name]
                     self.EQS[i_eq][i_var] = val
                     
             i_eq += 1
@@ -204,7 +259,7 @@ class Analytic(ChainRule):
 
                 elif input_name in self.var_list:
                     
-                    i_var = self.var_list.index(input_name)
+                    i_var = self.var_offsets[input_name]
                     self.EQS[i_eq][i_var] += val
                         
             for input_name, val in rhs.iteritems():
@@ -223,7 +278,7 @@ class Analytic(ChainRule):
 
                 elif input_name in self.var_list:
                     
-                    i_var = self.var_list.index(input_name)
+                    i_var = self.var_offsets[input_name]
                     self.EQS[i_eq][i_var] += val
                         
             i_eq += 1
@@ -255,6 +310,7 @@ class Analytic(ChainRule):
                 for input_name in edges[index_bar]:
                     input_full = "%s%s.%s" % (head, name, input_name)
                     self.var_list.append(input_full)
+                    self.var_sizes[input_full] = _size(node.get(input_name))
                     
                 node_scope_name = node.get_pathname()
                 self._edge_counter(node.driver, node.driver, index,
@@ -278,6 +334,7 @@ class Analytic(ChainRule):
                 if full_name not in self.param_names and \
                    full_name not in self.grouped_param_names:
                     self.var_list.append(full_name)
+                    self.var_sizes[full_name] = _size(node.get(item))
                 
         
     def calc_gradient(self):
@@ -382,8 +439,9 @@ class Analytic(ChainRule):
                 # Assembly inputs are unknowns, so they get equations
                 for input_name in edge_dict[0]:
                     
-                    self.LHS[i_eq][i_eq] = 1.0
                     input_full = "%s.%s" % (node_name, input_name)
+                    size = self.var_sizes["%s%s" % (head, input_full)]
+                    _set_block(self.LHS, i_eq, i_eq, 1.0, size)
                 
                     # Assy input conected to parameter goes in RHS
                     if input_full in self.param_names:
@@ -416,11 +474,12 @@ class Analytic(ChainRule):
                                                      ascope)
                         
                         # Chain together deriv from var connection and comp
-                        i_var = self.var_list.index("%s%s" % (head, source))
+                        i_var = self.var_offsets["%s%s" % (head, source)]
                          
-                        self.LHS[i_eq][i_var] = -expr_deriv[source]
+                        _set_block(self.LHS, i_eq, i_var, -expr_deriv[source],
+                                   size)
                  
-                    i_eq += 1
+                    i_eq += size
                 
                 # Recurse
                 assy_scope_name = node.get_pathname()
@@ -431,7 +490,9 @@ class Analytic(ChainRule):
                 sub_scope = ascope.get(node_name)
                 for output_name in edge_dict[1]:
                     
-                    self.LHS[i_eq][i_eq] = 1.0
+                    size = self.var_sizes["%s%s.%s" % (head, node_name,
+                                                       output_name)]
+                    _set_block(self.LHS, i_eq, i_eq, 1.0, size)
                 
                     sources = sub_scope._depgraph.connections_to(output_name)
                     for connect in sources:
@@ -449,13 +510,14 @@ class Analytic(ChainRule):
                                                  sub_scope)
                     
                     # Chain together deriv from var connection and comp
-                    i_var = self.var_list.index("%s%s.%s" % (head, 
-                                                             node_name, 
-                                                             source))
+                    i_var = self.var_offsets["%s%s.%s" % (head, 
+                                                          node_name, 
+                                                          source)]
                      
-                    self.LHS[i_eq][i_var] = -expr_deriv[source]
+                    _set_block(self.LHS, i_eq, i_var, -expr_deriv[source],
+                               size)
                  
-                    i_eq += 1
+                    i_eq += size
                 
                 continue
 
@@ -495,14 +557,16 @@ class Analytic(ChainRule):
                                                      ascope)
                         
                         # Chain together deriv from var connection and comp
-                        i_var = self.var_list.index("%s%s" % (head, source))
+                        i_var = self.var_offsets["%s%s" % (head, source)]
                          
                         conn_data[input_full] = (i_var, expr_deriv[source])
     
                 # Each output gives us an equation
                 for output_name in edge_dict[1]:
                      
-                    self.LHS[i_eq][i_eq] = 1.0
+                    size = self.var_sizes["%s%s.%s" % (head, item,
+                                                       output_name)]
+                    _set_block(self.LHS, i_eq, i_eq, 1.0, size)
                      
                     if fdblock:
                         local_out = "%s.%s" % (item, output_name)
@@ -523,25 +587,26 @@ class Analytic(ChainRule):
                              
                             i_param = self.param_names.index(input_full)
                              
-                            self.RHS[i_eq][i_param] = \
-                                local_derivs[local_out][local_in]
+                            _set_block(self.RHS, i_eq, i_param,
+                                       local_derivs[local_out][local_in], size)
                              
                         elif input_full in self.grouped_param_names:
                                  
                             grouped = self.grouped_param_names[input_full]
                             i_param = self.param_names.index(grouped)
                                  
-                            self.RHS[i_eq][i_param] = \
-                                local_derivs[local_out][local_in]
+                            _set_block(self.RHS, i_eq, i_param,
+                                       local_derivs[local_out][local_in], size)
                                  
                         # Input is a dependent in a solver loop
                         elif input_full in solver_conns:
                             
                             source = solver_conns[input_full]
-                            i_dep = self.var_list.index(source)
+                            i_dep = self.var_offsets[source]
                              
-                            self.LHS[i_eq][i_dep] = \
-                                -local_derivs[local_out][local_in]
+                            _set_block(self.LHS, i_eq, i_dep,
+                                       -local_derivs[local_out][local_in],
+                                       size)
                             
                         # Input connected to other outputs goes in LHS
                         else:
@@ -550,11 +615,11 @@ class Analytic(ChainRule):
                             i_var = conn_data[input_full][0]
                             expr_deriv = conn_data[input_full][1]
                             
-                            self.LHS[i_eq][i_var] = \
-                                -local_derivs[local_out][local_in] * \
-                                 expr_deriv
+                            _set_block(self.LHS, i_eq, i_var,
+                                       -local_derivs[local_out][local_in] * \
+                                       expr_deriv, size)
                      
-                    i_eq += 1
+                    i_eq += size
             
         return i_eq
     
@@ -565,10 +630,50 @@ class Analytic(ChainRule):
         Adjoint mode: solves for d(obj,constr)/dx
         """
         
-        if self.mode == 'adjoint':
-            total_derivs = linalg.solve(self.LHS.T, self.EQS.T)
+        mode = self.mode
+        if mode == 'auto':
+            # One solve per objective and constraint in adjoint mode, or
+            # per parameter in direct mode.
+            if len(self.function_names) < len(self.param_names):
+                mode = 'adjoint'
+            else:
+                mode = 'direct'
+        
+        if mode == 'adjoint':
+            total_derivs = self._linear_solve(self.EQS.T, transpose=True)
             self.gradient = self.EQS_zero + dot(total_derivs.T, self.RHS)
         else:
-            total_derivs = linalg.solve(self.LHS, self.RHS)
+            total_derivs = self._linear_solve(self.RHS)
             self.gradient = self.EQS_zero + dot(self.EQS, total_derivs)
-        
+            
+    def _linear_solve(self, rhs, transpose=False):
+        """Returns the solution of LHS*x = rhs, or of LHS.T*x = rhs if
+        transpose is True, for each column of rhs."""
+        
+        if self.LHS.shape[0] == 0:
+            return zeros(rhs.shape, 'd')
+        
+        if self.linear_solver == 'gmres':
+            lhs = csc_matrix(self.LHS)
+            if transpose:
+                lhs = lhs.T.tocsc()
+            precon = spilu(lhs)
+            precon = LinearOperator(lhs.shape, precon.solve)
+            
+            result = zeros(rhs.shape, 'd')
+            for j in range(rhs.shape[1]):
+                result[:, j], info = gmres(lhs, rhs[:, j], M=precon,
+                                           tol=self.gmres_tol)
+                if info != 0:
+                    msg = "GMRES failed to converge (info = %d)" % info
+                    raise RuntimeError(msg)
+            return result
+                
+        elif self.sparse:
+            trans = 'T' if transpose else 'N'
+            return splu(self.LHS.tocsc()).solve(rhs, trans=trans)
+            
+        elif transpose:
+            return linalg.solve(self.LHS.T, rhs)
+        else:
+            return linalg.solve(self.LHS, rhs)
@@ -10,6 +10,7 @@ from openmdao.lib.datatypes.api import Float
 from openmdao.lib.differentiators.fd_helper import FDhelper
 from openmdao.main.api import Driver, Assembly, Container
 from openmdao.main.container import find_name
+from openmdao.main.derivatives import jacobian_product
 from openmdao.main.driver import Run_Once
 from openmdao.main.interfaces import implements, IDifferentiator, ISolver
 from openmdao.main.mp_support import has_interface
@@ -627,8 +628,8 @@ class ChainRule(Container):
                             local_in = input_name
                         
                         derivs[full_output_name] += \
-                            local_derivs[local_out][local_in] * \
-                            incoming_derivs[full_input_name]
+                            jacobian_product(local_derivs[local_out][local_in],
+                                             incoming_derivs[full_input_name])
                             
             
 
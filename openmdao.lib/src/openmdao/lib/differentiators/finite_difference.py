@@ -9,11 +9,15 @@ from itertools import product
 
 from openmdao.main.numpy_fallback import array
 
-from openmdao.lib.datatypes.api import Enum, Float
+from openmdao.lib.datatypes.api import Bool, Enum, Float
 from openmdao.main.api import Container
+from openmdao.main.case import Case
 from openmdao.main.interfaces import implements, IDifferentiator
 from openmdao.main.container import find_name
 
+from openmdao.lib.casehandlers.api import ListCaseIterator
+from openmdao.lib.drivers.caseiterdriver import CaseIteratorDriver
+
 
 def diff_1st_central(fp, fm, eps):
     """Evaluates a first order central difference."""
@@ -50,6 +54,11 @@ class FiniteDifference(Container):
     default_stepsize = Float(1.0e-6, iotype='in', desc='Default finite ' + \
                              'difference step size.')
     
+    sequential = Bool(True, iotype='in', desc='If True, evaluate the ' + \
+                      'perturbed points sequentially. Otherwise they are ' + \
+                      'evaluated concurrently on servers obtained from ' + \
+                      'the ResourceAllocationManager.')
+    
     def __init__(self):
         
         super(FiniteDifference, self).__init__()
@@ -197,15 +206,15 @@ class FiniteDifference(Container):
             self.gradient_case[param] = pcase
             
         # Run all "cases".
-        # TODO - Integrate OpenMDAO's concurrent processing capability once it
-        # is formalized. This operation is inherently paralellizable.
+        pcases = []
         for key, case in self.gradient_case.iteritems():
             for ipcase, pcase in enumerate(case):
                 if deltas[ipcase]:
-                    pcase['data'] = self._run_point(pcase['param'])
+                    pcases.append(pcase)
                 else:
                     pcase['data'] = base_data
-                
+        self._run_points(pcases)
+        
         
         # Calculate gradients
         for key, case in self.gradient_case.iteritems():
@@ -313,8 +322,7 @@ class FiniteDifference(Container):
             self.hessian_offdiag_case[param1] = offdiag
             
         # Run all "cases".
-        # TODO - Integrate OpenMDAO's concurrent processing capability once it
-        # is formalized. This operation is inherently paralellizable.
+        pcases = []
         
         # We don't need to re-run on-diag cases if the gradients were
         # calculated with Central Difference.
@@ -328,15 +336,14 @@ class FiniteDifference(Container):
                     pcase['data'] = gradient_ipcase['data'] 
         else:
             for case in self.hessian_ondiag_case.values():
-                for pcase in case:
-                    data = self._run_point(pcase['param'])
-                    pcase['data'] = data
+                pcases.extend(case)
 
         # Off-diag cases must always be run.
         for cases in self.hessian_offdiag_case.values():
             for case in cases.values():
-                for pcase in case:
-                    pcase['data'] = self._run_point(pcase['param'])
+                pcases.extend(case)
+                
+        self._run_points(pcases)
 
                     
         # Calculate Hessians - On Diagonal
@@ -376,6 +383,90 @@ class FiniteDifference(Container):
                         self.hessian[key1][key2][name]
                     
     
+    def _run_points(self, pcases):
+        """Runs the model at each point in `pcases` and stores the results
+        in each entry's 'data' field. If `sequential` is False, the points
+        are evaluated concurrently by a temporary :class:`CaseIteratorDriver`
+        which shares our parent's workflow."""
+        
+        if self.sequential or len(pcases) < 2:
+            for pcase in pcases:
+                pcase['data'] = self._run_point(pcase['param'])
+            return
+        
+        cases = [self._make_case(pcase['param']) for pcase in pcases]
+        
+        driver = CaseIteratorDriver()
+        driver.sequential = False
+        driver.iterator = ListCaseIterator(cases)
+        driver.workflow.add(self._parent.workflow.get_names())
+        
+        scope = self._parent.parent
+        name = '%s_fd_cases' % self._parent.name
+        scope.add(name, driver)
+        try:
+            driver.run()
+            evaluated = dict([(case.uuid, case) for case in driver.evaluated])
+        finally:
+            scope.remove(name)
+        
+        for pcase, case in zip(pcases, cases):
+            case = evaluated[case.uuid]
+            if case.msg:
+                self.raise_exception('Evaluation of %s failed: %s' \
+                                     % (dict(pcase['param']), case.msg),
+                                     RuntimeError)
+            pcase['data'] = self._case_data(case)
+            
+    def _make_case(self, data_param):
+        """Returns a Case which sets the parameters to the values in
+        `data_param` and collects the objectives and constraints."""
+        
+        case = Case()
+        for val, param in zip(data_param.values(), 
+                              self._parent.get_parameters().values()):
+            
+            # ParameterGroups hold their Parameters in _params.
+            for sub in getattr(param, '_params', [param]):
+                case.add_input(sub.target, sub._transform(float(val)))
+                
+        for item in self._parent.get_objectives().values():
+            case.add_output(item.text)
+        
+        for item in self._get_constraints().values():
+            case.add_output(item.lhs.text)
+            case.add_output(item.rhs.text)
+            
+        return case
+    
+    def _case_data(self, case):
+        """Extracts the objective and constraint values from an evaluated
+        Case in the same form that `_run_point` returns them."""
+        
+        data = {}
+        for key, item in self._parent.get_objectives().iteritems():
+            data[key] = case[item.text]
+            
+        for key, item in self._get_constraints().iteritems():
+            lhs = (case[item.lhs.text] + item.adder)*item.scaler
+            rhs = (case[item.rhs.text] + item.adder)*item.scaler
+            if '>' in item.comparator:
+                data[key] = rhs-lhs
+            else:
+                data[key] = lhs-rhs
+                
+        return data
+    
+    def _get_constraints(self):
+        """Returns an OrderedDict of all of our parent's constraints."""
+        
+        constraints = OrderedDict()
+        if self.ineqconst_names:
+            constraints.update(self._parent.get_ineq_constraints())
+        if self.eqconst_names:
+            constraints.update(self._parent.get_eq_constraints())
+        return constraints
+            
     def _run_point(self, data_param):
         """Runs the model at a single point and captures the results. Note that 
         some differences require the baseline point."""
@@ -385,7 +476,7 @@ class FiniteDifference(Container):
         self._parent.set_parameters(dvals)
 
         # Run the model
-        super(type(self._parent), self._parent).run_iteration()
+        self._run_model()
         
         data = {}
 
@@ -420,7 +511,14 @@ class FiniteDifference(Container):
         
         dvals = [float(val) for val in self.base_param.values()]
         self._parent.set_parameters(dvals)
-        super(type(self._parent), self._parent).run_iteration()
+        self._run_model()
+
+    def _run_model(self):
+        """Runs our parent's workflow. The parent's `eval_cache` is bypassed
+        because the responses are read from the model."""
+        
+        parent = self._parent
+        parent.workflow.run(ffd_order=parent.ffd_order, case_id=parent._case_id)
 
         
     def raise_exception(self, msg, exception_class=Exception):
@@ -6,7 +6,9 @@ import unittest
 from nose import SkipTest
 
 # pylint: disable-msg=E0611,F0401
-from openmdao.lib.datatypes.api import Float, Int
+from numpy import array, zeros
+
+from openmdao.lib.datatypes.api import Array, Float, Int
 from openmdao.lib.differentiators.analytic import Analytic
 from openmdao.lib.differentiators.api import FiniteDifference
 from openmdao.lib.drivers.api import FixedPointIterator, BroydenSolver
@@ -113,6 +115,58 @@ class CompInch(ComponentWithDerivatives):
         self.derivatives.set_first_derivative('y', 'x', dy_dx)
         
         
+class ArrayComp1(ComponentWithDerivatives):
+    """ Evaluates the equation y=x*[1, 2, 3]"""
+    
+    # pylint: disable-msg=E1101
+    x = Float(0.0, iotype='in')
+    y = Array(zeros(3), iotype='out')
+
+    def __init__(self):
+        """ declare what derivatives that we can provide"""
+        
+        super(ArrayComp1, self).__init__()
+        
+        self.derivatives.declare_first_derivative('y', 'x')
+
+    def execute(self):
+        """ Executes it """
+        
+        self.y = self.x*array([1.0, 2.0, 3.0])
+
+    def calculate_first_derivatives(self):
+        """Analytical first derivatives"""
+        
+        dy_dx = array([[1.0], [2.0], [3.0]])
+        self.derivatives.set_first_derivative('y', 'x', dy_dx)
+        
+        
+class ArrayComp2(ComponentWithDerivatives):
+    """ Evaluates the equation f=sum(y^2)"""
+    
+    # pylint: disable-msg=E1101
+    y = Array(zeros(3), iotype='in')
+    f = Float(0.0, iotype='out')
+
+    def __init__(self):
+        """ declare what derivatives that we can provide"""
+        
+        super(ArrayComp2, self).__init__()
+        
+        self.derivatives.declare_first_derivative('f', 'y')
+
+    def execute(self):
+        """ Executes it """
+        
+        self.f = sum(self.y**2)
+
+    def calculate_first_derivatives(self):
+        """Analytical first derivatives"""
+        
+        df_dy = 2.0*self.y.reshape(1, 3)
+        self.derivatives.set_first_derivative('f', 'y', df_dy)
+        
+        
 @add_delegate(HasParameters, HasObjectives, HasConstraints)
 class Driv(DriverUsesDerivatives):
     """ Simple dummy driver"""
@@ -803,6 +857,82 @@ class AnalyticTestCase(unittest.TestCase):
         grad = self.top.driver.differentiator.get_gradient(obj)
         assert_rel_error(self, grad[0], 0.08660, .001)
         
+    def test_simple_coupled_solvers(self):
+        
+        for sparse, solver, mode in [(True, 'lu', 'direct'),
+                                     (True, 'lu', 'adjoint'),
+                                     (False, 'gmres', 'direct'),
+                                     (True, 'gmres', 'adjoint'),
+                                     (False, 'lu', 'auto')]:
+            
+            self.top = set_as_top(Assembly())
+        
+            exp1 = ['y2 = 0.5*sin(x1) - 0.5*x1*y1']
+            deriv1 = ['dy2_dx1 = 0.5*cos(x1) - 0.5*y1',
+                      'dy2_dy1 = -0.5*x1']
+            
+            exp2 = ['y1 = x2*x2*y2']
+            deriv2 = ['dy1_dx2 = 2.0*y2*x2',
+                      'dy1_dy2 = x2*x2']
+            
+            self.top.add('driver', Driv())
+        
+            self.top.add('comp1', ExecCompWithDerivatives(exp1, deriv1))
+            self.top.add('comp2', ExecCompWithDerivatives(exp2, deriv2))
+            self.top.add('solver', BroydenSolver())
+                
+            self.top.driver.workflow.add(['solver'])
+            self.top.solver.workflow.add(['comp1', 'comp2'])
+            self.top.connect('comp1.y2', 'comp2.y2')
+            
+            # Solver setup
+            self.top.solver.add_parameter('comp1.y1', low=-1.e99, high=1.e99)
+            self.top.solver.add_constraint('comp2.y1 = comp1.y1')
+            
+            # Top driver setup
+            self.top.driver.differentiator = Analytic()
+            self.top.driver.differentiator.sparse = sparse
+            self.top.driver.differentiator.linear_solver = solver
+            self.top.driver.differentiator.mode = mode
+            obj = 'comp2.y1'
+            self.top.driver.add_parameter('comp1.x1', low=-100., high=100., fd_step=.001)
+            self.top.driver.add_parameter('comp2.x2', low=-100., high=100., fd_step=.0001)
+            self.top.driver.add_objective(obj)
+        
+            self.top.comp1.x1 = 1.0
+            self.top.comp2.x2 = 1.0
+            self.top.run()
+            self.top.driver.differentiator.calc_gradient()
+            
+            grad = self.top.driver.differentiator.get_gradient(obj)
+            assert_rel_error(self, grad[0], 0.08660, .001)
+            assert_rel_error(self, grad[1], 0.37399, .001)
+        
+    def test_array_blocks(self):
+        
+        for mode, sparse in [('direct', False), ('adjoint', True)]:
+            
+            self.top = set_as_top(Assembly())
+            self.top.add('driver', Driv())
+            self.top.add('comp1', ArrayComp1())
+            self.top.add('comp2', ArrayComp2())
+            self.top.driver.workflow.add(['comp1', 'comp2'])
+            self.top.connect('comp1.y', 'comp2.y')
+            
+            self.top.driver.differentiator = Analytic()
+            self.top.driver.differentiator.mode = mode
+            self.top.driver.differentiator.sparse = sparse
+            self.top.driver.add_parameter('comp1.x', low=-100., high=100., fd_step=.001)
+            self.top.driver.add_objective('comp2.f')
+            
+            self.top.comp1.x = 2.0
+            self.top.run()
+            self.top.driver.differentiator.calc_gradient()
+            
+            # df/dx = 2*x*(1 + 4 + 9)
+            grad = self.top.driver.differentiator.get_gradient('comp2.f')
+            assert_rel_error(self, grad[0], 56.0, .001)
+        
     def test_medium_coupled(self):
         
         self.top = set_as_top(Assembly())
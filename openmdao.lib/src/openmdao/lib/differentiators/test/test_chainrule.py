@@ -6,7 +6,9 @@ import unittest
 from nose import SkipTest
 
 # pylint: disable-msg=E0611,F0401
-from openmdao.lib.datatypes.api import Float, Int
+from numpy import array, zeros
+
+from openmdao.lib.datatypes.api import Array, Float, Int
 from openmdao.lib.differentiators.chain_rule import ChainRule
 from openmdao.main.api import ComponentWithDerivatives, Assembly, set_as_top
 from openmdao.main.driver_uses_derivatives import DriverUsesDerivatives
@@ -111,6 +113,58 @@ class CompInch(ComponentWithDerivatives):
         self.derivatives.set_first_derivative('y', 'x', dy_dx)
         
         
+class ArrayComp1(ComponentWithDerivatives):
+    """ Evaluates the equation y=x*[1, 2, 3]"""
+    
+    # pylint: disable-msg=E1101
+    x = Float(0.0, iotype='in')
+    y = Array(zeros(3), iotype='out')
+
+    def __init__(self):
+        """ declare what derivatives that we can provide"""
+        
+        super(ArrayComp1, self).__init__()
+        
+        self.derivatives.declare_first_derivative('y', 'x')
+
+    def execute(self):
+        """ Executes it """
+        
+        self.y = self.x*array([1.0, 2.0, 3.0])
+
+    def calculate_first_derivatives(self):
+        """Analytical first derivatives"""
+        
+        dy_dx = array([[1.0], [2.0], [3.0]])
+        self.derivatives.set_first_derivative('y', 'x', dy_dx)
+        
+        
+class ArrayComp2(ComponentWithDerivatives):
+    """ Evaluates the equation f=sum(y^2)"""
+    
+    # pylint: disable-msg=E1101
+    y = Array(zeros(3), iotype='in')
+    f = Float(0.0, iotype='out')
+
+    def __init__(self):
+        """ declare what derivatives that we can provide"""
+        
+        super(ArrayComp2, self).__init__()
+        
+        self.derivatives.declare_first_derivative('f', 'y')
+
+    def execute(self):
+        """ Executes it """
+        
+        self.f = sum(self.y**2)
+
+    def calculate_first_derivatives(self):
+        """Analytical first derivatives"""
+        
+        df_dy = 2.0*self.y.reshape(1, 3)
+        self.derivatives.set_first_derivative('f', 'y', df_dy)
+        
+        
 @add_delegate(HasParameters, HasObjectives, HasConstraints)
 class Driv(DriverUsesDerivatives):
     """ Simple dummy driver"""
@@ -335,6 +389,27 @@ class ChainRuleTestCase(unittest.TestCase):
         grad = self.top.driver.differentiator.get_gradient('comp5.y1-nest1.comp3.y1>0')
         assert_rel_error(self, grad[0], -313.0+10.5, .001)
     
+    def test_array_blocks(self):
+
+        self.top = set_as_top(Assembly())
+        self.top.add('driver', Driv())
+        self.top.add('comp1', ArrayComp1())
+        self.top.add('comp2', ArrayComp2())
+        self.top.driver.workflow.add(['comp1', 'comp2'])
+        self.top.connect('comp1.y', 'comp2.y')
+        
+        self.top.driver.differentiator = ChainRule()
+        self.top.driver.add_parameter('comp1.x', low=-100., high=100., fd_step=.001)
+        self.top.driver.add_objective('comp2.f')
+        
+        self.top.comp1.x = 2.0
+        self.top.run()
+        self.top.driver.differentiator.calc_gradient()
+        
+        # df/dx = 2*x*(1 + 4 + 9)
+        grad = self.top.driver.differentiator.get_gradient('comp2.f')
+        assert_rel_error(self, grad[0], 56.0, .001)
+        
     def test_find_edges(self):
         # Verifies that we don't chain derivatives for inputs that are
         # connected in a parent assembly, but are not germain to our subassy
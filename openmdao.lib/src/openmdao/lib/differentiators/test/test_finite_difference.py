@@ -2,6 +2,8 @@
 Test of the Finite Difference differentiator.
 """
 
+import os
+import pkg_resources
 import unittest
 
 # pylint: disable-msg=E0611,F0401
@@ -195,6 +197,35 @@ class FiniteDifferenceTestCase(unittest.TestCase):
         self.model.driver.differentiator.reset_state()
         assert_rel_error(self, self.model.comp.u,
                               1.0, .0001)
+        
+    def test_concurrent(self):
+        
+        # Need to be in this directory or there are issues with egg loading.
+        orig_dir = os.getcwd()
+        os.chdir(pkg_resources.resource_filename('openmdao.lib.differentiators',
+                                                 'test'))
+        try:
+            self.model.driver.differentiator.sequential = False
+            self.model.comp.x = 1.0
+            self.model.comp.u = 1.0
+            self.model.run()
+            self.model.driver.differentiator.calc_gradient()
+            assert_rel_error(self, self.model.driver.differentiator.get_derivative('comp.y',wrt='comp.x'),
+                                   6.0, .001)
+            assert_rel_error(self, self.model.driver.differentiator.get_derivative('Con1',wrt='comp.u'),
+                                   15.0, .001) 
+            assert_rel_error(self, self.model.driver.differentiator.get_derivative('ConE',wrt='comp.u'),
+                                   16.0, .001)
+            
+            self.model.driver.differentiator.default_stepsize = .001
+            self.model.driver.differentiator.calc_hessian(reuse_first=True)
+            assert_rel_error(self, self.model.driver.differentiator.get_2nd_derivative('comp.y',wrt=('comp.x', 'comp.u')),
+                                   4.0, .001)
+            
+            # The temporary case driver must not be left behind.
+            self.assertFalse(hasattr(self.model, 'driver_fd_cases'))
+        finally:
+            os.chdir(orig_dir)
 
 if __name__ == '__main__':
     unittest.main()
@@ -22,8 +22,7 @@ from random import randint, shuffle
 
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import array, size, sum, floor, zeros
-    from numpy.linalg import norm
+    from numpy import array, size, sum, floor, zeros, abs, arange, errstate
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 
@@ -84,6 +83,9 @@ class LHC_indivudal(object):
         self.p = p
         self.doe = doe
         self.phi = None # Morris-Mitchell sampling criterion
+        self.terms = None # distance**(-q) for each pair of points
+        self._parent = None # individual this was perturbed from
+        self._changed = () # rows that differ from the parent
     
     @property
     def shape(self):
@@ -95,25 +97,38 @@ class LHC_indivudal(object):
 
         if self.phi is None:
             n,m = self.doe.shape
-            distdict = {}
+            parent = self._parent
+            rows = sorted(self._changed)
+            if parent is None or parent.terms is None or len(rows) > n/2:
+                self.terms = self._pair_terms(range(n))
+            else:
+                # Only the distances involving the changed rows need
+                # recalculating. The terms are summed again rather than
+                # updated, since for large q they span too many orders
+                # of magnitude to subtract the old ones accurately.
+                self.terms = parent.terms.copy()
+                new_terms = self._pair_terms(rows)
+                self.terms[rows] = new_terms
+                self.terms[:, rows] = new_terms.T
+            self._parent = None
             
-            #calculate the norm between each pair of points in the DOE
-            # TODO: This norm takes up the majority of the computation time. It
-            # should be converted to C or ShedSkin.
-            arr = self.doe
-            for i in range(n):
-                for j in range(i+1, n):
-                    nrm = norm(arr[i]-arr[j], ord=self.p)
-                    distdict[nrm] = distdict.get(nrm, 0) + 1
-    
-            distinct_d = array(distdict.keys())
-            
-            #mutltiplicity array with a count of how many pairs of points have a given distance
-            J = array(distdict.values())
-            
-            self.phi = sum(J*(distinct_d**(-self.q)))**(1.0/self.q)
+            self.phi = (sum(self.terms)/2.)**(1.0/self.q)
         
         return self.phi
+
+    def _pair_terms(self, rows):
+        """Returns distance**(-q) between each of the given rows of the DOE
+        and each point in the DOE, with zero for a point and itself."""
+        arr = self.doe
+        points = arr[rows]
+        dist = zeros((len(rows), len(arr)))
+        for j in range(arr.shape[1]):
+            dist += abs(points[:, j:j+1]-arr[:, j])**self.p
+        dist[arange(len(rows)), rows] = 1.
+        with errstate(divide='ignore'):
+            terms = dist**(-float(self.q)/self.p)
+        terms[arange(len(rows)), rows] = 0.
+        return terms
     
     def perturb(self, mutation_count):
         """ Interchanges pairs of randomly chosen elements within randomly chosen
@@ -122,6 +137,7 @@ class LHC_indivudal(object):
         """
         new_doe = self.doe.copy()
         n,k = self.doe.shape
+        changed = set()
         for count in range(mutation_count): 
             col = randint(0, k-1)
             
@@ -133,8 +149,12 @@ class LHC_indivudal(object):
            
             new_doe[el1, col] = self.doe[el2, col]
             new_doe[el2, col] = self.doe[el1, col] 
-               
-        return LHC_indivudal(new_doe, self.q, self.p)
+            changed.update((el1, el2))
+        
+        new_lhc = LHC_indivudal(new_doe, self.q, self.p)
+        new_lhc._parent = self
+        new_lhc._changed = changed
+        return new_lhc
     
     def __iter__(self):
         return self._get_rows()
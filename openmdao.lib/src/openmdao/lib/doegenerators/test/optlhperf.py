@@ -0,0 +1,69 @@
+"""
+Measure time to calculate the Morris-Mitchell criterion of a Latin
+hypercube, as done originally with a loop over pairs of points, with the
+current vectorized distances, and incrementally for a perturbed Latin
+hypercube, and time to generate an OptLatinHypercube.
+"""
+
+import random
+import time
+
+from numpy import array
+from numpy.linalg import norm
+
+from openmdao.lib.doegenerators.optlh import LHC_indivudal, \
+                                             OptLatinHypercube, \
+                                             rand_latin_hypercube
+
+
+def loop_mmphi(doe, q, p):
+    """ Return Morris-Mitchell criterion computed as `LHC_indivudal`
+    originally did. """
+    n = len(doe)
+    distdict = {}
+    for i in range(n):
+        for j in range(i+1, n):
+            nrm = norm(doe[i]-doe[j], ord=p)
+            distdict[nrm] = distdict.get(nrm, 0) + 1
+    distinct_d = array(distdict.keys())
+    J = array(distdict.values())
+    return sum(J*(distinct_d**(-q)))**(1.0/q)
+
+
+def timed(func, *args):
+    """ Return seconds to call `func` with `args`, and the result. """
+    start = time.time()
+    result = func(*args)
+    return (time.time() - start, result)
+
+
+def main():
+    """ Report times for a range of DOE sizes. """
+    random.seed(10)
+    print '%10s %12s %12s %16s %12s' % ('shape', 'loop (s)', 'vector (s)',
+                                        'incremental (s)', 'generate (s)')
+    for n, k in ((50, 5), (200, 10), (500, 20)):
+        doe = rand_latin_hypercube(n, k)
+        loop_time, expected = timed(loop_mmphi, doe, 2, 1)
+
+        lhc = LHC_indivudal(doe, 2, 1)
+        vector_time, phi = timed(lhc.mmphi)
+        if abs(phi - expected) > 1e-10*expected:
+            raise RuntimeError('Results differ: %s vs. %s' % (phi, expected))
+
+        child = lhc.perturb(1)
+        incr_time, phi = timed(child.mmphi)
+        expected = LHC_indivudal(child.doe, 2, 1).mmphi()
+        if abs(phi - expected) > 1e-10*expected:
+            raise RuntimeError('Results differ: %s vs. %s' % (phi, expected))
+
+        olh = OptLatinHypercube(n)
+        olh.num_parameters = k
+        gen_time, rows = timed(list, olh)
+
+        print '%10s %12.4f %12.4f %16.4f %12.3f' \
+              % ('%dx%d' % (n, k), loop_time, vector_time, incr_time, gen_time)
+
+
+if __name__ == '__main__':
+    main()
@@ -24,6 +24,24 @@ class TestCase(unittest.TestCase):
         self.assertTrue(is_latin_hypercube(lh_opt))
         self.assertTrue(opt_phi < phi1)
         
+    def test_mmphi(self):
+        doe = array([[1,2,3],[3,1,2],[2,3,1]])
+        # 1-norm distances are 4, 4 and 4
+        lh = LHC_indivudal(doe, 2, 1)
+        self.assertAlmostEqual(lh.mmphi(), (3./16.)**0.5, places=12)
+        # 2-norm distances are 6**.5, 6**.5 and 6**.5
+        lh = LHC_indivudal(doe, 5, 2)
+        self.assertAlmostEqual(lh.mmphi(), (3./6.**2.5)**0.2, places=12)
+
+    def test_mmphi_perturbed(self):
+        for q, p in ((1, 1), (2, 2), (50, 1)):
+            lh = LHC_indivudal(rand_latin_hypercube(20,3), q, p)
+            lh.mmphi()
+            for i in range(10):
+                lh = lh.perturb(random.randint(1, 4))
+                expected = LHC_indivudal(lh.doe, q, p).mmphi()
+                self.assertAlmostEqual(lh.mmphi()/expected, 1., places=12)
+        
     def test_OptLatinHypercube(self):
         olh = OptLatinHypercube()
         olh.num_samples = 10
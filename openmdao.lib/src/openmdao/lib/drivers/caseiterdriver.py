@@ -4,16 +4,22 @@
 """
 
 import logging
+import multiprocessing
+import os
 import os.path
 import Queue
+from collections import deque
+import shutil
 import sys
+import tempfile
 import thread
 import threading
 import traceback
 
-from openmdao.main.datatypes.api import Bool, Dict, Enum, Int, Slot
+from openmdao.main.datatypes.api import Bool, Dict, Enum, Float, Int, Slot
 
-from openmdao.main.api import Driver
+from openmdao.main.api import Driver, SimulationRoot
+from openmdao.main.case import Case
 from openmdao.main.exceptions import RunStopped, TracedError, traceback_str
 from openmdao.main.expreval import ExprEvaluator
 from openmdao.main.interfaces import ICaseIterator, ICaseRecorder, ICaseFilter
@@ -31,6 +37,71 @@ _EMPTY     = 'empty'
 _LOADING   = 'loading'
 _EXECUTING = 'executing'
 
+# Driver being evaluated by forked worker processes. This is set for the
+# lifetime of the worker pool so each worker, including any started to replace
+# one which exited, inherits the configured model.
+_FORKED_DRIVER = None
+
+# Set if a forked worker process failed to initialize.
+_FORKED_INIT_ERROR = None
+
+def _forked_init(basedir):
+    """
+    Initialize a forked worker process. If `basedir` is not None, the worker
+    runs in its own copy of the simulation root directory, created under
+    `basedir`, so models which use files don't collide. The copy is made once
+    and reused for every case the worker evaluates.
+    """
+    global _FORKED_INIT_ERROR
+    if basedir is None:
+        return
+    def _ignore(path, names):
+        """ Don't copy `basedir` if it's under the root directory. """
+        return [name for name in names
+                     if os.path.realpath(os.path.join(path, name)) == basedir]
+    try:
+        workdir = os.path.join(basedir, 'worker_%d' % os.getpid())
+        shutil.copytree(SimulationRoot.get_root(), workdir, symlinks=True,
+                        ignore=_ignore)
+        SimulationRoot.chroot(workdir)
+    except Exception as exc:
+        _FORKED_INIT_ERROR = (str(exc), traceback.format_exc())
+
+def _forked_run_case(args):
+    """
+    Run a case in a forked worker process using the model inherited from
+    the parent process. Returns ``(outputs, msg, traceback)``.
+    """
+    inputs, outputs, events, case_id = args
+    driver = _FORKED_DRIVER
+    if _FORKED_INIT_ERROR is not None:
+        msg, tback = _FORKED_INIT_ERROR
+        return (None, '%s: Exception initializing worker: %s' 
+                      % (driver.get_pathname(), msg), tback)
+    scope = driver.parent
+    case = Case(inputs=inputs, outputs=outputs, case_uuid=case_id)
+    try:
+        for event in events:
+            scope.set(event, True)
+        case.apply_inputs(scope)
+    except Exception as exc:
+        msg = '%s: Exception setting case inputs: %s' \
+              % (driver.get_pathname(), exc)
+        return (None, msg, traceback.format_exc())
+    try:
+        driver.workflow.run(case_id=case_id)
+    except Exception as exc:
+        return (None, str(exc), traceback.format_exc())
+    if not outputs:
+        return ([], None, None)
+    try:
+        case.update_outputs(scope)
+    except Exception as exc:
+        msg = '%s: Exception getting case outputs: %s' \
+              % (driver.get_pathname(), exc)
+        return (None, msg, traceback.format_exc())
+    return (case.get_outputs(), None, None)
+
 class _ServerError(Exception):
     """ Raised when a server thread has problems. """
     pass
@@ -60,6 +131,44 @@ class CaseIterDriverBase(Driver):
     extra_resources = Dict(iotype='in',
                            desc='Extra resource requirements (unusual).')
 
+    batch_remote = Bool(False, iotype='in',
+                        desc='If True, the events, inputs, execution and'
+                             ' outputs of a case evaluated on a remote server'
+                             ' are handled by a single call to the server.')
+
+    prefetch = Int(0, low=0, iotype='in',
+                   desc='Number of additional cases queued on each remote'
+                        ' server while it is executing a case. Only used if'
+                        ' batch_remote is True and reload_model is False.')
+
+    local_processes = Int(0, low=0, iotype='in',
+                          desc='If > 0 and sequential is False, cases are'
+                               ' evaluated by this many worker processes'
+                               ' forked from the current model instead of on'
+                               ' servers from the ResourceAllocationManager.'
+                               ' Workers are reused for several cases'
+                               ' regardless of reload_model.'
+                               ' Not available on Windows.')
+
+    local_max_cases = Int(0, low=0, iotype='in',
+                          desc='If > 0, a forked worker is replaced by a newly'
+                               ' forked one after evaluating this many cases.'
+                               ' Use 1 to evaluate each case in a fresh copy'
+                               ' of the model.')
+
+    local_copy_root = Bool(False, iotype='in',
+                           desc='If True, each forked worker runs in its own'
+                                ' copy of the simulation root directory, so'
+                                ' models which use files don\'t collide.'
+                                ' Otherwise workers share the simulation root'
+                                ' directory.')
+
+    local_timeout = Float(3600., low=0., iotype='in', units='s',
+                          desc='If > 0, maximum time to wait for the result'
+                               ' of a case evaluated by a forked worker. A'
+                               ' worker which dies without returning a result'
+                               ' is only detected by this timeout.')
+
     ignore_egg_requirements = Bool(False, iotype='in',
                                    desc='If True, no distribution or orphan'
                                         ' requirements will be included in the'
@@ -89,6 +198,7 @@ class CaseIterDriverBase(Driver):
         self._server_cases = {}
         self._exceptions = {}
         self._load_failures = {}
+        self._in_flight = {}  # Batched cases queued on each server.
  
         self._todo = []   # Cases grabbed during server startup.
         self._rerun = []  # Cases that failed and should be retried.
@@ -126,6 +236,9 @@ class CaseIterDriverBase(Driver):
                         self.step()
                     except StopIteration:
                         break
+            elif self._use_fork():
+                self._logger.info('Start forked evaluation.')
+                self._start_forked()
             else:
                 self._logger.info('Start concurrent evaluation.')
                 self._start()
@@ -176,7 +289,7 @@ class CaseIterDriverBase(Driver):
         """
         self._cleanup(remove_egg=replicate)
 
-        if not self.sequential:
+        if not self.sequential and not self._use_fork():
             if replicate or self._egg_file is None:
                 # Save model to egg.
                 # Must do this before creating any locks or queues.
@@ -215,6 +328,79 @@ class CaseIterDriverBase(Driver):
         """Returns a new iterator over the Case set."""
         raise NotImplementedError('get_case_iterator')
 
+    def _use_fork(self):
+        """ Return True if cases are to be evaluated by forked processes. """
+        return self.local_processes > 0 and hasattr(os, 'fork')
+
+    def _start_forked(self):
+        """
+        Evaluate cases in a pool of processes forked from the current model.
+        Only case inputs and outputs are exchanged with the workers.
+        """
+        global _FORKED_DRIVER
+        _FORKED_DRIVER = self
+        if self.local_copy_root:
+            basedir = os.path.realpath(tempfile.mkdtemp(prefix='forked_'))
+        else:
+            basedir = None
+        pool = multiprocessing.Pool(self.local_processes, _forked_init,
+                                    (basedir,), self.local_max_cases or None)
+        timeout = self.local_timeout or None
+        timed_out = False
+
+        # Keep a few cases queued per worker, results are processed in order.
+        pending = deque()
+        max_pending = 2 * self.local_processes
+        try:
+            while True:
+                while len(pending) < max_pending and self._more_to_go():
+                    next_case = self._get_next_case()
+                    if next_case is None:
+                        break
+                    case, seqno, rerun = next_case
+                    self._prepare_case(case, rerun)
+                    args = (case.items(iotype='in'), case.keys(iotype='out'),
+                            self.get_events(), case.uuid)
+                    pending.append((case, seqno,
+                                    pool.apply_async(_forked_run_case,
+                                                     (args,))))
+                if not pending:
+                    break
+
+                case, seqno, result = pending.popleft()
+                try:
+                    outputs, msg, tback = result.get(timeout)
+                except multiprocessing.TimeoutError:
+                    # The case may never complete, so the pool can't be
+                    # closed normally.
+                    timed_out = True
+                    msg = '%s: Timed out after %s seconds waiting for case' \
+                          ' evaluated by forked worker' \
+                          % (self.get_pathname(), self.local_timeout)
+                    tback = msg
+                if msg is None:
+                    for name, value in outputs:
+                        case[name] = value
+                else:
+                    self._logger.debug('    exception from forked case: %s',
+                                       msg)
+                    case.msg = msg
+                    if self.error_policy == 'ABORT':
+                        if self._abort_exc is None:
+                            self._abort_exc = TracedError(RuntimeError(msg),
+                                                          tback)
+                        self._stop = True
+                self._record_case(case, seqno)
+        finally:
+            if self._stop or timed_out:
+                pool.terminate()
+            else:
+                pool.close()
+            pool.join()
+            _FORKED_DRIVER = None
+            if basedir is not None:
+                shutil.rmtree(basedir, ignore_errors=True)
+
     def _start(self):
         """ Start evaluating cases concurrently. """
         # Need credentials in case we're using a PublicKey server.
@@ -380,6 +566,7 @@ class CaseIterDriverBase(Driver):
         self._server_cases = {}
         self._exceptions = {}
         self._load_failures = {}
+        self._in_flight = {}
 
         self._todo = []
         self._rerun = []
@@ -434,10 +621,16 @@ class CaseIterDriverBase(Driver):
                         in_use = False
 
         elif state == _EXECUTING:
-            case, seqno = self._server_cases[server]
-            self._server_cases[server] = None
-            exc = self._model_status(server)
-            if exc is None:
+            if server is not None and self.batch_remote:
+                # Replies arrive in the order the cases were queued.
+                case, seqno, args, exc = self._in_flight[server].popleft()
+            else:
+                case, seqno = self._server_cases[server]
+                self._server_cases[server] = None
+                exc = self._model_status(server)
+            if exc is None and server is not None and self.batch_remote:
+                pass  # Outputs were returned by the server.
+            elif exc is None:
                 # Grab the data from the model.
                 scope = self.parent if server is None else self._top_levels[server]
                 try:
@@ -459,7 +652,12 @@ class CaseIterDriverBase(Driver):
             self._record_case(case, seqno)
 
             # Set up for next case.
-            in_use = self._start_processing(server, stepping, reload=True)
+            if server is not None and self._in_flight.get(server):
+                # Already have queued case(s), keep the pipeline full.
+                self._fill_pipeline(server)
+                in_use = True
+            else:
+                in_use = self._start_processing(server, stepping, reload=True)
 
         # Just being defensive, should never happen.
         else:  #pragma no cover
@@ -510,36 +708,42 @@ class CaseIterDriverBase(Driver):
 
     def _start_next_case(self, server, stepping=False):
         """ Look for the next case and start it. """
+        next_case = self._get_next_case(stepping)
+        if next_case is None:
+            return False
+        case, seqno, rerun = next_case
+        return self._run_case(case, seqno, server, rerun=rerun)
+
+    def _get_next_case(self, stepping=False):
+        """
+        Return ``(case, seqno, rerun)`` for the next case to be run,
+        or None if there isn't one.
+        """
         if self._todo:
             self._logger.debug('    run startup case')
             case, seqno = self._todo.pop(0)
-            in_use = self._run_case(case, seqno, server)
+            return (case, seqno, False)
         elif self._rerun:
             self._logger.debug('    rerun case')
             case, seqno = self._rerun.pop(0)
-            in_use = self._run_case(case, seqno, server, rerun=True)
+            return (case, seqno, True)
         elif self._iter is None:
             self._logger.debug('    no more cases')
-            in_use = False
-        elif stepping:
-            in_use = False
-        else:
+        elif not stepping:
             try:
                 case = self._iter.next()
             except StopIteration:
                 self._logger.debug('    no more cases')
                 self._iter = None
                 self._seqno = 0
-                in_use = False
             else:
                 self._logger.debug('    run next case')
                 self._seqno += 1
-                in_use = self._run_case(case, self._seqno, server)
-                
-        return in_use
+                return (case, self._seqno, False)
+        return None
 
-    def _run_case(self, case, seqno, server, rerun=False):
-        """ Setup and start a case. Returns True if started. """
+    def _prepare_case(self, case, rerun=False):
+        """ Reset case status and add requested printvars to its outputs. """
         if not rerun:
             if not case.max_retries:
                 case.max_retries = self.max_retries
@@ -561,6 +765,17 @@ class CaseIterDriverBase(Driver):
                 val = ExprEvaluator(var, scope=self.parent).evaluate()
                 case.add_output(var, val)
 
+    def _run_case(self, case, seqno, server, rerun=False):
+        """ Setup and start a case. Returns True if started. """
+        self._prepare_case(case, rerun)
+
+        if server is not None and self.batch_remote:
+            # Events and inputs are sent along with the execute request.
+            self._queue_case(server, case, seqno)
+            self._server_states[server] = _EXECUTING
+            self._fill_pipeline(server)
+            return True
+
         try:
             for event in self.get_events(): 
                 try: 
@@ -586,6 +801,38 @@ class CaseIterDriverBase(Driver):
         else:
             return True
 
+    def _queue_case(self, server, case, seqno):
+        """
+        Queue a batched case on a remote server. The arguments for the
+        server's `run_case` are prepared here so the worker thread only has
+        to send them.
+        """
+        args = (case.items(iotype='in'), case.keys(iotype='out'),
+                self.get_events(), self.get_itername(), seqno, case.uuid)
+        # [case, seqno, args, exception], exception is set by the worker.
+        entry = [case, seqno, args, None]
+        if server not in self._in_flight:
+            self._in_flight[server] = deque()
+        self._in_flight[server].append(entry)
+        self._queues[server].put((self._remote_run_case, (server, entry)))
+
+    def _fill_pipeline(self, server):
+        """
+        Queue up to `prefetch` additional cases on `server` so that the next
+        case is already waiting when the current one completes.
+        """
+        if self.reload_model:
+            return  # Model must be reloaded between cases.
+        while len(self._in_flight[server]) <= self.prefetch:
+            if not self._more_to_go():
+                break
+            next_case = self._get_next_case()
+            if next_case is None:
+                break
+            case, seqno, rerun = next_case
+            self._prepare_case(case, rerun)
+            self._queue_case(server, case, seqno)
+
     def _record_case(self, case, seqno):
         """ If successful, record the case. Otherwise possibly retry. """
         if case.msg and case.retries < case.max_retries:
@@ -716,6 +963,23 @@ class CaseIterDriverBase(Driver):
                                self._server_info[server]['pid'],
                                self._server_info[server]['host'], exc)
 
+    def _remote_run_case(self, request):
+        """ Set inputs, execute, and get outputs of a queued case in a remote
+        server with a single call. """
+        server, entry = request
+        case, seqno, args, exc = entry
+        try:
+            outputs = self._top_levels[server].run_case(*args)
+        except Exception as exc:
+            entry[3] = TracedError(exc, traceback.format_exc())
+            self._logger.error('Caught exception from server %r, PID %d on %s: %r',
+                               self._server_info[server]['name'],
+                               self._server_info[server]['pid'],
+                               self._server_info[server]['host'], exc)
+        else:
+            for name, value in outputs:
+                case[name] = value
+
     def _model_status(self, server):
         """ Return execute status from model. """
         return self._exceptions[server]
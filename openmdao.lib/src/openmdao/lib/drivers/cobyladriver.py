@@ -147,8 +147,7 @@ class COBYLAdriver(Driver):
             
         # Constraints (COBYLA defines positive as satisfied)
         con_list = []
-        for v in self.get_ineq_constraints().values():
-            val = v.evaluate(self.parent)
+        for val in self.eval_ineq_constraints():
             if '>' in val[2]:
                 con_list.append(val[0]-val[1])
             else:
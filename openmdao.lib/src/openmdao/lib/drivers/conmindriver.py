@@ -392,8 +392,7 @@ class CONMINdriver(DriverUsesDerivatives):
             self.cnmn1.obj = self.eval_objective()
 
             # update constraint value array
-            for i, v in enumerate(self.get_ineq_constraints().values()):
-                val = v.evaluate(self.parent)
+            for i, val in enumerate(self.eval_ineq_constraints()):
                 if '>' in val[2]:
                     self.constraint_vals[i] = val[1]-val[0]
                 else:
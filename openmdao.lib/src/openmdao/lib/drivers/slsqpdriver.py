@@ -185,9 +185,13 @@ class SLSQPdriver(DriverUsesDerivatives):
             
         # Constraints
         if self.ncon > 0 :
+            values = dict(zip(self.get_eq_constraints().keys(),
+                              self.eval_eq_constraints()))
+            values.update(zip(self.get_ineq_constraints().keys(),
+                              self.eval_ineq_constraints()))
             con_list = []
-            for v in self.get_constraints().values():
-                val = v.evaluate(self.parent)
+            for name in self.get_constraints().keys():
+                val = values[name]
                 if '>' in val[2]:
                     con_list.append(val[0]-val[1])
                 else:
@@ -10,6 +10,7 @@ import sys
 import time
 import unittest
 import nose
+from nose import SkipTest
 
 import random
 import numpy.random as numpy_random
@@ -137,6 +138,22 @@ class TracedComponent(Component):
         self.itername = self.get_itername()
 
 
+class StatefulComponent(Component):
+    """ Used to check forked workers don't share state or directories. """
+
+    inp = Int(iotype='in')
+    die = Bool(False, iotype='in')
+    count = Int(iotype='out')
+    cwd = Str(iotype='out')
+
+    def execute(self):
+        """ Count executions and record working directory. """
+        if self.die:
+            os._exit(1)
+        self.count += 1
+        self.cwd = os.getcwd()
+
+
 class TestCase(unittest.TestCase):
     """ Test CaseIteratorDriver. """
 
@@ -254,6 +271,101 @@ class TestCase(unittest.TestCase):
         self.run_cases(sequential=False, forced_errors=True, retry=False)
         self.run_cases(sequential=False, forced_errors=True, retry=True)
 
+    def test_concurrent_batched(self):
+        logging.debug('')
+        logging.debug('test_concurrent_batched')
+        init_cluster(encrypted=True, allow_shell=True)
+        self.model.driver.batch_remote = True
+        self.run_cases(sequential=False)
+        self.generate_cases(force_errors=True)
+        self.run_cases(sequential=False, forced_errors=True, retry=True)
+
+    def test_concurrent_pipelined(self):
+        logging.debug('')
+        logging.debug('test_concurrent_pipelined')
+        init_cluster(encrypted=True, allow_shell=True)
+        self.model.driver.batch_remote = True
+        self.model.driver.reload_model = False
+        self.model.driver.prefetch = 2
+        self.run_cases(sequential=False)
+        self.generate_cases(force_errors=True)
+        self.run_cases(sequential=False, forced_errors=True, retry=True)
+
+    def test_forked(self):
+        logging.debug('')
+        logging.debug('test_forked')
+        if not hasattr(os, 'fork'):
+            raise SkipTest('os.fork() not available')
+        self.model.driver.local_processes = 2
+        self.run_cases(sequential=False)
+        self.generate_cases(force_errors=True)
+        self.run_cases(sequential=False, forced_errors=True, retry=True)
+        self.run_cases(sequential=False, forced_errors=True, retry=False)
+
+    def run_forked(self, cases, **traits):
+        """ Evaluate `cases` with forked workers, return recorded cases. """
+        top = set_as_top(Assembly())
+        top.add('driver', CaseIteratorDriver())
+        top.add('comp', StatefulComponent())
+        top.driver.workflow.add('comp')
+        top.driver.sequential = False
+        top.driver.local_processes = 2
+        for name, value in traits.items():
+            setattr(top.driver, name, value)
+        top.driver.iterator = ListCaseIterator(cases)
+        results = ListCaseRecorder()
+        top.driver.recorders = [results]
+        top.run()
+        return sorted(results.cases, key=lambda case: int(case.label))
+
+    def test_forked_isolation(self):
+        logging.debug('')
+        logging.debug('test_forked_isolation')
+        if not hasattr(os, 'fork'):
+            raise SkipTest('os.fork() not available')
+
+        cases = [Case([('comp.inp', i)], ['comp.count', 'comp.cwd'],
+                      label=str(i)) for i in range(6)]
+        results = self.run_forked(cases, local_max_cases=1,
+                                  local_copy_root=True)
+        # Each case is evaluated by a new copy of the model, in its own
+        # directory.
+        self.assertEqual([case['comp.count'] for case in results], [1]*6)
+        cwds = set([case['comp.cwd'] for case in results])
+        self.assertEqual(len(cwds), 6)
+        self.assertFalse(os.getcwd() in cwds)
+
+        # By default, workers evaluate several cases in the root directory.
+        results = self.run_forked(cases)
+        self.assertTrue(max([case['comp.count'] for case in results]) > 1)
+        self.assertEqual(set([case['comp.cwd'] for case in results]),
+                         set([os.getcwd()]))
+
+        # Copies of the root directory are reused by their worker.
+        results = self.run_forked(cases, local_copy_root=True)
+        cwds = set([case['comp.cwd'] for case in results])
+        self.assertTrue(len(cwds) <= 2)
+        self.assertFalse(os.getcwd() in cwds)
+
+    def test_forked_timeout(self):
+        logging.debug('')
+        logging.debug('test_forked_timeout')
+        if not hasattr(os, 'fork'):
+            raise SkipTest('os.fork() not available')
+
+        # A worker which dies is detected by the timeout.
+        cases = [Case([('comp.die', i == 1)], ['comp.count'], label=str(i))
+                 for i in range(4)]
+        results = self.run_forked(cases, local_timeout=2., local_max_cases=1,
+                                  error_policy='RETRY')
+        self.assertEqual(len(results), 4)
+        for i, case in enumerate(results):
+            if i == 1:
+                self.assertTrue('Timed out after 2.0 seconds' in case.msg)
+            else:
+                self.assertEqual(case.msg, None)
+                self.assertEqual(case['comp.count'], 1)
+
     def test_unencrypted(self):
         logging.debug('')
         logging.debug('test_unencrypted')
@@ -8,6 +8,7 @@ import numpy
 # pylint: disable-msg=F0401,E0611
 from openmdao.main.api import Assembly, Component, VariableTree, set_as_top
 from openmdao.main.datatypes.api import Float, Array, Str, Slot
+from openmdao.main.evalcache import EvaluationCache
 from openmdao.lib.casehandlers.api import ListCaseRecorder
 from openmdao.lib.drivers.cobyladriver import COBYLAdriver
 from openmdao.util.testutil import assert_rel_error
@@ -108,6 +109,34 @@ class COBYLAdriverTestCase(unittest.TestCase):
         self.assertEqual(self.top.comp.opt_objective,
                          end_case.get_output('comp.opt_objective'))
         
+    def test_eval_cache(self):
+        self.top.driver.add_objective('comp.result')
+        map(self.top.driver.add_parameter, 
+            ['comp.x[0]', 'comp.x[1]','comp.x[2]', 'comp.x[3]'])
+        self.top.driver.add_constraint(
+            'comp.x[0]**2+comp.x[0]+comp.x[1]**2-comp.x[1]+comp.x[2]**2+comp.x[2]+comp.x[3]**2-comp.x[3] < 8')
+        self.top.driver.eval_cache = EvaluationCache()
+        self.top.driver.recorders = [ListCaseRecorder()]
+        self.top.driver.printvars = ['comp.result']
+        self.top.run()
+        expected = self.top.comp.x.copy()
+        nruns = self.top.comp.exec_count
+        
+        # Repeat from the same start: every point is a cache hit, and the
+        # model is run once at the end to leave it at the final point.
+        self.top.comp.x = numpy.array([1., 1., 1., 1.])
+        self.top.driver.recorders = [ListCaseRecorder()]
+        self.top.run()
+        self.assertEqual(self.top.comp.exec_count, nruns+1)
+        self.assertEqual(list(self.top.comp.x), list(expected))
+        self.assertEqual(self.top.comp.result, 
+                         self.top.driver.eval_objective())
+        
+        # Recorded cases don't mix cached and current model values.
+        for case in self.top.driver.recorders[0].get_iterator():
+            self.assertEqual(case.get_output('Objective'),
+                             case.get_output('comp.result'))
+        
     def test_max_iter(self):
         self.top.driver.add_objective('comp.result')
         map(self.top.driver.add_parameter, 
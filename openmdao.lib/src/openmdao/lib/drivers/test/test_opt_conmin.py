@@ -6,8 +6,10 @@ import unittest
 import numpy
 
 # pylint: disable-msg=F0401,E0611
-from openmdao.main.api import Assembly, Component, VariableTree, set_as_top
+from openmdao.main.api import Assembly, Component, VariableTree, set_as_top, \
+                             ComponentWithDerivatives
 from openmdao.main.datatypes.api import Float, Array, Str, Slot
+from openmdao.main.evalcache import EvaluationCache
 from openmdao.lib.casehandlers.api import ListCaseRecorder
 from openmdao.lib.differentiators.finite_difference import FiniteDifference
 from openmdao.lib.drivers.conmindriver import CONMINdriver
@@ -63,6 +65,30 @@ class OptRosenSuzukiComponent(Component):
         self.obj_string = "Bad"
 
 
+class ParaboloidDerivative(ComponentWithDerivatives):
+    """ f(x,y) = (x-3)^2 + xy + (y+4)^2 - 3, with analytic derivatives. """
+    
+    x = Float(0., iotype='in')
+    y = Float(0., iotype='in')
+    f_xy = Float(iotype='out')
+    
+    def __init__(self):
+        super(ParaboloidDerivative, self).__init__()
+        self.derivatives.declare_first_derivative('f_xy', 'x')
+        self.derivatives.declare_first_derivative('f_xy', 'y')
+        
+    def execute(self):
+        """calculate the new objective value"""
+        self.f_xy = (self.x-3.)**2 + self.x*self.y + (self.y+4.)**2 - 3.
+        
+    def calculate_first_derivatives(self):
+        """Analytical first derivatives"""
+        self.derivatives.set_first_derivative('f_xy', 'x',
+                                              2.*self.x - 6. + self.y)
+        self.derivatives.set_first_derivative('f_xy', 'y',
+                                              2.*self.y + 8. + self.x)
+
+
 class CONMINdriverTestCase(unittest.TestCase):
     """test CONMIN optimizer component"""
 
@@ -352,6 +378,44 @@ class CONMINdriverTestCase(unittest.TestCase):
         self.assertEqual(self.top.driver.get_objectives(), {})
 
 
+class CONMINdriverCacheTestCase(unittest.TestCase):
+    """test CONMIN with an evaluation cache"""
+    
+    def test_eval_cache(self):
+        top = set_as_top(Assembly())
+        top.add('driver', CONMINdriver())
+        top.add('comp', ParaboloidDerivative())
+        top.driver.workflow.add('comp')
+        top.driver.iprint = 0
+        top.driver.add_objective('comp.f_xy')
+        top.driver.add_parameter('comp.x', low=-50., high=50.)
+        top.driver.add_parameter('comp.y', low=-50., high=50.)
+        top.driver.add_constraint('comp.x-comp.y >= 15.')
+        top.driver.differentiator = FiniteDifference()
+        top.driver.eval_cache = EvaluationCache()
+        
+        def run():
+            top.comp.x = 0.
+            top.comp.y = 0.
+            top.driver.recorders = [ListCaseRecorder()]
+            top.run()
+            return [(case.get_input('comp.x'), case.get_input('comp.y'),
+                     case.get_output('Objective'))
+                    for case in top.driver.recorders[0].get_iterator()]
+            
+        first = run()
+        hits = top.driver.eval_cache.hits
+        second = run()
+        self.assertTrue(top.driver.eval_cache.hits > hits)
+        
+        # Derivatives are taken at the cached points rather than the last
+        # point actually run, so the second run follows the same path.
+        self.assertEqual(second, first)
+        assert_rel_error(self, top.comp.x, 7.16667, 0.001)
+        assert_rel_error(self, top.comp.y, -7.83333, 0.001)
+        assert_rel_error(self, top.comp.f_xy, -27.08333, 0.001)
+
+
 class TestContainer(VariableTree):
     dummy1 = Float(desc='default value of 0.0') #this value is being grabbed by the optimizer
     dummy2 = Float(11.0) 
@@ -1,14 +1,18 @@
 """ Surrogate model based on Kriging. """
 
-from math import log, e, sqrt
+from math import log, e
 import logging
 
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import array, zeros, dot, ones, arange, eye, abs, vstack, exp, diag
-    from numpy.linalg import det, linalg, lstsq
-    from scipy.linalg import cho_factor, cho_solve
-    from scipy.optimize import fmin
+    import numpy
+    from numpy import array, zeros, dot, ones, eye, abs, vstack, exp, \
+                      diag, log10, triu_indices, sqrt, hstack, triu, \
+                      diag_indices
+    from numpy.linalg import det, linalg, lstsq, pinv
+    from scipy.linalg import cho_factor, cho_solve, cholesky, \
+                             solve_triangular
+    from scipy.optimize import fmin, fmin_l_bfgs_b
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 
@@ -16,7 +20,7 @@ from openmdao.main.interfaces import implements, ISurrogate
 from openmdao.main.uncertain_distributions import NormalDistribution
 from openmdao.util.decorators import stub_if_missing_deps
 from openmdao.main.api import Container
-from openmdao.main.datatypes.api import Float
+from openmdao.main.datatypes.api import Float, Enum
 
 @stub_if_missing_deps('numpy', 'scipy')
 class KrigingSurrogate(Container): 
@@ -24,6 +28,20 @@ class KrigingSurrogate(Container):
     as a NormalDistribution instance."""
     
     implements(ISurrogate)
+
+    optimizer = Enum('fmin', ['fmin', 'fmin_l_bfgs_b'], iotype='in',
+                     desc="Optimizer used to fit the correlation parameters."
+                          " 'fmin_l_bfgs_b' uses the analytic gradient of the"
+                          " log likelihood, which is typically faster for"
+                          " many inputs.")
+
+    reoptimize_fraction = Float(0.25, low=0., iotype='in',
+                                desc="When adding training points, the"
+                                     " correlation parameters are"
+                                     " re-optimized once the number of"
+                                     " training points has grown by this"
+                                     " fraction since they were last"
+                                     " optimized.")
     
     def __init__(self):
         super(KrigingSurrogate, self).__init__()
@@ -38,6 +56,7 @@ class KrigingSurrogate(Container):
         self.mu = None
         self.sig2 = None
         self.log_likelihood = None
+        self._n_optimized = None #training points when thetas were optimized
                     
     def get_uncertain_value(self,value): 
         """Returns a NormalDistribution centered around the value, with a 
@@ -48,56 +67,68 @@ class KrigingSurrogate(Container):
         """Calculates a predicted value of the response based on the current
         trained model for the supplied list of inputs.
         """
+        f, RMSE = self._predict_many([new_x])
+        return NormalDistribution(f[0], RMSE[0])
+
+    def predict_many(self, new_x):
+        """Calculates predicted values of the response based on the current
+        trained model for each row of inputs in `new_x`. Returns a list of
+        NormalDistribution instances.
+        """
+        f, RMSE = self._predict_many(new_x)
+        return [NormalDistribution(mu, sigma) for mu, sigma in zip(f, RMSE)]
+
+    def _predict_many(self, new_x):
+        """Returns arrays of the predicted mean and root mean squared error
+        for each row of `new_x`. Points are processed in chunks so the
+        correlation matrix for a chunk stays a manageable size."""
         if self.m == None: #untrained surrogate
             raise RuntimeError("KrigingSurrogate has not been trained, so no "
                                "prediction can be made")
-        r = zeros(self.n)
-        X, Y = self.X, self.Y
-        thetas = 10.**self.thetas
-        XX = array(X)
-        new_x = array(new_x)
-        for i in range(self.n):
-            r[i] = sum(thetas*(XX[i]-new_x)**2.)
-        r = exp(-r)
-            
+        Y = self.Y
+        new_x = array(new_x, dtype=float).reshape(-1, self.m)
         one = ones(self.n)
-        if self.R_fact is not None: 
+
+        if self.R_fact is not None:
             #---CHOLESKY DECOMPOSTION ---
-            #f = self.mu+dot(r,cho_solve(self.R_fact,Y-dot(one,self.mu)))
-            #term1 = dot(r,cho_solve(self.R_fact,r))
-            #term2 = (1.0-dot(one,cho_solve(self.R_fact,r)))**2./dot(one,cho_solve(self.R_fact,one))
-            
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            R_fact = (self.R_fact[0].T,not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-            
-            f = self.mu + dot(r, cho[0])
-            term1 = dot(r, cho[1])
-            term2 = (1.0 - dot(one, cho[1]))**2./dot(one, cho[2])
-            
-        else: 
-            #-----LSTSQ-------
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            lsq = lstsq(self.R.T, rhs)[0].T
-            
-            f = self.mu + dot(r, lsq[0])
-            term1 = dot(r, lsq[1])
-            term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-            """
-      #-----LSTSQ-------
-      rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-      lsq = lstsq(self.R.T, rhs)[0].T
-      
-      f = self.mu + dot(r, lsq[0])
-      term1 = dot(r, lsq[1])
-      term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-      """
-        MSE = self.sig2*(1.0-term1+term2)
-        RMSE = sqrt(abs(MSE))
-        
-        dist = NormalDistribution(f, RMSE)
-        return dist
-        
+            # Solutions which don't depend on the new points.
+            rhs = vstack([(Y-dot(one, self.mu)), one]).T
+            cho = cho_solve(self.R_fact, rhs).T
+            factor, lower = self.R_fact
+            trans = 'N' if lower else 'T'
+            ones_term = dot(one, cho[1])
+
+        f = zeros(len(new_x))
+        MSE = zeros(len(new_x))
+        chunk = max(1, 2**20 // self.n)
+        for start in range(0, len(new_x), chunk):
+            r = self._correlation(new_x[start:start+chunk])
+
+            if self.R_fact is not None:
+                # r R^-1 r from a single triangular solve for all points.
+                half = solve_triangular(factor, r.T, trans=trans, lower=lower)
+                f[start:start+chunk] = self.mu + dot(r, cho[0])
+                term1 = (half**2.).sum(axis=0)
+                term2 = (1.0 - dot(r, cho[1]))**2./ones_term
+            else:
+                #-----LSTSQ-------
+                rhs = vstack([(Y-dot(one, self.mu)), one, r]).T
+                lsq = lstsq(self.R.T, rhs)[0].T
+                f[start:start+chunk] = self.mu + dot(r, lsq[0])
+                term1 = (r*lsq[2:]).sum(axis=1)
+                term2 = (1.0 - lsq[2:].sum(axis=1))**2./dot(one, lsq[1])
+            MSE[start:start+chunk] = self.sig2*(1.0-term1+term2)
+
+        return (f, sqrt(abs(MSE)))
+
+    def _correlation(self, new_x):
+        """Returns the correlation of each row of `new_x` with each training
+        point."""
+        thetas = 10.**self.thetas
+        dist = zeros((len(new_x), self.n))
+        for i in range(self.m):
+            dist += thetas[i]*(new_x[:, i:i+1]-self.X[:, i])**2.
+        return exp(-dist)
 
     def train(self,X,Y):
         """Train the surrogate model with the given set of inputs and outputs."""
@@ -109,52 +140,151 @@ class KrigingSurrogate(Container):
                 self.X.append(ins)
                 self.Y.append(out)
             else: "duplicate training point" """
-        self.X = X
-        self.Y = Y
+        self.X = array(X, dtype=float)
+        self.Y = array(Y, dtype=float)
         self.m = len(X[0])
         self.n = len(X)
-                
+
+        # Squared distances in each dimension between each pair of
+        # training points, which don't change during the fit.
+        pairs = triu_indices(self.n, 1)
+        distances = (self.X[pairs[0]]-self.X[pairs[1]])**2.
+
         thetas = zeros(self.m)
-        def _calcll(thetas):
-            self.thetas = thetas
-            self._calculate_log_likelihood()
-            return -self.log_likelihood
-        #if self.thetas == None:
-        self.thetas = fmin(_calcll, thetas, disp=False, ftol = 0.0001)
-        self._calculate_log_likelihood()
-        
-    def _calculate_log_likelihood(self):
-        #if self.m == None:
-        #    Give error message
+        if self.optimizer == 'fmin_l_bfgs_b':
+            # Start with correlation lengths comparable to the spacing of the
+            # training points, since the likelihood is flat far from there.
+            scale = distances.mean(axis=0)
+            scale[scale <= 0.] = 1.
+            thetas = -log10(scale) + 0.5*log(self.n, 10)/self.m
+            def _calcll_grad(thetas):
+                self.thetas = thetas
+                try:
+                    grad = self._calculate_log_likelihood(pairs, distances,
+                                                          True)
+                except ValueError: # No valid sig2.
+                    return (1.e300, zeros(self.m))
+                return (-self.log_likelihood, -grad)
+            bounds = [(theta-3., theta+3.) for theta in thetas]
+            self.thetas = fmin_l_bfgs_b(_calcll_grad, thetas,
+                                        bounds=bounds)[0]
+        else:
+            def _calcll(thetas):
+                self.thetas = thetas
+                self._calculate_log_likelihood(pairs, distances)
+                return -self.log_likelihood
+            self.thetas = fmin(_calcll, thetas, disp=False, ftol = 0.0001)
+        self._calculate_log_likelihood(pairs, distances)
+        self._n_optimized = self.n
+
+    def add_points(self, X, Y):
+        """Adds training points to the trained model. The current thetas are
+        kept and the Cholesky factor of the correlation matrix is extended
+        with the new rows, unless the number of training points has grown
+        by `reoptimize_fraction` since the thetas were last optimized, in
+        which case the model is retrained on all of the points."""
+        if self.m is None: #untrained surrogate
+            self.train(X, Y)
+            return
+
+        X = array(X, dtype=float).reshape(-1, self.m)
+        old_n = self.n
+        self.X = vstack([self.X, X])
+        self.Y = hstack([self.Y, array(Y, dtype=float).reshape(-1)])
+        self.n = len(self.X)
+        if self.n > (1.+self.reoptimize_fraction)*self._n_optimized:
+            self.train(self.X, self.Y)
+            return
+
+        # Border R with the correlations of the new points.
+        r = (1-self.nugget)*self._correlation(X)
+        r[:, old_n:][diag_indices(len(X))] = 1.
         R = zeros((self.n, self.n))
-        X,Y = array(self.X), array(self.Y)
+        R[:old_n, :old_n] = self.R
+        R[old_n:] = r
+        R[:old_n, old_n:] = r[:, :old_n].T
+        self.R = R
+
+        if self.R_fact is not None:
+            # R = U^T U, so the new columns of U are U^-T r and the
+            # factor of what remains of the new diagonal block.
+            factor, lower = self.R_fact
+            factor = triu(factor.T) if lower else triu(factor)
+            try:
+                U12 = solve_triangular(factor, r[:, :old_n].T, trans='T')
+                U22 = cholesky(r[:, old_n:]-dot(U12.T, U12))
+                U = zeros((self.n, self.n))
+                U[:old_n, :old_n] = factor
+                U[:old_n, old_n:] = U12
+                U[old_n:, old_n:] = U22
+                self.R_fact = (U, False)
+                self._cholesky_fit()
+                return
+            except (linalg.LinAlgError,ValueError):
+                pass
+        self._factor_correlation()
+        
+    def _calculate_log_likelihood(self, pairs, distances, gradient=False):
+        """Calculates the log likelihood for the current thetas, using
+        `distances` between the training points indexed by `pairs`.
+        If `gradient`, returns the gradient of the log likelihood with
+        respect to thetas."""
+        n = self.n
         thetas = 10.**self.thetas
-        for i in range(self.n):
-            for j in arange(i+1,self.n):
-                R[i,j] = (1-self.nugget)*e**(-sum(thetas*(X[i]-X[j])**2.)) #weighted distance formula
-        R = R + R.T + eye(self.n)
+        corr = (1-self.nugget)*exp(-dot(distances, thetas)) #weighted distance formula
+        R = eye(n)
+        R[pairs] = corr
+        R[pairs[1], pairs[0]] = corr
         self.R = R
-        one = ones(self.n)
+        resid = self._factor_correlation()
+
+        if gradient:
+            if self.R_fact is not None:
+                R_inv = cho_solve(self.R_fact, eye(n))
+            else:
+                R_inv = pinv(R)
+            # d(log_likelihood) = 1/2 sum((resid*resid.T/sig2 - R^-1) * dR),
+            # where dR is nonzero only for the pairs.
+            i, j = pairs
+            weights = (resid[i]*resid[j]/self.sig2 - R_inv[i, j])*corr
+            return -log(10.)*thetas*dot(weights, distances)
+
+    def _factor_correlation(self):
+        """Factors the correlation matrix R and calculates mu, sig2 and the
+        log likelihood, using least squares if R isn't positive definite.
+        Returns R^-1 (Y-mu)."""
         try:
-            self.R_fact = cho_factor(R)
-            rhs = vstack([Y, one]).T
-            R_fact = (self.R_fact[0].T,not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-            
-            self.mu = dot(one,cho[0])/dot(one,cho[1])
-            self.sig2 = dot(Y-dot(one,self.mu),cho_solve(self.R_fact,(Y-dot(one,self.mu))))/self.n
-            #self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))-sum(thetas)
-            self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))
+            self.R_fact = cho_factor(self.R)
+            return self._cholesky_fit()
         except (linalg.LinAlgError,ValueError):
             #------LSTSQ---------
             self.R_fact = None #reset this to none, so we know not to use cholesky
             #self.R = self.R+diag([10e-6]*self.n) #improve conditioning[Booker et al., 1999]
+            Y = self.Y
+            one = ones(self.n)
             rhs = vstack([Y, one]).T
             lsq = lstsq(self.R.T,rhs)[0].T
             self.mu = dot(one,lsq[0])/dot(one,lsq[1])
-            self.sig2 = dot(Y-dot(one,self.mu),lstsq(self.R,Y-dot(one,self.mu))[0])/self.n
+            resid = lstsq(self.R,Y-dot(one,self.mu))[0]
+            self.sig2 = dot(Y-dot(one,self.mu),resid)/self.n
             self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log(abs(det(self.R)+1.e-16))
-            #print self.log_likelihood
+            return resid
+
+    def _cholesky_fit(self):
+        """Calculates mu, sig2 and the log likelihood from the Cholesky
+        factor of R. Returns R^-1 (Y-mu)."""
+        Y = self.Y
+        one = ones(self.n)
+        rhs = vstack([Y, one]).T
+        cho = cho_solve(self.R_fact, rhs).T
+        
+        self.mu = dot(one,cho[0])/dot(one,cho[1])
+        resid = cho[0]-self.mu*cho[1] # R^-1 (Y-mu)
+        self.sig2 = dot(Y-dot(one,self.mu),resid)/self.n
+        # log(det(R)) from the factor, which doesn't underflow for large n.
+        log_det = 2.*numpy.log(diag(self.R_fact[0])).sum()
+        self.log_likelihood = -self.n/2.*log(self.sig2)-1./2.*log_det
+        return resid
 
 
 class FloatKrigingSurrogate(KrigingSurrogate):
@@ -165,6 +295,10 @@ class FloatKrigingSurrogate(KrigingSurrogate):
         dist = super(FloatKrigingSurrogate,self).predict(new_x)
         return dist.mu
 
+    def predict_many(self, new_x):
+        """Returns an array of the predicted mean for each row of `new_x`."""
+        return self._predict_many(new_x)[0]
+
     def get_uncertain_value(self,value): 
         """Returns a float"""
         return float(value)   
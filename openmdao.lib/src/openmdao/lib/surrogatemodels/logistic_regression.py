@@ -36,6 +36,7 @@ class LogisticRegression(Container):
         self.alpha = alpha
         
         self.degenerate = False
+        self.training_data = None #all of the X and Y training data
         
         if X is not None and Y is not None: 
             self.train(X,Y)
@@ -64,6 +65,8 @@ class LogisticRegression(Container):
         """ Define the gradient and hand it off to a scipy gradient-based
         optimizer. """
         
+        self.training_data = (list(X), list(Y))
+        
         #normalize all Y data to be between -1 and 1
         low = min(Y)
         high = max(Y)
@@ -102,6 +105,15 @@ class LogisticRegression(Container):
         self.betas = fmin_bfgs(self.lik, self.betas, fprime=dB, disp=False)
         
         
+    def add_points(self,X,Y):
+        """ Adds training points. The likelihood has no incremental form, so
+        the regression is retrained on all of the points. """
+        if self.training_data is None:
+            self.train(X,Y)
+        else:
+            self.train(self.training_data[0]+list(X),
+                       self.training_data[1]+list(Y))
+        
     def predict(self,new_x):
         """Calculates a predicted value of the response based on the current
         trained model for the supplied list of inputs.
@@ -110,6 +122,16 @@ class LogisticRegression(Container):
         
         return self.z*sigmoid(np.dot(self.betas,np.array(new_x)))+self.w
 
+    def predict_many(self,new_x):
+        """Calculates predicted values of the response based on the current
+        trained model for each row of inputs in `new_x`. Returns an array
+        with one value per row.
+        """
+        new_x = np.array(new_x, dtype=float)
+        if self.degenerate: return np.array([self.degenerate]*len(new_x))
+        
+        return self.z*sigmoid(np.dot(new_x,self.betas))+self.w
+
     
     
     
@@ -1,6 +1,6 @@
 """Surrogate Model based on second order response surface equations."""
 
-from numpy import matrix, linalg, power, multiply, concatenate, ones
+from numpy import array, linalg, dot, hstack, vstack, ones, triu_indices
 
 from openmdao.main.api import Container
 from openmdao.main.interfaces import implements,ISurrogate
@@ -16,6 +16,8 @@ class ResponseSurface(Container):
         self.m = None #number of training points 
         self.n = None #number of independents
         self.betas = None #vector of response surface equation coefficients
+        self.R = None #triangular factor of the terms, for adding points
+        self.QtY = None #Q^T Y, for adding points
         
         if X is not None and Y is not None: 
             self.train(X,Y)
@@ -27,39 +29,64 @@ class ResponseSurface(Container):
     def train(self,X,Y): 
         """ Calculate response surface equation coefficients using least squares regression. """ 
         
-        X = matrix(X)
-        Y = matrix(Y).T
+        X = array(X, dtype=float)
+        Y = array(Y, dtype=float).reshape(-1, 1)
         
         self.m = X.shape[0]
         self.n = X.shape[1]
         
         # Modify X to include constant, squared terms and cross terms
-        X = concatenate((matrix(ones((self.m,1))),X),1) 
-        for i in range(1,self.n+1):
-            X = concatenate((X,power(X[:,i],2)),1)
-        for i in range(1,self.n):
-            for j in range(i+1,self.n+1):
-                X = concatenate((X,multiply(X[:,i],X[:,j])),1)
+        X = self._features(X)
         
         # Determine response surface equation coefficients (betas) using least squares
         self.betas, rs, r, s = linalg.lstsq(X,Y)
+
+        # Keep X = QR and Q^T Y, which is all that's needed to update the
+        # least squares solution when points are added.
+        Q, self.R = linalg.qr(X)
+        self.QtY = dot(Q.T, Y)
+
+    def add_points(self, X, Y):
+        """Adds training points to the trained model, updating the
+        coefficients by recursive least squares. The triangular factor of
+        the response surface terms is updated with the new rows, so the
+        cost doesn't depend on the number of points already trained."""
+        if self.betas is None:
+            self.train(X, Y)
+            return
+
+        X = self._features(X)
+        Y = array(Y, dtype=float).reshape(-1, 1)
+        self.m += X.shape[0]
+
+        Q, self.R = linalg.qr(vstack([self.R, X]))
+        self.QtY = dot(Q.T, vstack([self.QtY, Y]))
+        self.betas, rs, r, s = linalg.lstsq(self.R, self.QtY)
         
     def predict(self,new_x): 
         """Calculates a predicted value of the response based on the current response surface model for the supplied list of inputs. """ 
         
-        new_x = matrix(new_x)
-        
+        return self.predict_many([new_x])[0]
+
+    def predict_many(self, new_x):
+        """Calculates predicted values of the response based on the current
+        response surface model for each row of inputs in `new_x`. Returns
+        an array with one value per row."""
+
         # Modify new_x to include constant, squared terms and cross terms
-        new_x = concatenate((matrix(ones((1,1))),new_x),1) 
-        for i in range(1,self.n+1):
-            new_x = concatenate((new_x,power(new_x[:,i],2)),1)
-        for i in range(1,self.n):
-            for j in range(i+1,self.n+1):
-                new_x = concatenate((new_x,multiply(new_x[:,i],new_x[:,j])),1)
-        
+        new_x = self._features(new_x)
+
         # Predict new_y using new_x and betas
-        new_y = new_x*self.betas
-        return new_y[0,0]
+        new_y = dot(new_x, self.betas)
+        return new_y[:, 0]
+
+    def _features(self, X):
+        """Returns the matrix of response surface terms for each row of
+        inputs in `X`: the constant, the inputs, their squares, and the
+        cross terms of each pair of inputs."""
+        X = array(X, dtype=float).reshape(-1, self.n)
+        i, j = triu_indices(self.n, 1)
+        return hstack((ones((X.shape[0], 1)), X, X**2, X[:, i]*X[:, j]))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+"""
+Measure time to add training points one at a time, as in adaptive sampling,
+retraining each surrogate from scratch and using `add_points`.
+"""
+
+import time
+
+from numpy import array, cos, pi
+from numpy.random import RandomState
+
+from openmdao.lib.surrogatemodels.kriging_surrogate import KrigingSurrogate
+from openmdao.lib.surrogatemodels.response_surface import ResponseSurface
+
+
+def branin(x):
+    """ Branin function, a common surrogate test case. """
+    return (x[1] - (5.1/(4.*pi**2.))*x[0]**2. + 5.*x[0]/pi - 6.)**2. \
+           + 10.*(1. - 1./(8.*pi))*cos(x[0]) + 10.
+
+
+def create_kriging():
+    """ Return Kriging surrogate, with a small nugget to keep the correlation
+    matrix positive definite. """
+    krig = KrigingSurrogate()
+    krig.nugget = 1.e-6
+    krig.optimizer = 'fmin_l_bfgs_b'
+    return krig
+
+
+def main():
+    """ Report times for a range of initial training set sizes. """
+    random = RandomState(10)
+    print '%16s %8s %6s %12s %14s %8s' % ('surrogate', 'initial', 'added',
+                                          'retrain (s)', 'add_points (s)',
+                                          'speedup')
+    for create in (create_kriging, ResponseSurface):
+        for initial in (100, 400):
+            nadd = initial // 4
+            X = random.uniform(0., 15., (initial+nadd, 2)) - (5., 0.)
+            Y = array([branin(x) for x in X])
+
+            surrogate = create()
+            start = time.time()
+            for i in range(initial, initial+nadd):
+                surrogate.train(X[:i+1], Y[:i+1])
+            retrain_time = time.time() - start
+
+            surrogate = create()
+            surrogate.train(X[:initial], Y[:initial])
+            start = time.time()
+            for i in range(initial, initial+nadd):
+                surrogate.add_points(X[i:i+1], Y[i:i+1])
+            add_time = time.time() - start
+
+            print '%16s %8d %6d %12.3f %14.3f %8.1f' \
+                  % (surrogate.__class__.__name__, initial, nadd, retrain_time,
+                     add_time, retrain_time / max(add_time, 1.e-6))
+
+
+if __name__ == '__main__':
+    main()
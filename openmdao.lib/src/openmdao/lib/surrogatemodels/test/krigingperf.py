@@ -0,0 +1,87 @@
+"""
+Measure KrigingSurrogate time to evaluate the log likelihood, as done
+originally with a loop over pairs of training points and determinant, and
+with the current vectorized correlation and Cholesky factor, and time to
+train with each optimizer. A small nugget keeps the correlation matrix
+positive definite for the larger training sets.
+"""
+
+import time
+from math import e, log
+
+from numpy import cos, eye, pi, triu_indices, zeros
+from numpy.linalg import det
+from numpy.random import RandomState
+
+from openmdao.lib.surrogatemodels.kriging_surrogate import KrigingSurrogate
+
+
+def branin(x):
+    """ Branin function, a common surrogate test case. """
+    return (x[1] - (5.1/(4.*pi**2.))*x[0]**2. + 5.*x[0]/pi - 6.)**2. \
+           + 10.*(1. - 1./(8.*pi))*cos(x[0]) + 10.
+
+
+def loop_log_det(X, thetas, nugget=0.):
+    """ Return log(det(R)) computed as `KrigingSurrogate` originally did. """
+    n = len(X)
+    R = zeros((n, n))
+    thetas = 10.**thetas
+    for i in range(n):
+        for j in range(i+1, n):
+            R[i, j] = (1-nugget)*e**(-sum(thetas*(X[i]-X[j])**2.))
+    R = R + R.T + eye(n)
+    return log(abs(det(R)+1.e-16))
+
+
+def timed(func, *args):
+    """ Return seconds to call `func` with `args`. """
+    start = time.time()
+    func(*args)
+    return time.time() - start
+
+
+NUGGET = 1.e-6
+
+
+def create(optimizer):
+    """ Return surrogate using `optimizer`. """
+    krig = KrigingSurrogate()
+    krig.nugget = NUGGET
+    krig.optimizer = optimizer
+    return krig
+
+
+def main():
+    """ Report times for a range of training set sizes. """
+    random = RandomState(10)
+    print '%6s %14s %14s %12s %12s' % ('points', 'loop ll (s)', 'vector ll (s)',
+                                       'fmin (s)', 'l_bfgs_b (s)')
+    for npoints in (100, 1000, 5000):
+        X = random.uniform(0., 15., (npoints, 2)) - (5., 0.)
+        Y = [branin(x) for x in X]
+
+        krig = create('fmin_l_bfgs_b')
+        lbfgs_time = timed(krig.train, X, Y)
+
+        pairs = triu_indices(npoints, 1)
+        distances = (krig.X[pairs[0]]-krig.X[pairs[1]])**2.
+        vector_time = timed(krig._calculate_log_likelihood, pairs, distances)
+        if npoints <= 1000:
+            loop_time = '%14.3f' % timed(loop_log_det, X, krig.thetas,
+                                         NUGGET)
+        else:
+            loop_time = '%14s' % 'skipped'
+        del pairs, distances
+
+        if npoints <= 1000:
+            fmin_time = '%12.3f' % timed(create('fmin').train, X, Y)
+        else:
+            fmin_time = '%12s' % 'skipped'
+
+        print '%6d %s %14.3f %s %12.3f' % (npoints, loop_time, vector_time,
+                                           fmin_time, lbfgs_time)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Measure time to predict many points with each surrogate, calling `predict`
+once per point and calling `predict_many` once for all points.
+"""
+
+import time
+
+from numpy import array, cos, pi
+from numpy.random import RandomState
+
+from openmdao.lib.surrogatemodels.kriging_surrogate import KrigingSurrogate
+from openmdao.lib.surrogatemodels.logistic_regression import LogisticRegression
+from openmdao.lib.surrogatemodels.response_surface import ResponseSurface
+
+
+def branin(x):
+    """ Branin function, a common surrogate test case. """
+    return (x[1] - (5.1/(4.*pi**2.))*x[0]**2. + 5.*x[0]/pi - 6.)**2. \
+           + 10.*(1. - 1./(8.*pi))*cos(x[0]) + 10.
+
+
+def create_kriging():
+    """ Return Kriging surrogate, with a small nugget to keep the correlation
+    matrix positive definite. """
+    krig = KrigingSurrogate()
+    krig.nugget = 1.e-6
+    krig.optimizer = 'fmin_l_bfgs_b'
+    return krig
+
+
+def main():
+    """ Report prediction times for each surrogate. """
+    random = RandomState(10)
+    X = random.uniform(0., 15., (200, 2)) - (5., 0.)
+    Y = array([branin(x) for x in X])
+
+    print '%18s %8s %12s %16s %8s' % ('surrogate', 'points', 'predict (s)',
+                                      'predict_many (s)', 'speedup')
+    for name, surrogate in (('KrigingSurrogate', create_kriging()),
+                            ('ResponseSurface', ResponseSurface()),
+                            ('LogisticRegression', LogisticRegression())):
+        surrogate.train(X, Y)
+        for npoints in (1000, 10000):
+            new_x = random.uniform(0., 15., (npoints, 2)) - (5., 0.)
+
+            start = time.time()
+            for x in new_x:
+                surrogate.predict(x)
+            loop_time = time.time() - start
+
+            start = time.time()
+            surrogate.predict_many(new_x)
+            many_time = time.time() - start
+
+            print '%18s %8d %12.3f %16.3f %8.1f' \
+                  % (name, npoints, loop_time, many_time,
+                     loop_time / max(many_time, 1.e-6))
+
+
+if __name__ == '__main__':
+    main()
@@ -3,10 +3,11 @@
 import unittest
 import random
 
-from numpy import array,round,linspace,sin,cos,pi
+from numpy import array,round,linspace,sin,cos,pi,triu_indices
 import numpy.random as numpy_random
 
-from openmdao.lib.surrogatemodels.kriging_surrogate import KrigingSurrogate
+from openmdao.lib.surrogatemodels.kriging_surrogate import KrigingSurrogate, \
+     FloatKrigingSurrogate
 from openmdao.lib.casehandlers.api import ListCaseIterator
 from openmdao.main.uncertain_distributions import NormalDistribution
 
@@ -76,6 +77,98 @@ class KrigingSurrogateTests(unittest.TestCase):
         self.assertAlmostEqual(14.513550,pred.sigma,places=2)
         self.assertAlmostEqual(18.759264,pred.mu,places=2)
         
+    def test_l_bfgs_b(self):
+        def bran(x):
+            y = (x[1]-(5.1/(4.*pi**2.))*x[0]**2.+5.*x[0]/pi-6.)**2.+10.*(1.-1./(8.*pi))*cos(x[0])+10.
+            return y
+
+        x = array([[-2.,0.],[-0.5,1.5],[1.,3.],[8.5,4.5],[-3.5,6.],[4.,7.5],[-5.,9.],[5.5,10.5],
+                   [10.,12.],[7.,13.5],[2.5,15.]])
+        y = array([bran(case) for case in x])
+
+        krig1 = KrigingSurrogate()
+        krig1.train(x,y)
+        krig2 = KrigingSurrogate()
+        krig2.optimizer = 'fmin_l_bfgs_b'
+        krig2.train(x,y)
+        self.assertAlmostEqual(krig1.log_likelihood,krig2.log_likelihood,places=4)
+
+        pred1 = krig1.predict([5.,5.])
+        pred2 = krig2.predict([5.,5.])
+        self.assertAlmostEqual(pred1.sigma,pred2.sigma,places=2)
+        self.assertAlmostEqual(pred1.mu,pred2.mu,places=2)
+
+    def test_predict_many(self):
+        def bran(x):
+            y = (x[1]-(5.1/(4.*pi**2.))*x[0]**2.+5.*x[0]/pi-6.)**2.+10.*(1.-1./(8.*pi))*cos(x[0])+10.
+            return y
+
+        x = array([[-2.,0.],[-0.5,1.5],[1.,3.],[8.5,4.5],[-3.5,6.],[4.,7.5],[-5.,9.],[5.5,10.5],
+                   [10.,12.],[7.,13.5],[2.5,15.]])
+        y = array([bran(case) for case in x])
+        new_x = numpy_random.RandomState(10).uniform(-5.,15.,(20,2))
+
+        krig1 = FloatKrigingSurrogate()
+        krig1.train(x,y)
+        preds = krig1.predict_many(new_x)
+        self.assertEqual(preds.shape,(20,))
+        for case,pred in zip(new_x,preds):
+            self.assertAlmostEqual(krig1.predict(case),pred,places=8)
+
+        # Least squares solver when ill-conditioned.
+        x = [[case] for case in linspace(0.,1.,40)]
+        y = sin(x).flatten()
+        krig2 = KrigingSurrogate()
+        krig2.train(x,y)
+        self.assertEqual(krig2.R_fact,None)
+        new_x = [[0.5],[0.123],[0.987]]
+        preds = krig2.predict_many(new_x)
+        self.assertEqual(len(preds),3)
+        for case,pred in zip(new_x,preds):
+            self.assertTrue(isinstance(pred,NormalDistribution))
+            self.assertAlmostEqual(krig2.predict(case).mu,pred.mu,places=7)
+            self.assertAlmostEqual(krig2.predict(case).sigma,pred.sigma,places=7)
+
+    def test_add_points(self):
+        def bran(x):
+            y = (x[1]-(5.1/(4.*pi**2.))*x[0]**2.+5.*x[0]/pi-6.)**2.+10.*(1.-1./(8.*pi))*cos(x[0])+10.
+            return y
+
+        x = array([[-2.,0.],[-0.5,1.5],[1.,3.],[8.5,4.5],[-3.5,6.],[4.,7.5],[-5.,9.],[5.5,10.5],
+                   [10.,12.],[7.,13.5],[2.5,15.]])
+        y = array([bran(case) for case in x])
+
+        krig1 = KrigingSurrogate()
+        krig1.reoptimize_fraction = 1.
+        krig1.train(x[:8],y[:8])
+        thetas = krig1.thetas
+        krig1.add_points(x[8:9],y[8:9])
+        krig1.add_points(x[9:],y[9:])
+        self.assertEqual(krig1.n,11)
+        self.assertTrue(all(krig1.thetas == thetas))
+        for case in x[8:]:
+            pred = krig1.predict(case)
+            self.assertAlmostEqual(bran(case),pred.mu,places=5)
+            self.assertAlmostEqual(0.,pred.sigma,places=3)
+
+        # Same likelihood as factoring R from scratch with these thetas.
+        krig2 = KrigingSurrogate()
+        krig2.train(x,y)
+        log_likelihood = krig1.log_likelihood
+        krig2.thetas = thetas
+        pairs = triu_indices(11,1)
+        krig2._calculate_log_likelihood(pairs,(x[pairs[0]]-x[pairs[1]])**2.)
+        self.assertAlmostEqual(krig2.log_likelihood,log_likelihood,places=6)
+
+        # Growing the training set by more than reoptimize_fraction
+        # re-optimizes the thetas.
+        krig1 = KrigingSurrogate()
+        krig1.train(x[:8],y[:8])
+        krig1.add_points(x[8:],y[8:])
+        krig2 = KrigingSurrogate()
+        krig2.train(x,y)
+        self.assertTrue(all(krig1.thetas == krig2.thetas))
+
     def test_get_uncertain_value(self): 
         x = array([[0.05], [.25], [0.61], [0.95]])
         y = array([0.738513784857542,-0.210367746201974,-0.489015457891476,12.3033138316612])
@@ -38,6 +38,24 @@ class LogisticRegressionTest(unittest.TestCase):
         residual = sum([ x-y for x,y in zip(training_reconstruction,self.Y_train)])
         
         self.assertTrue(residual<1e-5)
+
+    def test_add_points(self):
+        lr1 = LogisticRegression(self.X_train[:20], self.Y_train[:20], alpha=0)
+        lr1.add_points(self.X_train[20:], self.Y_train[20:])
+        lr2 = LogisticRegression(self.X_train, self.Y_train, alpha=0)
+        for x in self.X_train:
+            self.assertAlmostEqual(lr1.predict(x), lr2.predict(x), places=10)
+
+    def test_predict_many(self):
+        lr = LogisticRegression(self.X_train, self.Y_train, alpha=0)
+
+        preds = lr.predict_many(self.X_train)
+        self.assertEqual(preds.shape, (26,))
+        for x, pred in zip(self.X_train, preds):
+            self.assertAlmostEqual(lr.predict(x), pred, places=10)
+
+        lr = LogisticRegression(self.X_train, [3.]*26)
+        self.assertEqual(list(lr.predict_many(self.X_train[:2])), [3., 3.])
         
     def test_uncertain_value(self): 
         lr = LogisticRegression()
@@ -5,6 +5,7 @@ from numpy import array,round,linspace,sin,cos,pi
 import numpy as np
 
 from openmdao.lib.surrogatemodels.logistic_regression import LogisticRegression
+from openmdao.lib.surrogatemodels.response_surface import ResponseSurface
 
 
 class LogisticRegressionTest(unittest.TestCase):
@@ -42,4 +43,39 @@ class LogisticRegressionTest(unittest.TestCase):
     def test_uncertain_value(self): 
         lr = LogisticRegression()
         
-        self.assertEqual(lr.get_uncertain_value(1.0),1.0)
\ No newline at end of file
+        self.assertEqual(lr.get_uncertain_value(1.0),1.0)
+
+
+class ResponseSurfaceTest(unittest.TestCase):
+
+    def test_predict_many(self):
+        def quad(x):
+            return 1. + 2.*x[0] - x[1] + 3.*x[0]**2 + 0.5*x[0]*x[1] - x[2]**2
+
+        np.random.seed(10)
+        X = np.random.uniform(-1., 1., (30, 3))
+        rs = ResponseSurface(X, [quad(x) for x in X])
+
+        new_x = np.random.uniform(-1., 1., (10, 3))
+        preds = rs.predict_many(new_x)
+        self.assertEqual(preds.shape, (10,))
+        for x, pred in zip(new_x, preds):
+            self.assertAlmostEqual(quad(x), pred, places=8)
+            self.assertAlmostEqual(rs.predict(x), pred, places=10)
+
+    def test_add_points(self):
+        def quad(x):
+            return 1. + 2.*x[0] - x[1] + 3.*x[0]**2 + 0.5*x[0]*x[1] - x[2]**2
+
+        np.random.seed(10)
+        X = np.random.uniform(-1., 1., (30, 3))
+        Y = [quad(x) + 0.1*np.random.randn() for x in X]
+
+        rs1 = ResponseSurface(X[:6], Y[:6])
+        rs1.add_points(X[6:12], Y[6:12])
+        rs1.add_points(X[12:], Y[12:])
+        self.assertEqual(rs1.m, 30)
+
+        rs2 = ResponseSurface(X, Y)
+        for beta1, beta2 in zip(rs1.betas.flat, rs2.betas.flat):
+            self.assertAlmostEqual(beta1, beta2, places=10)
@@ -19,6 +19,7 @@ from openmdao.main.mp_support import has_interface
 from openmdao.main.container import _copydict
 from openmdao.main.component import Component, Container
 from openmdao.main.variable import Variable
+from openmdao.main.case import Case
 from openmdao.main.datatypes.api import Slot
 from openmdao.main.driver import Driver, Run_Once
 from openmdao.main.hasparameters import HasParameters, ParameterGroup
@@ -26,8 +27,9 @@ from openmdao.main.hasconstraints import HasConstraints, HasEqConstraints, HasIn
 from openmdao.main.hasobjective import HasObjective, HasObjectives
 from openmdao.main.rbac import rbac
 from openmdao.main.mp_support import is_instance
-from openmdao.main.expreval import ConnectedExprEvaluator
+from openmdao.main.expreval import ConnectedExprEvaluator, ExprEvaluator
 from openmdao.main.printexpr import eliminate_expr_ws
+from openmdao.units import get_conversion_tuple
 from openmdao.util.nameutil import partition_names_by_comp
 
 _iodict = {'out': 'output', 'in': 'input'}
@@ -151,6 +153,7 @@ class ExprMapper(object):
 
         destcompname, destcomp, destvarname = scope._split_varpath(destvar)
         desttrait = None
+        conversion = None
 
         if not destvar.startswith('parent.'):
             for srcvar in srcvars:
@@ -172,6 +175,8 @@ class ExprMapper(object):
                     srcval = srcexpr.evaluate()
                     if ttype.validate:
                         ttype.validate(destcomp, destvarname, srcval)
+                        conversion = _find_conversion(srcexpr, srcvar, srctrait,
+                                                      desttrait, scope)
                     else:
                         # no validate function on destination trait. Most likely
                         # it's a property trait.  No way to validate without
@@ -184,7 +189,23 @@ class ExprMapper(object):
         if dest not in self._exprgraph:
             self._exprgraph.add_node(dest, expr=destexpr)
 
-        self._exprgraph.add_edge(src, dest)
+        self._exprgraph.add_edge(src, dest, conversion=conversion)
+
+    def transfer(self, srcexpr, destexpr):
+        """Set the destination expression to the value of the source
+        expression it is connected to. If the connection converts units,
+        the conversion found in connect() is applied to the plain source
+        value, so no PhysicalQuantity is created during the transfer.
+        """
+        conversion = self._exprgraph[srcexpr.text][destexpr.text].get('conversion')
+        if conversion is None:
+            val = srcexpr.evaluate()
+        else:
+            getexpr, scale, offset = conversion
+            val = getexpr.evaluate()*scale
+            if offset:
+                val += offset
+        destexpr.set(val, src=srcexpr.text)
 
     def find_referring_exprs(self, name):
         """Returns a list of expression strings that reference the given name, which
@@ -242,6 +263,25 @@ class ExprMapper(object):
         return srcexpr, destexpr
 
 
+def _find_conversion(srcexpr, srcvar, srctrait, desttrait, scope):
+    """Returns a tuple (expr, scale, offset) for a connection between
+    variables with different units, where expr evaluates the source without
+    units, or None if no conversion is needed. Only sources that are a
+    variable or an indexed variable are converted this way.
+    """
+    src_units = getattr(srctrait, 'units', None)
+    dest_units = getattr(desttrait, 'units', None)
+    if not src_units or not dest_units or src_units == dest_units:
+        return None
+
+    if srcexpr.text != srcvar and \
+       not re.match(re.escape(srcvar) + r'(\[[^\[\]]*\])+$', srcexpr.text):
+        return None
+
+    scale, offset = get_conversion_tuple(src_units, dest_units)
+    return (ExprEvaluator(srcexpr.text, scope), scale, offset)
+
+
 def _find_common_interface(obj1, obj2):
     for iface in (IAssembly, IComponent, IDriver, IArchitecture, IContainer,
                   ICaseIterator, ICaseRecorder, IDOEgenerator):
@@ -292,6 +332,47 @@ class Assembly(Component):
         if seqno:
             self.driver.workflow.set_initial_count(seqno)
 
+    @rbac(('owner', 'user'))
+    def run_case(self, inputs, outputs=None, events=None, itername='',
+                 seqno=0, case_id=''):
+        """
+        Set `events` and `inputs`, run, and return the values of `outputs`,
+        all in a single call. This is typically done by
+        :class:`CaseIterDriverBase` on a remote top level assembly so that
+        evaluating a case takes only one round trip to the server.
+
+        inputs: list
+            (name, value) tuples of case inputs. Names may contain array
+            notation, as for :class:`Case`.
+
+        outputs: list
+            Names or expressions of case outputs to return.
+
+        events: list
+            Names of events to set before applying `inputs`.
+
+        itername: string
+            Iteration coordinates.
+
+        seqno: int
+            Initial execution count for driver's workflow.
+
+        case_id: string
+            Identifier for the Case that is associated with this run.
+
+        Returns a list of (name, value) tuples, one for each of `outputs`.
+        """
+        for event in events or []:
+            self.set(event, True)
+        case = Case(inputs=inputs, outputs=outputs, case_uuid=case_id)
+        case.apply_inputs(self)
+        self.set_itername(itername, seqno)
+        self.run(case_id=case_id)
+        if not outputs:
+            return []
+        case.update_outputs(self)
+        return case.get_outputs()
+
     def add(self, name, obj):
         """Call the base class *add*.  Then,
         if obj is a Component, add it to the component graph.
@@ -654,7 +735,7 @@ class Assembly(Component):
             if valids[expr.text] is False:
                 srctxt = self._exprmapper.get_source(expr.text)
                 srcexpr = self._exprmapper.get_expr(srctxt)
-                expr.set(srcexpr.evaluate(), src=srctxt)
+                self._exprmapper.transfer(srcexpr, expr)
                 # setattr(self, dest, srccomp.get_wrapped_attr(src))
             else:
                 # PassthroughProperty always valid for some reason.
@@ -666,7 +747,7 @@ class Assembly(Component):
                     if isinstance(dst_type, PassthroughProperty):
                         srctxt = self._exprmapper.get_source(expr.text)
                         srcexpr = self._exprmapper.get_expr(srctxt)
-                        expr.set(srcexpr.evaluate(), src=srctxt)
+                        self._exprmapper.transfer(srcexpr, expr)
 
     def step(self):
         """Execute a single child component and return."""
@@ -722,7 +803,7 @@ class Assembly(Component):
 
         for srcexpr, destexpr in expr_info:
             try:
-                destexpr.set(srcexpr.evaluate(), src=srcexpr.text)
+                self._exprmapper.transfer(srcexpr, destexpr)
             except Exception as err:
                 self.raise_exception("cannot set '%s' from '%s': %s" %
                                      (destexpr.text, srcexpr.text, str(err)), type(err))
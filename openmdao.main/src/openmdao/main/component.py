@@ -178,6 +178,9 @@ class Component(Container):
         self._expr_sources = None
         self._connected_inputs = None
         self._connected_outputs = None
+        # Replaced whenever the configuration changes, used by ExprEvaluator
+        # to detect that compiled variable references must be re-resolved.
+        self._config_token = object()
 
         self.exec_count = 0
         self.derivative_exec_count = 0
@@ -664,6 +667,7 @@ class Component(Container):
         self._connected_outputs = None
         self._container_names = None
         self._expr_sources = None
+        self._config_token = object()
         self._call_check_config = True
         self._call_execute = True
 
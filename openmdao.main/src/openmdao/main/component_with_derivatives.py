@@ -28,9 +28,14 @@ class ComponentWithDerivatives (Component):
             Order of the derivatives to be used (typically 1 or 2).
         """
         
+        # Each input is retrieved once and shared by all outputs.
+        inputs = dict([(name, self.get(name))
+                       for name in self.derivatives.in_names])
+        
         for name in self.derivatives.out_names:
             setattr(self, name,
-                     self.derivatives.calculate_output(name, ffd_order))
+                     self.derivatives.calculate_output(name, ffd_order,
+                                                       inputs))
 
             
     def calc_derivatives(self, first=False, second=False):
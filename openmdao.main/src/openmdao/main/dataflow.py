@@ -1,3 +1,4 @@
+import heapq
 
 import networkx as nx
 from networkx.algorithms.components import strongly_connected_components
@@ -10,13 +11,14 @@ __all__ = ['Dataflow']
 
 class Dataflow(SequentialWorkflow):
     """
-    A Dataflow consists of a collection of Components which are executed in 
+    A Dataflow consists of a collection of Components which are executed in
     data flow order.
     """
     def __init__(self, parent=None, scope=None, members=None):
         """ Create an empty flow. """
+        self._incremental = False
+        self._reset()
         super(Dataflow, self).__init__(parent, scope, members)
-        self.config_changed()
 
     def __iter__(self):
         """Iterate through the nodes in dataflow order."""
@@ -27,27 +29,53 @@ class Dataflow(SequentialWorkflow):
 
     def add(self, compnames, index=None, check=False):
         """ Add new component(s) to the workflow by name. """
+        start = len(self._names)
         super(Dataflow, self).add(compnames, index, check)
-        self.config_changed()
+        if self._incremental and index is None:
+            added = self._names[start:]
+            if len(set(added)) == len(added) and \
+               not set(added).intersection(self._names[:start]):
+                # Appended to the cached order in _update_topsort().
+                self._appended.extend(added)
+                return
+        self._reset()
 
     def remove(self, compname):
         """Remove a component from this Workflow by name."""
         super(Dataflow, self).remove(compname)
-        self.config_changed()
+        self._reset()
+
+    def clear(self):
+        """Remove all components from this workflow."""
+        super(Dataflow, self).clear()
+        self._reset()
 
     def config_changed(self):
         """Notifies the Workflow that its configuration (dependencies, etc.)
-        has changed.
+        has changed. If the execution order only depends on connections
+        between the components in this workflow, it is updated incrementally
+        the next time it is needed rather than being recomputed.
         """
+        if not self._incremental:
+            self._reset()
+
+    def _reset(self):
+        """Discard the cached execution order."""
         self._collapsed_graph = None
         self._topsort = None
         self._duplicates = None
+        self._incremental = False
+        self._order = None      # Component name -> index in _topsort.
+        self._appended = []     # Names added since _topsort was computed.
+        self._graph_log = None  # Dependency graph state for _topsort.
 
     def _get_topsort(self):
+        if self._incremental:
+            self._update_topsort()
         if self._topsort is None:
             graph = self._get_collapsed_graph()
             try:
-                self._topsort = nx.topological_sort(graph)
+                self._topsort = self._sequence_sort(graph)
             except nx.NetworkXUnfeasible:
                 # do a little extra work here to give more info to the user
                 # in the error message
@@ -57,8 +85,83 @@ class Dataflow(SequentialWorkflow):
                                            % str(strcon[0]), RuntimeError)
             if self._duplicates:
                 self._insert_duplicates()
+            elif self._incremental:
+                self._order = dict([(name, i) for i, name
+                                              in enumerate(self._topsort)])
         return self._topsort
 
+    def _sequence_sort(self, graph):
+        """Return the nodes of `graph` in dependency order. Where the order
+        is not determined by dependencies, nodes are kept in sequence order,
+        mimicking a SequentialWorkflow for nodes that aren't connected.
+        """
+        index = {}
+        for i, cname in enumerate(self._names):
+            index.setdefault(cname, i)
+
+        indegree = graph.in_degree()
+        ready = [(index[node], node) for node, deg in indegree.items()
+                                     if deg == 0]
+        heapq.heapify(ready)
+        topsort = []
+        while ready:
+            node = heapq.heappop(ready)[1]
+            topsort.append(node)
+            for succ in graph.successors_iter(node):
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    heapq.heappush(ready, (index[succ], succ))
+
+        if len(topsort) != len(indegree):
+            raise nx.NetworkXUnfeasible('Graph contains a cycle.')
+        return topsort
+
+    def _update_topsort(self):
+        """Update the cached execution order for components appended to this
+        workflow and connections made since it was computed. This is only
+        done if the order doesn't change except for appending. Otherwise the
+        cache is discarded.
+        """
+        if self._topsort is None:
+            return
+        depgraph = self.scope._depgraph
+        edges = depgraph.edges_added_since(self._graph_log)
+        if edges is None:
+            self._reset()
+            return
+        if not edges and not self._appended:
+            return
+
+        graph = self._collapsed_graph
+        order = self._order
+        topsort = self._topsort
+        scope = self.scope
+        for cname in self._appended:
+            comp = getattr(scope, cname, None)
+            if comp is None or has_interface(comp, IDriver) or \
+               hasattr(comp, '_delegates_') or cname not in depgraph:
+                self._reset()
+                return
+            for src, link in depgraph.in_links(cname):
+                if src in order:
+                    graph.add_edge(src, cname)
+            for dest, link in depgraph.out_links(cname):
+                if dest in order:
+                    self._reset()  # Existing component depends on cname.
+                    return
+            graph.add_node(cname)
+            order[cname] = len(topsort)
+            topsort.append(cname)
+        self._appended = []
+
+        for src, dest in edges:
+            if src in order and dest in order:
+                if order[src] > order[dest]:
+                    self._reset()
+                    return
+                graph.add_edge(src, dest)
+        self._graph_log = depgraph.get_log_position()
+
     def _get_collapsed_graph(self):
         """Get a dependency graph with only our workflow components
         in it, with additional edges added to it from sub-workflows
@@ -67,17 +170,18 @@ class Dataflow(SequentialWorkflow):
         """
         if self._collapsed_graph:
             return self._collapsed_graph
-        
+
         to_add = []
         scope = self.scope
+        self._graph_log = scope._depgraph.get_log_position()
         graph = scope._depgraph.copy_graph()
-        
+
         contents = self.get_components()
-        
+
         # add any dependencies due to ExprEvaluators
         for comp in contents:
             graph.add_edges_from([tup for tup in comp.get_expr_depends()])
-            
+
         collapsed_graph = nx.DiGraph(graph)  # this way avoids a deep copy of edge/node data
 
         # find all of the incoming and outgoing edges to/from all of the
@@ -110,29 +214,23 @@ class Dataflow(SequentialWorkflow):
                     if u != drv:
                         to_add.append((u, drv))
         collapsed_graph.add_edges_from(to_add)
-        
-        # now add some fake dependencies for degree 0 nodes in an attempt to
-        # mimic a SequentialWorkflow in cases where nodes aren't connected.
-        # Edges are added from each degree 0 node to all nodes after it in
-        # sequence order.
+
+        # Unconnected nodes are kept in sequence order by _sequence_sort(),
+        # except for duplicates, which are handled by _insert_duplicates().
         self._duplicates = set()
-        last = len(self._names)-1
-        if last > 0:
-            to_add = []
-            for i,cname in enumerate(self._names):
-                if collapsed_graph.degree(cname) == 0:
-                    if self._names.count(cname) > 1:
-                        # Don't introduce circular dependencies.
-                        self._duplicates.add(cname)
-                    else:
-                        if i < last:
-                            for n in self._names[i+1:]:
-                                to_add.append((cname, n))
-                        else:
-                            for n in self._names[0:i]:
-                                to_add.append((n, cname))
-            collapsed_graph.add_edges_from(to_add)
-        
+        if len(self._names) > 1:
+            for cname in self._names:
+                if collapsed_graph.degree(cname) == 0 and \
+                   self._names.count(cname) > 1:
+                    self._duplicates.add(cname)
+
+        # The order can be updated incrementally if it only depends on
+        # connections between our components.
+        self._incremental = not itersets and \
+                            len(cnames) == len(self._names) and \
+                            not [comp for comp in contents
+                                      if hasattr(comp, '_delegates_')]
+
         self._collapsed_graph = collapsed_graph.subgraph(cnames-removes)
         return self._collapsed_graph
 
@@ -159,4 +257,3 @@ class Dataflow(SequentialWorkflow):
                         start = index + 1
                     max_index = max(index, max_index)
                 topsort.insert(max_index+1, cname)
-
@@ -88,6 +88,24 @@ class ArrayTestCase(unittest.TestCase):
         d1 = f1.default_value/2
         self.assertAlmostEqual(d1[0], 1.5, places=4)
         
+    def test_conversion_copy(self):
+        self.hobj.add('temp1', Array(array([0., 100.]), iotype='out',
+                                     units='degC'))
+        self.hobj.add('temp2', Array(iotype='in', units='degF'))
+        
+        srcwrapper = self.hobj.get_wrapped_attr('arr2')
+        self.hobj.arr1 = srcwrapper
+        self.assertAlmostEqual(self.hobj.arr1[1][0], 0.25, 10)
+        
+        # Source is not modified.
+        self.assertEqual(self.hobj.arr2[1][0], 3.)
+        
+        # Offset units
+        self.hobj.temp2 = self.hobj.get_wrapped_attr('temp1')
+        self.assertAlmostEqual(self.hobj.temp2[0], 32., 10)
+        self.assertAlmostEqual(self.hobj.temp2[1], 212., 10)
+        self.assertEqual(list(self.hobj.temp1), [0., 100.])
+        
     def test_bad_connection(self):
         srcwrapper = self.hobj.get_wrapped_attr('arr2')
         self.hobj.arr1 = srcwrapper
@@ -5,7 +5,6 @@ import sys
 
 # pylint: disable-msg=E0611,F0401
 import networkx as nx
-from networkx.algorithms.dag import is_directed_acyclic_graph
 from networkx.algorithms.components import strongly_connected_components
 
 from openmdao.main.expreval import ExprEvaluator
@@ -67,6 +66,21 @@ _fakes = ['@xin', '@xout', '@bin', '@bout']
 # ExprEvaluator
 _exprset = set('+-/*[]()&| %<>!')
 
+
+def _has_path(graph, start, end):
+    """Return True if `end` can be reached from `start` in `graph`."""
+    succ = graph.succ
+    visited = set()
+    tmpset = [start]
+    while tmpset:
+        node = tmpset.pop()
+        if node == end:
+            return True
+        if node not in visited:
+            visited.add(node)
+            tmpset.extend(succ[node])
+    return False
+
 class DependencyGraph(object):
     """
     A dependency graph for Components. Each edge contains a _Link object,
@@ -87,6 +101,9 @@ class DependencyGraph(object):
         self._graph = nx.DiGraph()
         self._graph.add_nodes_from(_fakes)
         self._allsrcs = {}
+        # Component edges added since the last removal of an edge or node.
+        # Used to update execution orders incrementally.
+        self._edge_log = []
         
     def __contains__(self, compname):
         """Return True if this graph contains the given component."""
@@ -122,6 +139,23 @@ class DependencyGraph(object):
         """
         self.disconnect(name)
         self._graph.remove_node(name)
+        self._edge_log = []
+
+    def get_log_position(self):
+        """Return a marker for the current state of the graph, for use with
+        :meth:`edges_added_since`.
+        """
+        return (self._edge_log, len(self._edge_log))
+
+    def edges_added_since(self, position):
+        """Return a list of (srccompname, destcompname) edges added since
+        `position` was obtained from :meth:`get_log_position`, or None if
+        edges or nodes have been removed since then.
+        """
+        log, index = position
+        if log is not self._edge_log:
+            return None
+        return log[index:]
                                     
     def invalidate_deps(self, scope, cnames, varsets, force=False):
         """Walk through all dependent nodes in the graph, invalidating all
@@ -324,10 +358,20 @@ class DependencyGraph(object):
             try:
                 link = graph[srccompname][destcompname]['link']
             except KeyError:
+                # Only a new edge can create a cycle, and then only if there
+                # is already a path back to the source.
+                if srccompname in graph and destcompname in graph:
+                    cycle = _has_path(graph, destcompname, srccompname)
+                else:
+                    cycle = False
                 link = _Link(srccompname, destcompname)
                 graph.add_edge(srccompname, destcompname, link=link)
+                if not cycle:
+                    self._edge_log.append((srccompname, destcompname))
+            else:
+                cycle = False
             
-            if is_directed_acyclic_graph(graph):
+            if not cycle:
                 link.connect(srcvarname, destvarname)
             else:   # cycle found
                 # do a little extra work here to give more info to the user
@@ -390,6 +434,7 @@ class DependencyGraph(object):
 
     def disconnect(self, srcpath, destpath=None):
         """Disconnect the given variables."""
+        self._edge_log = []
         if destpath is None:
             for src, dest in self.connections_to(srcpath):
                 self.disconnect(src, dest)
@@ -4,10 +4,20 @@ perform calculations during a Fake Finite Difference.
 """
 
 #public symbols
-__all__ = ['Derivatives', 'derivative_name']
+__all__ = ['Derivatives', 'derivative_name', 'jacobian_product']
 
-def _check_var(comp, var_name, iotype):
-    """ Checks a variable to make sure it's the proper type and iotype."""
+import logging
+
+try:
+    from numpy import ndarray, zeros
+except ImportError as err:
+    logging.warn("In %s: %r", __file__, err)
+    from openmdao.main.numpy_fallback import ndarray, zeros
+
+    
+def _check_var(comp, var_name, iotype, allow_array=True):
+    """ Checks a variable to make sure it's the proper type and iotype.
+    Returns the variable's value."""
     
     if iotype == 'input':
         conns = comp.list_inputs()
@@ -22,11 +32,22 @@ def _check_var(comp, var_name, iotype):
         raise RuntimeError(msg)
     
     value = comp.get(var_name)
-    if not isinstance(value, float):
+    if isinstance(value, float):
+        return value
+    
+    if allow_array and isinstance(value, ndarray) and \
+       getattr(value, 'dtype', None) is not None and value.dtype.kind == 'f':
+        return value
+    
+    if allow_array:
         msg = 'At present, derivatives can only be declared for float-' + \
-              'valued variables. Variable %s ' % var_name + \
+              'valued variables and float arrays. Variable %s ' % var_name + \
               'is of type %s.' % type(var_name)
-        raise RuntimeError(msg)
+    else:
+        msg = 'At present, second derivatives can only be declared for ' + \
+              'float-valued variables. Variable %s ' % var_name + \
+              'is of type %s.' % type(var_name)
+    raise RuntimeError(msg)
 
     
 def derivative_name(input_name, output_name):
@@ -42,6 +63,53 @@ def derivative_name(input_name, output_name):
                           input_name.replace('.', '_'))
 
 
+def _size(value):
+    """ Returns the number of elements in a float or array variable."""
+    
+    if isinstance(value, ndarray):
+        return value.size
+    return 1
+
+
+def _copy(value):
+    """ Returns a copy of an array variable, or a float variable."""
+    
+    if isinstance(value, ndarray):
+        return value.copy()
+    return value
+
+
+def jacobian_product(jacobian, delta):
+    """ Returns the change in an output due to a change in one of its
+    inputs (or the derivative of an output with respect to something, given
+    the derivative of the input with respect to it.)
+    
+    jacobian: float, ndarray or scipy sparse matrix
+        First derivative of the output with respect to the input. Blocks
+        for array variables have one row per output element and one column
+        per input element, in flattened (C) order.
+        
+    delta: float or ndarray
+        Change in the input.
+        
+    The result is a float if the output has a single element, otherwise a
+    flat array.
+    """
+    
+    if isinstance(jacobian, (float, int)):
+        return jacobian*delta
+    
+    if isinstance(delta, ndarray):
+        delta = delta.ravel()
+    else:
+        delta = zeros(1) + delta
+        
+    product = jacobian.dot(delta)
+    if product.size == 1:
+        return product[0]
+    return product
+
+    
 class Derivatives(object):
     """Class for storing derivatives between the inputs and outputs of a
     component at specified orders.
@@ -76,13 +144,18 @@ class Derivatives(object):
             Name of component's first input variable for derivative.
         """
         
-        _check_var(self.parent, in_name, "input")
-        _check_var(self.parent, out_name, "output")
+        in_value = _check_var(self.parent, in_name, "input")
+        out_value = _check_var(self.parent, out_name, "output")
         
         if out_name not in self.first_derivatives:
             self.first_derivatives[out_name] = {}
-            
-        self.first_derivatives[out_name][in_name] = 0.0
+        
+        # Derivatives involving arrays are stored as a matrix block.
+        if isinstance(in_value, float) and isinstance(out_value, float):
+            self.first_derivatives[out_name][in_name] = 0.0
+        else:
+            shape = (_size(out_value), _size(in_value))
+            self.first_derivatives[out_name][in_name] = zeros(shape)
         
         if in_name not in self.in_names:
             self.in_names.append(in_name)
@@ -101,20 +174,32 @@ class Derivatives(object):
         in_name: str
             Name of component's input variable.
             
-        value: float
-            Value of derivative.
+        value: float, ndarray or scipy sparse matrix
+            Value of derivative. If either variable is an array, this is a
+            matrix with one row per element of the output and one column
+            per element of the input.
         """
         
         try:
             if in_name not in self.first_derivatives[out_name]:
                 raise KeyError()
-            self.first_derivatives[out_name][in_name] = value
+            old_value = self.first_derivatives[out_name][in_name]
         except KeyError:
             msg = "Derivative of %s " % out_name + \
                   "with repect to %s " % in_name + \
                   "must be declared before being set."
             raise KeyError(msg)
         
+        # Blocks for array variables keep their declared shape.
+        shape = getattr(old_value, 'shape', ())
+        if shape and getattr(value, 'shape', None) != shape:
+            msg = "Derivative of %s " % out_name + \
+                  "with repect to %s " % in_name + \
+                  "must have shape %s." % (shape,)
+            raise ValueError(msg)
+        
+        self.first_derivatives[out_name][in_name] = value
+        
 
     def declare_second_derivative(self, out_name, in_name1, in_name2):
         """ Declares that a component can calculate a second derivative
@@ -130,9 +215,9 @@ class Derivatives(object):
             Name of component's second input variable for derivative.
         """
         
-        _check_var(self.parent, in_name1, "input")
-        _check_var(self.parent, in_name2, "input")
-        _check_var(self.parent, out_name, "output")
+        _check_var(self.parent, in_name1, "input", allow_array=False)
+        _check_var(self.parent, in_name2, "input", allow_array=False)
+        _check_var(self.parent, out_name, "output", allow_array=False)
         
         if out_name not in self.second_derivatives:
             self.second_derivatives[out_name] = {}
@@ -201,26 +286,41 @@ class Derivatives(object):
         have been specified.
         """
         
+        # Arrays are copied, in case the component modifies them in place.
         for name in self.in_names:
-            self.inputs[name] = self.parent.get(name)
+            self.inputs[name] = _copy(self.parent.get(name))
 
         for name in self.out_names:
-            self.outputs[name] = self.parent.get(name)
+            self.outputs[name] = _copy(self.parent.get(name))
 
 
-    def calculate_output(self, out_name, order):
+    def calculate_output(self, out_name, order, inputs=None):
         """Returns the Fake Finite Difference output for the given output
         name using the stored baseline and derivatives along with the
         new inputs in the component.
+        
+        inputs: dict (optional)
+            Current values of the inputs, keyed by name. If not given,
+            they are retrieved from the component.
         """
         
+        if inputs is None:
+            inputs = dict([(name, self.parent.get(name)) 
+                           for name in self.in_names])
+        
         y = self.outputs[out_name]
             
         # First order derivatives
         if order == 1:
             
+            dy = 0.0
             for in_name, dx in self.first_derivatives[out_name].iteritems():
-                y += dx*(self.parent.get(in_name) - self.inputs[in_name])
+                dy = dy + jacobian_product(dx, inputs[in_name] - \
+                                              self.inputs[in_name])
+                
+            if isinstance(dy, ndarray) and isinstance(y, ndarray):
+                dy = dy.reshape(y.shape)
+            y = y + dy
         
         # Second order derivatives
         elif order == 2:
@@ -228,8 +328,8 @@ class Derivatives(object):
             for in_name1, item in self.second_derivatives[out_name].iteritems():
                 for in_name2, dx in item.iteritems():
                     y += 0.5*dx* \
-                      (self.parent.get(in_name1) - self.inputs[in_name1])* \
-                      (self.parent.get(in_name2) - self.inputs[in_name2])
+                      (inputs[in_name1] - self.inputs[in_name1])* \
+                      (inputs[in_name2] - self.inputs[in_name2])
         
         else:
             msg = 'Fake Finite Difference does not currently support an ' + \
@@ -4,6 +4,7 @@
 __all__ = ["Driver"]
 
 import fnmatch
+from copy import deepcopy
 
 # pylint: disable-msg=E0611,F0401
 
@@ -15,6 +16,7 @@ from openmdao.main.component import Component
 from openmdao.main.workflow import Workflow
 from openmdao.main.case import Case
 from openmdao.main.dataflow import Dataflow
+from openmdao.main.evalcache import EvaluationCache
 from openmdao.main.hasevents import HasEvents
 from openmdao.main.hasparameters import HasParameters
 from openmdao.main.hasconstraints import HasConstraints, HasEqConstraints, \
@@ -44,9 +46,20 @@ class Driver(Component):
     # though we replace it with a new Dataflow in __init__
     workflow = Slot(Workflow, allow_none=True, required=True, 
                     factory=Dataflow, hidden=True)
+
+    eval_cache = Slot(EvaluationCache, required=False,
+                      desc='If set, objective and constraint values are cached'
+                           ' by parameter values and the workflow is not'
+                           ' re-run for a previously evaluated point.')
     
     def __init__(self, doc=None):
         self._iter = None
+        # Objective and constraint values for the current iteration when
+        # using eval_cache.
+        self._cached_results = None
+        # True if the current iteration was an eval_cache hit, so the model
+        # hasn't been run at the current parameter values.
+        self._cache_hit = False
         super(Driver, self).__init__(doc=doc)
         self.workflow = Dataflow(self)
         self.force_execute = True
@@ -249,7 +262,17 @@ class Driver(Component):
             
         # Override just to reset the workflow :-(
         self.workflow.reset()
-        super(Driver, self).run(force, ffd_order, case_id)
+        self._cached_results = None
+        self._cache_hit = False
+        try:
+            super(Driver, self).run(force, ffd_order, case_id)
+            # Leave the model in the state of the last point evaluated.
+            self._sync_model()
+        finally:
+            self._cached_results = None
+            self._cache_hit = False
+            if self.eval_cache is not None and self.eval_cache.filename:
+                self.eval_cache.save()
         self._invalidated = False
 
     def execute(self):
@@ -317,15 +340,81 @@ class Driver(Component):
         self.set_events()
 
     def run_iteration(self):
-        """Runs workflow."""
+        """Runs workflow. If `eval_cache` is set and the current parameter
+        values have already been evaluated, the workflow is not run and
+        the recorded objective and constraint values are used instead.
+        The cache isn't used during Fake Finite Difference (non-zero
+        `ffd_order`), since the outputs then depend on the saved derivatives.
+        """
         wf = self.workflow
         if len(wf) == 0:
             self._logger.warning("'%s': workflow is empty!" % self.get_pathname())
-        wf.run(ffd_order=self.ffd_order, case_id=self._case_id)
+
+        self._cached_results = None
+        self._cache_hit = False
+        cache = self.eval_cache
+        if cache is None or self.ffd_order or \
+           not hasattr(self, 'eval_parameters'):
+            wf.run(ffd_order=self.ffd_order, case_id=self._case_id)
+            return
+
+        key = cache.make_key(self.eval_parameters(), *self._cache_config())
+        results = cache.get(key)
+        if results is None:
+            wf.run(ffd_order=self.ffd_order, case_id=self._case_id)
+            results = self._eval_responses()
+            cache.put(key, results)
+        else:
+            self._cache_hit = True
+        self._cached_results = results
+
+    def _sync_model(self):
+        """If the current iteration was an `eval_cache` hit, runs the
+        workflow so that the model reflects the current parameter values.
+        The cached objective and constraint values are still used.
+        """
+        if self._cache_hit:
+            self.workflow.run(ffd_order=self.ffd_order, case_id=self._case_id)
+            self._cache_hit = False
+
+    def _cache_config(self):
+        """Returns the items identifying the driver configuration which
+        are included in `eval_cache` keys.
+        """
+        config = []
+        for name in ('get_parameters', 'get_objectives',
+                     'get_eq_constraints', 'get_ineq_constraints'):
+            if hasattr(self, name):
+                config.append(tuple(getattr(self, name)().keys()))
+        return config
+
+    def _eval_responses(self):
+        """Returns a dictionary of current objective and constraint values
+        for use by `eval_cache`.
+        """
+        results = {}
+        if hasattr(self, 'eval_objectives'):
+            results['objectives'] = self.eval_objectives()
+        if hasattr(self, 'eval_eq_constraints'):
+            results['eq'] = self.eval_eq_constraints()
+        if hasattr(self, 'eval_ineq_constraints'):
+            results['ineq'] = self.eval_ineq_constraints()
+        return results
+
+    def get_cached_results(self, category):
+        """Returns the `eval_cache` values of `category` ('objectives',
+        'eq', or 'ineq') for the current iteration, or None if they are not
+        available.
+        """
+        if self._cached_results is None:
+            return None
+        return self._cached_results.get(category)
 
     def calc_derivatives(self, first=False, second=False):
         """ Calculate derivatives and save baseline states for all components
         in this workflow."""
+        # The baseline must be the current point, not the last one run.
+        self._sync_model()
         self.workflow.calc_derivatives(first, second)
 
     def check_derivatives(self, order, driver_inputs, driver_outputs):
@@ -376,8 +465,8 @@ class Driver(Component):
 
         # Constraints
         if hasattr(self, 'get_ineq_constraints'):
-            for name, con in self.get_ineq_constraints().iteritems():
-                val = con.evaluate(self.parent)
+            for name, val in zip(self.get_ineq_constraints().keys(),
+                                 self.eval_ineq_constraints()):
                 if '>' in val[2]:
                     case_output.append(["Constraint ( %s )" % name,
                                                               val[0] - val[1]])
@@ -386,23 +475,52 @@ class Driver(Component):
                                                               val[1] - val[0]])
 
         if hasattr(self, 'get_eq_constraints'):
-            for name, con in self.get_eq_constraints().iteritems():
-                val = con.evaluate(self.parent)
+            for name, val in zip(self.get_eq_constraints().keys(),
+                                 self.eval_eq_constraints()):
                 case_output.append(["Constraint ( %s )" % name, val[1] - val[0]])
 
         tmp_printvars = self.printvars[:]
         tmp_printvars.append('%s.workflow.itername' % self.name)
         iotypes[tmp_printvars[-1]] = 'out'
         
-        # Additional user-requested variables
-        for printvar in tmp_printvars:
+        # Additional user-requested variables. After an eval_cache hit the
+        # model hasn't been run at the current point, so the values recorded
+        # with the cache entry are used. If there aren't any, the model is
+        # run to get them.
+        printvals = None
+        if self._cache_hit:
+            printvals = self._cached_results.get('printvars')
+            if printvals is not None and printvals[0] != tmp_printvars:
+                printvals = None
+            if printvals is None:
+                self._sync_model()
+        if printvals is None:
+            printvals = (tmp_printvars,) + \
+                        self._eval_printvars(tmp_printvars, iotypes)
+            if self._cached_results is not None:
+                self._cached_results['printvars'] = deepcopy(printvals)
+        case_input.extend(printvals[1])
+        case_output.extend(printvals[2])
+
+        case = Case(case_input, case_output, parent_uuid=self._case_id)
+
+        for recorder in self.recorders:
+            recorder.record(case)
+
+    def _eval_printvars(self, printvars, iotypes):
+        """Returns lists of [name, value] for the input and output variables
+        matching `printvars`. `iotypes` maps variable names to iotype.
+        """
+        case_input = []
+        case_output = []
+        for printvar in printvars:
 
             if  '*' in printvar:
-                printvars = self._get_all_varpaths(printvar)
+                varpaths = self._get_all_varpaths(printvar)
             else:
-                printvars = [printvar]
+                varpaths = [printvar]
 
-            for var in printvars:
+            for var in varpaths:
                 iotype = iotypes.get(var)
                 if iotype is None:
                     iotype = self.parent.get_metadata(var, 'iotype')
@@ -417,10 +535,7 @@ class Driver(Component):
                     msg = "%s is not an input or output" % var
                     self.raise_exception(msg, ValueError)
 
-        case = Case(case_input, case_output, parent_uuid=self._case_id)
-
-        for recorder in self.recorders:
-            recorder.record(case)
+        return case_input, case_output
 
     def _get_all_varpaths(self, pattern, header=''):
         ''' Return a list of all varpaths in the driver's workflow that
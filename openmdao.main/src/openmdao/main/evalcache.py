@@ -0,0 +1,152 @@
+"""
+Cache of driver evaluation results keyed on parameter values.
+"""
+
+#public symbols
+__all__ = ["EvaluationCache"]
+
+import cPickle
+import os.path
+
+from ordereddict import OrderedDict
+
+
+def _flatten(val):
+    """ Return a list of the scalar values in `val`. """
+    if hasattr(val, 'flat'):  # numpy array.
+        return list(val.flat)
+    elif isinstance(val, (list, tuple)):
+        flat = []
+        for item in val:
+            flat.extend(_flatten(item))
+        return flat
+    return [val]
+
+
+def _get_cached_results(parent, category):
+    """
+    Return results of `category` from the evaluation cache of `parent`,
+    or None if `parent` doesn't use an evaluation cache or has no results.
+    """
+    if hasattr(parent, 'get_cached_results'):
+        return parent.get_cached_results(category)
+    return None
+
+
+class EvaluationCache(object):
+    """
+    A least recently used store of objective and constraint values for
+    previously evaluated parameter vectors. When assigned to a driver's
+    `eval_cache`, a workflow run at a parameter vector already in the cache
+    is skipped and the recorded values are returned instead.
+
+    Note that on a cache hit only the values of objectives and constraints
+    are restored. Other variables in the model keep the values from the
+    last actual run until the driver finishes, when the model is run at the
+    final point if that was a hit. Cases recorded for a hit use the values
+    of the driver's `printvars` recorded with the entry.
+
+    maxsize: int
+        Maximum number of entries. The least recently used entry is discarded
+        when the cache is full. If zero, the size is unlimited.
+
+    tolerance: float
+        Parameter values are rounded to a multiple of `tolerance` before
+        lookup, so vectors which differ by less than this typically share
+        an entry. If zero, values must match exactly.
+
+    filename: string
+        If specified, the cache is loaded from this file (if it exists) and
+        :meth:`save` writes the cache back to it.
+    """
+
+    def __init__(self, maxsize=1000, tolerance=0., filename=None):
+        if maxsize < 0:
+            raise ValueError('maxsize must be >= 0')
+        if tolerance < 0:
+            raise ValueError('tolerance must be >= 0')
+        self.maxsize = maxsize
+        self.tolerance = tolerance
+        self.filename = filename
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        if filename and os.path.exists(filename):
+            self.load(filename)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def make_key(self, values, *extra):
+        """
+        Return a hashable key for the parameter vector `values`.
+        Array values are flattened. Any `extra` items are prepended to the
+        key as-is.
+        """
+        key = list(extra)
+        tol = self.tolerance
+        for val in _flatten(values):
+            try:
+                val = float(val)
+            except (TypeError, ValueError):
+                pass  # Non-numeric, use as-is.
+            else:
+                if tol:
+                    val = int(round(val / tol))
+            key.append(val)
+        return tuple(key)
+
+    def get(self, key):
+        """
+        Return the results stored for `key`, or None if there aren't any.
+        A successful lookup makes `key` the most recently used entry.
+        """
+        try:
+            results = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries[key] = results
+        self.hits += 1
+        return results
+
+    def put(self, key, results):
+        """ Store `results` for `key`, discarding the oldest entry if full. """
+        self._entries.pop(key, None)
+        self._entries[key] = results
+        if self.maxsize and len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """ Remove all entries and reset the hit/miss statistics. """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, filename=None):
+        """
+        Replace current entries with those saved in `filename`
+        (default :attr:`filename`).
+        """
+        filename = filename or self.filename
+        with open(filename, 'rb') as inp:
+            tolerance, entries = cPickle.load(inp)
+        if tolerance != self.tolerance:
+            raise ValueError('%s: cache tolerance %s != %s'
+                             % (filename, tolerance, self.tolerance))
+        self._entries = OrderedDict(entries)
+        while self.maxsize and len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def save(self, filename=None):
+        """ Save current entries to `filename` (default :attr:`filename`). """
+        filename = filename or self.filename
+        if not filename:
+            raise ValueError('no filename specified')
+        with open(filename, 'wb') as out:
+            cPickle.dump((self.tolerance, self._entries.items()), out,
+                         cPickle.HIGHEST_PROTOCOL)
+
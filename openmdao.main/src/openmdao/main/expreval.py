@@ -221,6 +221,91 @@ class ExprTransformer(ast.NodeTransformer):
             return ast.Assign(targets=[lhs], value=rhs)
         return lhs
 
+class _NotCompilable(Exception):
+    """Raised if an expression can't be compiled for direct access."""
+    pass
+
+
+class _CompiledTransformer(ExprTransformer):
+    """Transforms variable references in an expression AST into direct
+    attribute and index accesses on objects resolved once from the scope,
+    rather than scope.get() calls. References are resolved through child
+    Components of the scope (and of any sub-Assemblies). Since those are only
+    replaced via add() or remove(), which change the scope's configuration,
+    the resolved objects remain valid until the scope's config_changed() is
+    called.
+    """
+    def __init__(self, expreval, scope):
+        super(_CompiledTransformer, self).__init__(expreval)
+        self.scope = scope
+        self.objs = {}  # local name -> resolved object
+        self._names = {}  # id(resolved object) -> local name
+
+    def _resolve(self, name):
+        """Return (local name, remaining name parts) for `name`."""
+        # avoid circular import
+        from openmdao.main.component import Component
+        obj = self.scope
+        parts = name.split('.')
+        while len(parts) > 1:
+            if parts[0] not in obj._depgraph:
+                break
+            child = getattr(obj, parts[0], None)
+            if not isinstance(child, Component):
+                break
+            obj = child
+            parts = parts[1:]
+
+        local = self._names.get(id(obj))
+        if local is None:
+            local = '_obj%d_' % len(self.objs)
+            self._names[id(obj)] = local
+            self.objs[local] = obj
+        return (local, parts)
+
+    def _name_to_node(self, node, name, subs=None):
+        if name is None:
+            return super(ExprTransformer, self).generic_visit(node)
+
+        if self.expreval.is_local(name):
+            return node
+
+        local, parts = self._resolve(name)
+        value = ast.Name(id=local, ctx=ast.Load())
+        if len(parts) == 1:
+            value = ast.Attribute(value=value, attr=parts[0], ctx=ast.Load())
+        else:
+            # Not a variable of a Component, e.g. a variable in a child
+            # Container or proxy, so let the owning Component resolve it.
+            value = ast.Call(func=ast.Attribute(value=value, attr='get',
+                                                ctx=ast.Load()),
+                             args=[ast.Str(s='.'.join(parts))], keywords=[],
+                             starargs=None, kwargs=None)
+
+        for sub in subs or []:
+            op = sub.elts[0].n
+            if op == INDEX:
+                value = ast.Subscript(value=value,
+                                      slice=ast.Index(value=sub.elts[1]),
+                                      ctx=ast.Load())
+            elif op == SLICE:
+                lower, upper, step = sub.elts[1].elts
+                value = ast.Subscript(value=value,
+                                      slice=ast.Slice(lower=lower,
+                                                      upper=upper,
+                                                      step=step),
+                                      ctx=ast.Load())
+            elif op == ATTR:
+                value = ast.Attribute(value=value, attr=sub.elts[1].s,
+                                      ctx=ast.Load())
+            else:
+                # Calls may have side effects, so they aren't compiled in
+                # case evaluation has to be repeated to report an error.
+                raise _NotCompilable(name)
+
+        return ast.copy_location(value, node)
+
+
 class ExprExaminer(ast.NodeVisitor):
     """"Examines various properties of an expression for later analysis."""
     def __init__(self, node, evaluator=None):
@@ -372,7 +457,14 @@ class ExprEvaluator(object):
     function invocation are also translated in a similar way.  For a description
     of the format of the 'index' arg of set/get that is generated by ExprEvaluator,
     see the doc string for the ``openmdao.main.index.process_index_entry`` function.
+
+    If `compiled` is True (the default) and the scope is a Component,
+    :meth:`evaluate` uses a function in which variable references have been
+    resolved into direct attribute and index accesses. The function is
+    rebuilt whenever the scope's configuration changes.
     """
+
+    compiled = True
     
     def __init__(self, text, scope=None, getter='get'):
         self._scope = None
@@ -390,6 +482,7 @@ class ExprEvaluator(object):
     def text(self, value):
         self._code = self._assignment_code = None
         self._examiner = self.cached_grad_eq = None
+        self._compiled = None
         self._text = value
 
     @property
@@ -407,6 +500,7 @@ class ExprEvaluator(object):
         if value is not self.scope:
             self._code = self._assignment_code = None
             self._examiner = self.cached_grad_eq = None
+            self._compiled = None
             if value is not None:
                 self._scope = weakref.ref(value)
             else:
@@ -439,6 +533,7 @@ class ExprEvaluator(object):
         # remove weakref to scope because it won't pickle
         state['_scope'] = self.scope
         state['_code'] = None  # <type 'code'> won't pickle either.
+        state['_compiled'] = None  # Nor will functions.
         if state.get('_assignment_code'):
             state['_assignment_code'] = None # more unpicklable <type 'code'>
         return state
@@ -508,6 +603,40 @@ class ExprEvaluator(object):
         
         return new_ast
     
+    def _get_compiled(self, scope):
+        """Return a function which evaluates our expression in `scope`
+        using direct access to referenced variables, or None if that isn't
+        possible.
+        """
+        token = getattr(scope, '_config_token', None)
+        if token is None:
+            return None  # Not a Component.
+        if self._compiled is None or self._compiled[0] is not token:
+            try:
+                func = self._compile(scope)
+            except _NotCompilable:
+                func = None
+            self._compiled = (token, func)
+        return self._compiled[1]
+
+    def _compile(self, scope):
+        """Return a function which evaluates our expression in `scope`."""
+        global _expr_dict
+        root = self._pre_parse()
+        if not isinstance(root, ast.Expression):
+            raise _NotCompilable(self.text)  # An assignment.
+        transformer = _CompiledTransformer(self, scope)
+        body = transformer.visit(root.body)
+        func = ast.Expression(body=ast.Lambda(args=ast.arguments(args=[],
+                                                                 vararg=None,
+                                                                 kwarg=None,
+                                                                 defaults=[]),
+                                              body=body))
+        ast.fix_missing_locations(func)
+        namespace = _expr_dict.copy()
+        namespace.update(transformer.objs)
+        return eval(compile(func, '<string>', 'eval'), namespace)
+
     def _get_updated_scope(self, scope):
         if scope is not None:
             self.scope = scope
@@ -523,6 +652,13 @@ class ExprEvaluator(object):
         try:
             if self._code is None:
                 self._parse()
+            if self.compiled and self.getter == 'get':
+                func = self._get_compiled(scope)
+                if func is not None:
+                    try:
+                        return func()
+                    except Exception:
+                        pass  # Report the error from a normal evaluation.
             return eval(self._code, _expr_dict, locals())
         except Exception, err:
             raise type(err)("can't evaluate expression "+
@@ -8,6 +8,7 @@ import operator
 import ordereddict
 
 from openmdao.main.expreval import ExprEvaluator
+from openmdao.main.evalcache import _get_cached_results
 
 _ops = {
     '>': operator.gt,
@@ -336,6 +337,10 @@ class HasEqConstraints(_HasConstraintsBase):
         """Returns a list of tuples of the 
         form (lhs, rhs, comparator, is_violated).
         """
+        if scope is None:
+            cached = _get_cached_results(self._parent, 'eq')
+            if cached is not None:
+                return cached
         return [c.evaluate(_get_scope(self,scope)) for c in self._constraints.values()]
     
     def allows_constraint_types(self, types):
@@ -434,6 +439,10 @@ class HasIneqConstraints(_HasConstraintsBase):
 
     def eval_ineq_constraints(self, scope=None): 
         """Returns a list of constraint values"""
+        if scope is None:
+            cached = _get_cached_results(self._parent, 'ineq')
+            if cached is not None:
+                return cached
         return [c.evaluate(_get_scope(self,scope)) for c in self._constraints.values()]
     
     def allows_constraint_types(self, typ):
@@ -3,6 +3,7 @@ import weakref
 import ordereddict
 
 from openmdao.main.expreval import ExprEvaluator
+from openmdao.main.evalcache import _get_cached_results
 
 
 def _remove_spaces(s):
@@ -138,6 +139,9 @@ class HasObjectives(object):
         
     def eval_objectives(self):
         """Returns a list of values of the evaluated objectives."""
+        cached = _get_cached_results(self._parent, 'objectives')
+        if cached is not None:
+            return cached
         return [obj.evaluate(self._get_scope()) for obj in self._objectives.values()]
 
     def get_expr_depends(self):
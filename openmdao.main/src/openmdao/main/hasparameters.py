@@ -512,6 +512,13 @@ class HasParameters(object):
         """Returns an ordered dict of parameter objects."""
         return self._parameters
 
+    def eval_parameters(self, scope=None):
+        """Return a list of the current values of the parameters, in the
+        order returned by the get_parameters method.
+        """
+        scope = self._get_scope(scope)
+        return [param.evaluate(scope) for param in self._parameters.values()]
+
     def init_parameters(self): 
         """Sets all parameters to their start value if a start value is given""" 
         for key,param in self._parameters.iteritems():
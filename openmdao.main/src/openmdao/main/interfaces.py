@@ -536,6 +536,19 @@ class ISurrogate(Interface):
         Returns the predicted output value.
         """
 
+    def predict_many(X):
+        """Predicts values from the surrogate model for each of the
+        independent values in X, in a single call.
+
+        X: 2D array or list of lists
+            The input values for each point, one row per point.
+
+        Returns a list or array of predicted output values, one per row
+        of X, matching what `predict` returns for each row. This method is
+        optional; surrogates without it are called with `predict` for each
+        row.
+        """
+
     def train(X, Y): 
         """Trains the surrogate model, based on the given training data set.
         
@@ -545,6 +558,19 @@ class ISurrogate(Interface):
             Training case output history for this surrogate's output,
             which corresponds to the training case input history given by X.
         """
+
+    def add_points(X, Y):
+        """Adds training data to an already trained surrogate model. The
+        model may be updated incrementally rather than retrained on all of
+        the data, and is trained on X and Y if it hasn't been trained yet.
+        This method is optional; surrogates without it are retrained on all
+        of the data.
+
+        X: iterator of lists
+            Values of the inputs for the new training cases.
+        Y: iterator
+            Values of this surrogate's output for the new training cases.
+        """
     
 class IHasParameters(Interface):
     
@@ -577,6 +603,11 @@ class IHasParameters(Interface):
     def get_parameters():
         """Returns an ordered dict of parameter objects."""
 
+    def eval_parameters():
+        """Returns a list of the current values of the parameters, in the
+        order returned by the get_parameters method.
+        """
+
     def set_parameters(X): 
         """Pushes the values in the X input array into the corresponding 
         variables in the model.
@@ -93,6 +93,20 @@ _LEGAL_NAME = re.compile(r'^[a-zA-Z][_a-zA-Z0-9]*$')
 _IPV4_HOST = re.compile(r'[0-9]+\.[0-9]+\.[0-9]+\.[0-9]+$')
 
 
+def _normalize(value):
+    """ Return hashable equivalent of resource description `value`. """
+    if isinstance(value, dict):
+        return tuple(sorted([(key, _normalize(val))
+                             for key, val in value.items()]))
+    elif isinstance(value, (list, tuple)):
+        return tuple([_normalize(val) for val in value])
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
 class ResourceAllocationManager(object):
     """
     The allocation manager maintains a list of :class:`ResourceAllocator`
@@ -105,6 +119,19 @@ class ResourceAllocationManager(object):
     any other allocation routines, or set the ``OPENMDAO_RAMFILE`` environment
     variable to the path to be used (a null path is legal and avoids any
     additional configuration).
+
+    Normally a server is shut down when it is released. Servers may instead
+    be kept in a pool of idle servers (see :meth:`configure_pool`) and handed
+    back by :meth:`allocate` for the same resource description. This avoids
+    server startup overhead when servers are repeatedly allocated and
+    released, for example by a :class:`CaseIteratorDriver` within an
+    optimization loop. Note that a pooled server is not reset; any files or
+    objects left by a previous user remain.
+
+    Allocator time estimates are cached for a short time (see
+    :meth:`configure_estimates`), and allocators without a cached estimate
+    are queried concurrently. An allocator's cached estimates are discarded
+    when it deploys or releases a server.
     """
 
     _lock = threading.Lock()
@@ -116,6 +143,12 @@ class ResourceAllocationManager(object):
         self._allocations = 0
         self._allocators = []
         self._deployed_servers = {}
+        self._pool = []  # (release time, resource_desc, allocator, server, info)
+        self._pool_size = 0
+        self._pool_timeout = 60.
+        self._estimates = {}  # id(allocator) -> {desc: (time, estimate)}
+        self._estimate_ttl = 1.
+        self._estimate_stats = dict(calls=0, hits=0, queries=0, time=0.)
         self._allocators.append(LocalAllocator('LocalHost',
                                                authkey='PublicKey',
                                                allow_shell=True))
@@ -185,6 +218,115 @@ class ResourceAllocationManager(object):
                     allocator = cls(name)
                     allocator.configure(cfg)
                     self._allocators.append(allocator)
+        self._estimates = {}
+
+    @staticmethod
+    def configure_pool(max_size, idle_timeout=60.):
+        """
+        Configure pooling of released servers.
+
+        max_size: int
+            Maximum number of idle servers to keep. If zero (the default),
+            servers are shut down when released.
+
+        idle_timeout: float
+            Idle servers are shut down after this many seconds.
+        """
+        if max_size < 0:
+            raise ValueError('max_size must be >= 0')
+        if idle_timeout < 0:
+            raise ValueError('idle_timeout must be >= 0')
+        ram = ResourceAllocationManager._get_instance()
+        with ResourceAllocationManager._lock:
+            ram._pool_size = max_size
+            ram._pool_timeout = idle_timeout
+            expired = ram._expire_pool()
+        for entry in expired:
+            ram._shutdown(*entry[2:])
+
+    @staticmethod
+    def configure_estimates(ttl):
+        """
+        Configure caching of allocator time estimates.
+
+        ttl: float
+            Seconds a time estimate is reused for the same resource
+            description. If zero, allocators are queried for every request.
+            Estimates indicating no resource is available at this time are
+            never reused.
+        """
+        if ttl < 0:
+            raise ValueError('ttl must be >= 0')
+        ram = ResourceAllocationManager._get_instance()
+        with ResourceAllocationManager._lock:
+            ram._estimate_ttl = ttl
+            ram._estimates = {}
+
+    @staticmethod
+    def get_estimate_stats():
+        """
+        Returns a dictionary of time estimate statistics: number of estimate
+        requests (`calls`), estimates satisfied from the cache (`hits`),
+        allocator queries (`queries`), and total seconds spent estimating
+        (`time`).
+        """
+        ram = ResourceAllocationManager._get_instance()
+        with ResourceAllocationManager._lock:
+            return ram._estimate_stats.copy()
+
+    @staticmethod
+    def drain_pool():
+        """ Shut down all idle servers in the pool. """
+        ram = ResourceAllocationManager._get_instance()
+        with ResourceAllocationManager._lock:
+            pool = ram._pool
+            ram._pool = []
+        for entry in pool:
+            ram._shutdown(*entry[2:])
+
+    def _expire_pool(self):
+        """
+        Remove servers which have been idle too long or exceed the pool size,
+        returning the removed entries. Must be called with the lock held.
+        """
+        limit = time.time() - self._pool_timeout
+        expired = [entry for entry in self._pool if entry[0] <= limit]
+        pool = [entry for entry in self._pool if entry[0] > limit]
+        excess = len(pool) - self._pool_size
+        if excess > 0:
+            expired.extend(pool[:excess])  # Oldest first.
+            pool = pool[excess:]
+        self._pool = pool
+        return expired
+
+    def _get_pooled(self, resource_desc):
+        """
+        Returns ``(pooled, discard)``, where `pooled` is ``(server,
+        server-dict)`` for a healthy idle server which was allocated for
+        `resource_desc`, or None, and `discard` is a list of ``(allocator,
+        server, server-dict)`` for servers removed from the pool which
+        should be shut down. Must be called with the lock held.
+        """
+        discard = [entry[2:] for entry in self._expire_pool()]
+
+        for i in range(len(self._pool)-1, -1, -1):  # Most recent first.
+            released, desc, allocator, server, server_info = self._pool[i]
+            if desc != resource_desc:
+                continue
+            del self._pool[i]
+            try:
+                server.echo()
+            except Exception as exc:
+                self._logger.warning('discarding pooled %r: %r',
+                                     server_info['name'], exc)
+                discard.append((allocator, server, server_info))
+                continue
+            self._logger.info('reusing %r pid %d on %s', server_info['name'],
+                              server_info['pid'], server_info['host'])
+            self._deployed_servers[id(server)] = \
+                (allocator, server, server_info, desc)
+            return ((server, server_info), discard)
+        return (None, discard)
 
     @staticmethod
     def _get_instance():
@@ -211,6 +353,7 @@ class ResourceAllocationManager(object):
         ram = ResourceAllocationManager._get_instance()
         with ResourceAllocationManager._lock:
             ram._allocators.append(allocator)
+            ram._estimates = {}
 
     @staticmethod
     def insert_allocator(index, allocator):
@@ -226,6 +369,7 @@ class ResourceAllocationManager(object):
         ram = ResourceAllocationManager._get_instance()
         with ResourceAllocationManager._lock:
             ram._allocators.insert(index, allocator)
+            ram._estimates = {}
 
     @staticmethod
     def get_allocator(selector):
@@ -258,9 +402,11 @@ class ResourceAllocationManager(object):
             if isinstance(selector, basestring):
                 for i, allocator in enumerate(ram._allocators):
                     if allocator.name == selector:
+                        ram._estimates = {}
                         return ram._allocators.pop(i)
                 raise ValueError('allocator %r not found' % selector)
             else:
+                ram._estimates = {}
                 return ram._allocators.pop(selector)
 
     @staticmethod
@@ -312,11 +458,25 @@ class ResourceAllocationManager(object):
         """
         ResourceAllocationManager.validate_resources(resource_desc)
         ram = ResourceAllocationManager._get_instance()
+        discard = []
         with ResourceAllocationManager._lock:
-            return ram._allocate(resource_desc)
+            allocation = ram._allocate(resource_desc, discard)
+        # Shut down servers discarded from the pool without holding the lock.
+        for entry in discard:
+            ram._shutdown(*entry)
+        return allocation
+
+    def _allocate(self, resource_desc, discard):
+        """
+        Do the allocation. Servers removed from the pool are appended to
+        `discard` to be shut down after the lock is released.
+        """
+        if self._pool:
+            pooled, discarded = self._get_pooled(resource_desc)
+            discard.extend(discarded)
+            if pooled is not None:
+                return pooled
 
-    def _allocate(self, resource_desc):
-        """ Do the allocation. """
         deployment_retries = 0
         best_estimate = -1
         while best_estimate == -1:
@@ -328,6 +488,7 @@ class ResourceAllocationManager(object):
                 self._logger.debug('deploying on %r', best_allocator._name)
                 server = best_allocator.deploy(name, resource_desc,
                                                best_criteria)
+                self._estimates.pop(id(best_allocator), None)
                 if server is not None:
                     server_info = {
                         'name': name,
@@ -338,7 +499,8 @@ class ResourceAllocationManager(object):
                                       name, server_info['pid'],
                                       server_info['host'])
                     self._deployed_servers[id(server)] = \
-                        (best_allocator, server, server_info)
+                        (best_allocator, server, server_info,
+                         resource_desc.copy())
                     return (server, server_info)
                 # Difficult to generate deployable request that won't deploy...
                 else:  #pragma no cover
@@ -387,12 +549,13 @@ class ResourceAllocationManager(object):
 
     def _get_estimates(self, resource_desc, need_hostnames=False):
         """ Return best (estimate, criteria, allocator). """
+        start = time.time()
         best_estimate = -2
         best_criteria = None
         best_allocator = None
 
-        for allocator in self._allocators:
-            estimate, criteria = allocator.time_estimate(resource_desc)
+        estimates = self._query_estimates(resource_desc)
+        for allocator, (estimate, criteria) in zip(self._allocators, estimates):
             if estimate == -2:
                 key = criteria.keys()[0]
                 info = criteria[key]
@@ -415,8 +578,65 @@ class ResourceAllocationManager(object):
                     best_criteria = criteria
                     best_allocator = allocator
 
+        elapsed = time.time() - start
+        self._estimate_stats['calls'] += 1
+        self._estimate_stats['time'] += elapsed
+        self._logger.debug('estimates took %.3f sec', elapsed)
         return (best_estimate, best_criteria, best_allocator)
 
+    def _query_estimates(self, resource_desc):
+        """
+        Return list of ``(estimate, criteria)``, one per allocator.
+        Cached estimates are used where possible; the remaining allocators
+        are queried concurrently.
+        """
+        now = time.time()
+        key = _normalize(resource_desc)
+        estimates = [None] * len(self._allocators)
+        todo = []
+        for i, allocator in enumerate(self._allocators):
+            entry = self._estimates.get(id(allocator), {}).get(key)
+            if entry is not None and now - entry[0] < self._estimate_ttl:
+                estimates[i] = entry[1]
+                self._estimate_stats['hits'] += 1
+            else:
+                todo.append(i)
+
+        self._estimate_stats['queries'] += len(todo)
+        if len(todo) == 1:
+            i = todo[0]
+            estimates[i] = self._allocators[i].time_estimate(resource_desc)
+        elif todo:
+            credentials = get_credentials()
+            reply_q = Queue.Queue()
+            for i in todo:
+                worker_q = WorkerPool.get()
+                worker_q.put((self._get_estimate,
+                              (i, resource_desc, credentials), {}, reply_q))
+            error = None
+            for i in todo:
+                worker_q, retval, exc, trace = reply_q.get()
+                WorkerPool.release(worker_q)
+                if exc:
+                    self._logger.error(trace)
+                    error = error or exc
+                else:
+                    estimates[retval[0]] = retval[1]
+            if error is not None:
+                raise error
+
+        if self._estimate_ttl > 0:
+            for i in todo:
+                if estimates[i][0] != -1:
+                    self._estimates.setdefault(id(self._allocators[i]),
+                                               {})[key] = (now, estimates[i])
+        return estimates
+
+    def _get_estimate(self, index, resource_desc, credentials):
+        """ Get ``(index, (estimate, criteria))`` from an allocator. """
+        set_credentials(credentials)
+        return (index, self._allocators[index].time_estimate(resource_desc))
+
     @staticmethod
     def release(server):
         """
@@ -433,13 +653,30 @@ class ResourceAllocationManager(object):
         """ Release a server (proxy). """
         with ResourceAllocationManager._lock:
             try:
-                allocator, server, server_info = self._deployed_servers[id(server)]
+                allocator, server, server_info, resource_desc = \
+                    self._deployed_servers[id(server)]
             # Just being defensive.
             except KeyError:  #pragma no cover
                 self._logger.error('server %r not found', server)
                 return
             del self._deployed_servers[id(server)]
 
+            if self._pool_size > 0:
+                self._pool.append((time.time(), resource_desc,
+                                   allocator, server, server_info))
+                expired = self._expire_pool()
+            else:
+                expired = None
+
+        if expired is None:
+            self._shutdown(allocator, server, server_info)
+        else:
+            self._logger.debug('pooled %r', server_info['name'])
+            for entry in expired:
+                self._shutdown(*entry[2:])
+
+    def _shutdown(self, allocator, server, server_info):
+        """ Have `allocator` shut down `server`. """
         self._logger.info('release %r pid %d on %s', server_info['name'],
                           server_info['pid'], server_info['host'])
         try:
@@ -448,6 +685,7 @@ class ResourceAllocationManager(object):
         except Exception as exc:  #pragma no cover
             self._logger.error("Can't release %r: %r", server_info['name'], exc)
         server._close.cancel()
+        self._estimates.pop(id(allocator), None)
 
     @staticmethod
     def add_remotes(server, prefix=''):
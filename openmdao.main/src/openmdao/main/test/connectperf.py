@@ -0,0 +1,62 @@
+"""
+Measure time to transfer data over connections that convert units,
+evaluating the source with units and converting in the destination's
+validation, as done originally, and applying the conversion cached when
+the connection was made.
+"""
+
+import sys
+import time
+
+from openmdao.main.api import Assembly, Component, set_as_top
+from openmdao.main.numpy_fallback import array
+from openmdao.lib.datatypes.api import Array, Float
+
+
+class Source(Component):
+    """ Component with outputs in Celsius. """
+
+    x = Float(20., iotype='out', units='degC')
+    y = Array(array([20.]*1000), iotype='out', units='degC')
+
+
+class Target(Component):
+    """ Component with inputs in Fahrenheit. """
+
+    x = Float(0., iotype='in', units='degF')
+    y = Array(array([0.]*1000), iotype='in', units='degF')
+
+
+def time_transfer(mapper, src, dest, cached, reps):
+    """ Return seconds per transfer from `src` to `dest`. """
+    srcexpr = mapper.get_expr(src)
+    destexpr = mapper.get_expr(dest)
+    start = time.time()
+    for i in range(reps):
+        if cached:
+            mapper.transfer(srcexpr, destexpr)
+        else:
+            destexpr.set(srcexpr.evaluate(), src=src)
+    return (time.time() - start) / reps
+
+
+def main():
+    """ Report transfer times for a scalar and an array connection. """
+    reps = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    top = set_as_top(Assembly())
+    top.add('src', Source())
+    top.add('dest', Target())
+    top.connect('src.x', 'dest.x')
+    top.connect('src.y', 'dest.y')
+
+    print '%-12s %16s %12s %8s' % ('connection', 'original (us)', 'cached (us)',
+                                   'speedup')
+    for src, dest in (('src.x', 'dest.x'), ('src.y', 'dest.y')):
+        original = time_transfer(top._exprmapper, src, dest, False, reps)
+        cached = time_transfer(top._exprmapper, src, dest, True, reps)
+        print '%-12s %16.2f %12.2f %8.1f' \
+              % (src, original*1e6, cached*1e6, original/cached)
+
+
+if __name__ == '__main__':
+    main()
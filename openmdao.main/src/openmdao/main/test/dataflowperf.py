@@ -0,0 +1,66 @@
+"""
+Measure configuration time for large programmatically built assemblies.
+
+Each component is added to the assembly and the driver's workflow, then
+connected to a random earlier component. Optionally the execution order is
+requested after every change, as is done by interactive (GUI) sessions.
+"""
+
+import random
+import sys
+import time
+
+from openmdao.main.api import Assembly, Component, set_as_top
+from openmdao.lib.datatypes.api import Float
+
+
+class Node(Component):
+    """ Trivial component with one input and one output. """
+
+    x = Float(0., iotype='in')
+    y = Float(0., iotype='out')
+
+    def execute(self):
+        self.y = self.x + 1.
+
+
+def build(ncomps, query=False, seed=1):
+    """
+    Build an assembly with `ncomps` components. If `query`, the execution
+    order is obtained after each add and connect.
+    Returns (config_time, run_time).
+    """
+    rnd = random.Random(seed)
+    top = set_as_top(Assembly())
+    start = time.time()
+    for i in range(ncomps):
+        name = 'c%d' % i
+        top.add(name, Node())
+        top.driver.workflow.add(name)
+        if i and rnd.random() < 0.8:
+            top.connect('c%d.y' % rnd.randrange(i), '%s.x' % name)
+        if query:
+            list(top.driver.workflow)
+    list(top.driver.workflow)
+    config_time = time.time() - start
+
+    start = time.time()
+    top.run()
+    run_time = time.time() - start
+    return (config_time, run_time)
+
+
+def main():
+    """ Report configuration and run times for various assembly sizes. """
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 250, 500, 1000]
+    print '%8s %12s %12s %12s' % ('ncomps', 'config', 'config+query', 'run')
+    for ncomps in sizes:
+        config_time, run_time = build(ncomps)
+        query_time, run_time = build(ncomps, query=True)
+        print '%8d %12.3f %12.3f %12.3f' \
+              % (ncomps, config_time, query_time, run_time)
+
+
+if __name__ == '__main__':
+    main()
+
@@ -0,0 +1,62 @@
+"""
+Measure ExprEvaluator evaluation time with and without compiled variable
+references, for scalar and indexed array expressions.
+"""
+
+import sys
+import time
+
+from openmdao.main.api import Assembly, Component, set_as_top
+from openmdao.main.expreval import ExprEvaluator
+from openmdao.main.numpy_fallback import array
+from openmdao.lib.datatypes.api import Array, Float
+
+
+class Node(Component):
+    """ Component with scalar and array variables. """
+
+    x = Float(1., iotype='in')
+    y = Float(2., iotype='out')
+    z = Array(array([1., 2., 3., 4.]), iotype='out')
+
+
+EXPRESSIONS = [
+    'comp.x',
+    'comp.x*comp.y+1.',
+    'comp.z[2]',
+    'sin(comp.x)+comp.z[1]*comp.z[3]',
+    'sub.comp.x-sub.comp.z[0]',
+]
+
+
+def time_expr(text, scope, compiled, reps):
+    """ Return seconds per evaluation of `text` in `scope`. """
+    expr = ExprEvaluator(text, scope)
+    expr.compiled = compiled
+    expr.evaluate()  # Parse (and compile) outside the timing loop.
+    start = time.time()
+    for i in range(reps):
+        expr.evaluate()
+    return (time.time() - start) / reps
+
+
+def main():
+    """ Report evaluation times for each expression. """
+    reps = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    top = set_as_top(Assembly())
+    top.add('comp', Node())
+    top.add('sub', Assembly())
+    top.sub.add('comp', Node())
+
+    print '%-36s %12s %14s %8s' % ('expression', 'get (us)', 'compiled (us)',
+                                   'speedup')
+    for text in EXPRESSIONS:
+        normal = time_expr(text, top, False, reps)
+        compiled = time_expr(text, top, True, reps)
+        print '%-36s %12.2f %14.2f %8.1f' \
+              % (text, normal*1e6, compiled*1e6, normal/compiled)
+
+
+if __name__ == '__main__':
+    main()
+
@@ -8,7 +8,7 @@
 
 import unittest
 from openmdao.main.api import Assembly, Component, set_as_top
-from openmdao.lib.datatypes.api import Float, Int, Str, Bool
+from openmdao.lib.datatypes.api import Array, Float, Int, Str, Bool
 
 
 class Oneout(Component):
@@ -98,6 +98,19 @@ class Oneinp(Component):
         # print '%s.execute(degK' % self.get_pathname()
 
 
+class ArrayOut(Component):
+    """ A simple array output component    """
+
+    temps = Array([0., 100.], iotype='out', units='degC')
+    
+
+class ArrayInp(Component):
+    """ A simple array input component    """
+
+    temps = Array([0., 0.], iotype='in', units='degF')
+    temp = Float(0., iotype='in', units='degR')
+    
+
 class VariableTestCase(unittest.TestCase):
 
     def setUp(self):
@@ -176,6 +189,38 @@ class VariableTestCase(unittest.TestCase):
         else:
             self.fail('Exception Expected')
 
+    def test_cached_conversion(self):
+        self.top.connect('oneout.ratio5','oneinp.ratio10')      # temp C to K
+        self.top.connect('oneout.ratio1','oneinp.ratio2')       # Pa  to atm
+        self.top.connect('oneout.ratio9','oneinp.ratio16')      # no units to dyn
+        
+        graph = self.top._exprmapper._exprgraph
+        getexpr, scale, offset = graph['oneout.ratio5']['oneinp.ratio10']['conversion']
+        self.assertEqual((scale, offset), (1.0, 273.15))
+        self.assertEqual(graph['oneout.ratio9']['oneinp.ratio16']['conversion'], None)
+        
+        self.top.oneout.ratio5 = 20.
+        self.top.run()
+        self.assertAlmostEqual(293.15, self.top.oneinp.ratio10, 10)
+        self.assertAlmostEqual(9.86923266716e-06, self.top.oneinp.ratio2, 6)
+        self.assertEqual(1.0, self.top.oneinp.ratio16)
+        
+    def test_array_conversion(self):
+        self.top.add('arrout', ArrayOut())
+        self.top.add('arrinp', ArrayInp())
+        self.top.driver.workflow.add(['arrout', 'arrinp'])
+        self.top.connect('arrout.temps', 'arrinp.temps')
+        self.top.connect('arrout.temps[1]', 'arrinp.temp')
+        
+        self.top.run()
+        
+        self.assertAlmostEqual(32., self.top.arrinp.temps[0], 10)
+        self.assertAlmostEqual(212., self.top.arrinp.temps[1], 10)
+        self.assertAlmostEqual(671.67, self.top.arrinp.temp, 10)
+        
+        # Source is not modified.
+        self.assertEqual([0., 100.], list(self.top.arrout.temps))
+
 #   def test_unit3(self):
 #       self.top.oneout.ratio9 = 20
 #       try:
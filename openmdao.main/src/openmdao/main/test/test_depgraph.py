@@ -213,6 +213,28 @@ class DepGraphTestCase(unittest.TestCase):
         self.assertEqual(set(link.get_dests('c')), set(['a']))
         self.assertEqual(link.get_dests('foo'), [])
         
+    def test_edges_added_since(self):
+        pos = self.dep.get_log_position()
+        self.assertEqual(self.dep.edges_added_since(pos), [])
+        self.dep.connect('B.d', 'C.b')
+        self.dep.connect('B.c', 'C.a')  # Existing edge.
+        self.dep.connect('A.d', 'C.a2')
+        self.assertEqual(self.dep.edges_added_since(pos),
+                         [('B', 'C'), ('A', 'C')])
+        pos = self.dep.get_log_position()
+        self.dep.disconnect('A.d', 'C.a2')
+        self.assertEqual(self.dep.edges_added_since(pos), None)
+
+    def test_cycle(self):
+        self.dep.connect('B.d', 'C.b')
+        try:
+            self.dep.connect('D.c', 'A.a')
+        except RuntimeError as err:
+            self.assertTrue('circular dependency' in str(err))
+        else:
+            self.fail('Expected RuntimeError')
+        self.assertEqual(self.dep.get_link('D', 'A'), None)
+
     def test_find_all_connecting(self):
         dep = DependencyGraph()
         for node in ['A','B','C','D','E','F']:
@@ -7,7 +7,9 @@ import unittest
 # pylint: disable-msg=E0611,F0401
 from openmdao.main.api import Component, Assembly, ComponentWithDerivatives, \
                               SequentialWorkflow, DriverUsesDerivatives, set_as_top
-from openmdao.lib.datatypes.api import Float, Int
+from numpy import array, zeros
+
+from openmdao.lib.datatypes.api import Array, Float, Int
 from openmdao.util.testutil import assert_rel_error
 from openmdao.main.hasparameters import HasParameters
 from openmdao.main.hasobjective import HasObjective
@@ -71,6 +73,43 @@ class Paraboloid_Derivative(ComponentWithDerivatives):
         self.derivatives.set_second_derivative('f_xy', 'x', 'y', df_dxdy)
         self.derivatives.set_second_derivative('f_xy', 'y', 'y', df_dydy)
 
+class ArrayComp(ComponentWithDerivatives):
+    """ Evaluates the equations y = A*x, f = sum(x) + z """
+    
+    # pylint: disable-msg=E1101
+    x = Array(zeros(2), iotype='in')
+    z = Float(0.0, iotype='in')
+    y = Array(zeros(3), iotype='out')
+    f = Float(0.0, iotype='out')
+    
+    A = array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]])
+    
+    def __init__(self):
+        """ declare what derivatives that we can provide"""
+        
+        super(ArrayComp, self).__init__()
+
+        self.derivatives.declare_first_derivative('y', 'x')
+        self.derivatives.declare_first_derivative('f', 'x')
+        self.derivatives.declare_first_derivative('f', 'z')
+        
+        self.ran_real = False
+        
+    def execute(self):
+        """ Executes it """
+        
+        self.y = self.A.dot(self.x)
+        self.f = sum(self.x) + self.z
+        
+        self.ran_real = True
+        
+    def calculate_first_derivatives(self):
+        """Analytical first derivatives"""
+        
+        self.derivatives.set_first_derivative('y', 'x', self.A)
+        self.derivatives.set_first_derivative('f', 'x', array([[1.0, 1.0]]))
+        self.derivatives.set_first_derivative('f', 'z', 1.0)
+        
 class SimpleAssembly(Assembly):
     """ Simple assembly"""
     
@@ -316,7 +355,7 @@ class DerivativesTestCase(unittest.TestCase):
             self.comp.derivatives.declare_first_derivative('f_xy', 'zint')
         except RuntimeError, err:
             msg = 'At present, derivatives can only be declared for float-' + \
-                  'valued variables. Variable zint ' + \
+                  'valued variables and float arrays. Variable zint ' + \
                   "is of type <type 'str'>."
             self.assertEqual(err[0], msg)
         else:
@@ -375,6 +414,47 @@ class DerivativesTestCase(unittest.TestCase):
         else:
             self.fail('KeyError expected')
             
+    def test_array_first_derivative(self):
+        
+        comp = ArrayComp()
+        comp.x = array([1.0, 2.0])
+        comp.z = 3.0
+        comp.run()
+        comp.ran_real = False
+        
+        comp.calc_derivatives(first=True)
+        
+        comp.x = array([2.0, 4.0])
+        comp.z = 5.0
+        comp.run(ffd_order=1)
+        
+        # Linear, so FFD matches exactly
+        self.assertEqual(list(comp.y), [10.0, 22.0, 34.0])
+        self.assertEqual(comp.f, 11.0)
+        self.assertEqual(comp.ran_real, False)
+        
+        # Baseline is not modified by FFD runs
+        self.assertEqual(list(comp.derivatives.outputs['y']), 
+                         [5.0, 11.0, 17.0])
+        
+        try:
+            comp.derivatives.set_first_derivative('y', 'x', zeros((2, 3)))
+        except ValueError, err:
+            msg = "Derivative of y with repect to x must have shape (3, 2)."
+            self.assertEqual(str(err), msg)
+        else:
+            self.fail('ValueError expected')
+            
+        try:
+            comp.derivatives.declare_second_derivative('y', 'x', 'x')
+        except RuntimeError, err:
+            msg = 'At present, second derivatives can only be declared ' + \
+                  'for float-valued variables. Variable x ' + \
+                  "is of type <type 'str'>."
+            self.assertEqual(err[0], msg)
+        else:
+            self.fail('RuntimeError expected')
+            
     def test_unsupported_order(self):
         
         self.comp.calc_derivatives(first=True, second=False)
@@ -0,0 +1,107 @@
+# pylint: disable-msg=C0111,C0103
+
+import os
+import tempfile
+import unittest
+
+from openmdao.main.api import Assembly, Driver, set_as_top
+from openmdao.main.evalcache import EvaluationCache
+from openmdao.main.hasconstraints import HasConstraints
+from openmdao.main.hasobjective import HasObjective
+from openmdao.main.hasparameters import HasParameters
+from openmdao.util.decorators import add_delegate
+from openmdao.test.execcomp import ExecComp
+
+
+@add_delegate(HasParameters, HasObjective, HasConstraints)
+class PointsDriver(Driver):
+    """ Evaluates objective and constraints at each of `points`. """
+
+    def __init__(self, points):
+        super(PointsDriver, self).__init__()
+        self.points = points
+        self.results = []
+
+    def execute(self):
+        self.results = []
+        for point in self.points:
+            self.set_parameters(point)
+            self.run_iteration()
+            self.results.append((self.eval_objective(),
+                                 [con[0] for con in
+                                  self.eval_ineq_constraints()]))
+
+
+class EvaluationCacheTestCase(unittest.TestCase):
+
+    def test_lru(self):
+        cache = EvaluationCache(maxsize=2)
+        cache.put(cache.make_key([1.]), 'a')
+        cache.put(cache.make_key([2.]), 'b')
+        self.assertEqual(cache.get(cache.make_key([1.])), 'a')
+        cache.put(cache.make_key([3.]), 'c')
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(cache.make_key([2.])), None)
+        self.assertEqual(cache.get(cache.make_key([1.])), 'a')
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_key(self):
+        cache = EvaluationCache()
+        self.assertEqual(cache.make_key([1, [2., 3.]], 'x'), ('x', 1., 2., 3.))
+        self.assertNotEqual(cache.make_key([1.]), cache.make_key([1.+1e-12]))
+        cache = EvaluationCache(tolerance=1e-6)
+        self.assertEqual(cache.make_key([1.]), cache.make_key([1.+1e-12]))
+        self.assertNotEqual(cache.make_key([1.]), cache.make_key([1.1]))
+
+    def test_persist(self):
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+        os.remove(filename)
+        try:
+            cache = EvaluationCache(filename=filename)
+            cache.put(cache.make_key([1.]), 'a')
+            cache.save()
+            cache = EvaluationCache(filename=filename)
+            self.assertEqual(cache.get(cache.make_key([1.])), 'a')
+            try:
+                EvaluationCache(tolerance=0.1, filename=filename)
+            except ValueError as exc:
+                self.assertTrue('cache tolerance' in str(exc))
+            else:
+                self.fail('ValueError expected')
+        finally:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def test_driver(self):
+        top = set_as_top(Assembly())
+        top.add('comp', ExecComp(exprs=['y=x*x', 'z=x+1']))
+        points = [[1.], [2.], [1.], [3.], [2.]]
+        top.add('driver', PointsDriver(points))
+        top.driver.workflow.add('comp')
+        top.driver.add_parameter('comp.x', low=-10., high=10.)
+        top.driver.add_objective('comp.y')
+        top.driver.add_constraint('comp.z < 5')
+
+        top.run()
+        expected = top.driver.results
+        self.assertEqual(top.comp.exec_count, 5)
+
+        top.driver.eval_cache = EvaluationCache()
+        top.run()
+        self.assertEqual(top.driver.results, expected)
+        self.assertEqual((top.driver.eval_cache.hits,
+                          top.driver.eval_cache.misses), (2, 3))
+        # The last point was a hit, so the model is run once more to leave
+        # it at that point.
+        self.assertEqual(top.comp.exec_count, 9)
+        self.assertEqual((top.comp.x, top.comp.y), (2., 4.))
+
+        # Changing the configuration doesn't use previous entries.
+        top.driver.clear_constraints()
+        top.run()
+        self.assertEqual(top.comp.exec_count, 13)
+
+
+if __name__ == '__main__':
+    unittest.main()
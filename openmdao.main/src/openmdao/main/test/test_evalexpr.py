@@ -347,6 +347,35 @@ class ExprEvalTestCase(unittest.TestCase):
         ex.text = 'a1d[:2]'
         self.assertTrue(all(array([1.,2.]) == ex.evaluate()))
 
+    def test_compiled(self):
+        self.top.comp.cont = A()
+        self.top.comp.cont.f = 2.5
+        for text in ['comp.x*2+a.f', 'sin(comp.x)+a.a1d[3]', 'a.a1d[1::2]',
+                     'a.a2d[1][int(a.f)]', 'comp.cont.f-1', 'comp.x > comp.y',
+                     'a.some_funct(1, 2)', 'a.some_prop']:
+            ex = ExprEvaluator(text, self.top)
+            ex.compiled = False
+            expected = ex.evaluate()
+            ex = ExprEvaluator(text, self.top)
+            self.assertTrue(all(array(expected) == array(ex.evaluate())))
+
+        # Compiled references are updated when the configuration changes.
+        ex = ExprEvaluator('comp.x+1', self.top)
+        assert_rel_error(self, ex.evaluate(), 4.14, 0.00001)
+        self.top.add('comp', Comp())
+        self.top.comp.x = 1.
+        self.assertEqual(ex.evaluate(), 2.)
+
+        ex = ExprEvaluator('comp.bogus+1', self.top)
+        try:
+            ex.evaluate()
+        except AttributeError as err:
+            self.assertTrue(str(err).startswith(
+                "can't evaluate expression 'comp.bogus+1':"))
+            self.assertTrue("'bogus'" in str(err))
+        else:
+            self.fail('AttributeError expected')
+
     def test_boolean(self):
         comp = self.top.comp
         comp.x = 1.
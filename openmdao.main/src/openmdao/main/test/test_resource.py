@@ -523,6 +523,83 @@ max_load: 100
                       globals(), locals(), ValueError,
                       "BadLoad: max_load must be > 0, got -2")
 
+    def test_estimates(self):
+        logging.debug('')
+        logging.debug('test_estimates')
+
+        assert_raises(self, "RAM.configure_estimates(-1)",
+                      globals(), locals(), ValueError, 'ttl must be >= 0')
+
+        RAM.configure_estimates(60)
+        try:
+            stats = RAM.get_estimate_stats()
+            RAM.get_hostnames({'min_cpus': 1})
+            RAM.get_hostnames({'min_cpus': 1})
+            new_stats = RAM.get_estimate_stats()
+            self.assertEqual(new_stats['calls'], stats['calls'] + 2)
+            self.assertEqual(new_stats['queries'], stats['queries'] + 1)
+            self.assertEqual(new_stats['hits'], stats['hits'] + 1)
+            self.assertTrue(new_stats['time'] >= stats['time'])
+
+            # Different description isn't cached.
+            RAM.get_hostnames({'min_cpus': 2})
+            stats = RAM.get_estimate_stats()
+            self.assertEqual(stats['queries'], new_stats['queries'] + 1)
+
+            # Deploying invalidates the allocator's estimates.
+            server, server_info = RAM.allocate({'min_cpus': 1})
+            RAM.get_hostnames({'min_cpus': 1})
+            new_stats = RAM.get_estimate_stats()
+            self.assertEqual(new_stats['queries'], stats['queries'] + 2)
+            RAM.release(server)
+
+            RAM.configure_estimates(0)
+            RAM.get_hostnames({'min_cpus': 1})
+            RAM.get_hostnames({'min_cpus': 1})
+            stats = RAM.get_estimate_stats()
+            self.assertEqual(stats['hits'], new_stats['hits'])
+        finally:
+            RAM.configure_estimates(1)
+
+    def test_pool(self):
+        logging.debug('')
+        logging.debug('test_pool')
+
+        assert_raises(self, "RAM.configure_pool(-1)",
+                      globals(), locals(), ValueError, 'max_size must be >= 0')
+
+        RAM.configure_pool(1)
+        try:
+            server, server_info = RAM.allocate({'allocator': 'LocalHost'})
+            pid = server_info['pid']
+            RAM.release(server)
+
+            # Same description gets the pooled server.
+            server, server_info = RAM.allocate({'allocator': 'LocalHost'})
+            self.assertEqual(server_info['pid'], pid)
+            self.assertEqual(server.echo(42), (42,))
+
+            # Different description gets a new server.
+            server2, server_info2 = RAM.allocate({'allocator': 'LocalHost',
+                                                  'min_cpus': 1})
+            self.assertNotEqual(server_info2['pid'], pid)
+
+            # Pool size is limited, oldest idle server is shut down.
+            RAM.release(server)
+            RAM.release(server2)
+            server, server_info = RAM.allocate({'allocator': 'LocalHost'})
+            self.assertNotEqual(server_info['pid'], pid)
+            RAM.release(server)
+
+            # Idle servers are shut down after timeout.
+            RAM.configure_pool(1, idle_timeout=0)
+            server, server_info2 = RAM.allocate({'allocator': 'LocalHost'})
+            self.assertNotEqual(server_info2['pid'], server_info['pid'])
+            RAM.release(server)
+        finally:
+            RAM.drain_pool()
+            RAM.configure_pool(0)
+
     def test_base(self):
         logging.debug('')
         logging.debug('test_base')
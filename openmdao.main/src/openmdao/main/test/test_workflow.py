@@ -223,6 +223,36 @@ class TestCase(unittest.TestCase):
         else:
             self.fail('Expected AttributeError')
 
+    def test_order_updates(self):
+        # Execution order is maintained as components are added & connected.
+        def names():
+            return [comp.name for comp in self.model.driver.workflow]
+
+        self.assertEqual(names(), ['comp_a', 'comp_b', 'comp_c'])
+        self.model.add('comp_d', TestComponent())
+        self.model.add('comp_e', TestComponent())
+        self.model.driver.workflow.add(['comp_d', 'comp_e'])
+        self.assertEqual(names(), ['comp_a', 'comp_b', 'comp_c',
+                                   'comp_d', 'comp_e'])
+        self.model.connect('comp_c.total_executions', 'comp_e.dummy_input')
+        self.assertEqual(names(), ['comp_a', 'comp_b', 'comp_c',
+                                   'comp_d', 'comp_e'])
+        self.model.connect('comp_d.total_executions', 'comp_a.dummy_input')
+        self.assertEqual(names(), ['comp_d', 'comp_a', 'comp_b',
+                                   'comp_c', 'comp_e'])
+        self.model.disconnect('comp_d.total_executions', 'comp_a.dummy_input')
+        self.assertEqual(names(), ['comp_a', 'comp_b', 'comp_c',
+                                   'comp_d', 'comp_e'])
+        self.model.driver.workflow.remove('comp_b')
+        self.assertEqual(names(), ['comp_a', 'comp_c', 'comp_d', 'comp_e'])
+
+        try:
+            self.model.connect('comp_e.total_executions', 'comp_a.dummy_input')
+        except RuntimeError as err:
+            self.assertTrue('circular dependency' in str(err))
+        else:
+            self.fail('Expected RuntimeError')
+
 
 if __name__ == '__main__':
     import nose
@@ -0,0 +1,53 @@
+"""
+Measure time to import the default units library by parsing the library
+file, as done originally, and by loading its precompiled form. The time
+to import the units module in a fresh interpreter is also reported.
+"""
+
+import subprocess
+import sys
+import time
+from cStringIO import StringIO
+
+import openmdao.units as units
+from openmdao.units.units import _DEFAULT_LIB
+
+
+def time_load(precompiled, reps):
+    """ Return seconds per import of the default library. """
+    with open(_DEFAULT_LIB, 'rb') as inp:
+        source = inp.read()
+    units.import_default_library()  # Make sure it's precompiled.
+    start = time.time()
+    for i in range(reps):
+        if precompiled:
+            units.import_default_library()
+        else:
+            units.import_library(StringIO(source))
+    return (time.time() - start) / reps
+
+
+def time_module_import(reps):
+    """ Return the best time of `reps` imports in a new interpreter. """
+    code = 'import time; start = time.time(); ' \
+           'import openmdao.units; print time.time() - start'
+    return min([float(subprocess.check_output([sys.executable, '-c', code]))
+                for i in range(reps)])
+
+
+def main():
+    """ Report library import times and module import time. """
+    reps = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    original = time_load(False, reps)
+    precompiled = time_load(True, reps)
+    print '%-16s %14s %16s %8s' % ('library', 'original (ms)',
+                                   'precompiled (ms)', 'speedup')
+    print '%-16s %14.2f %16.2f %8.1f' \
+          % ('unitLibdefault', original*1e3, precompiled*1e3,
+             original/precompiled)
+    print
+    print 'import openmdao.units: %.2f ms' % (time_module_import(5)*1e3)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,9 @@ import openmdao.units as units
 import unittest
 import math
 import cStringIO
+import os
+import shutil
+import tempfile
 
 from pkg_resources import resource_string, resource_stream
 
@@ -75,6 +78,58 @@ fortnight: 14*d, Two weeks
                                units.PhysicalQuantity(
                                '6012.884753furlong/fortnight').value, places=5)
 
+    def test_unit_expressions(self):
+        x = units.PhysicalQuantity('1 (km/h)**2')
+        self.assertAlmostEqual(x.unit.factor, (1000./3600.)**2, 10)
+        self.assertEqual(x.unit.powers, _get_powers(length=2, time=-2))
+        x = units.PhysicalQuantity('1 kg*m**-2/s')
+        self.assertEqual(x.unit.powers, _get_powers(mass=1, length=-2,
+                                                    time=-1))
+        
+        for expr in ('m/', 'm*(s', '2m', 'm % s'):
+            self.assertRaises(SyntaxError, units.PhysicalQuantity, 1., expr)
+        
+        # Definitions may use pi, but unknown names are reported so
+        # definitions can be retried once the names are defined.
+        units.add_unit('halfturn', 'pi*rad')
+        self.assertAlmostEqual(units.convert_units(1., 'halfturn', 'deg'),
+                               180., 10)
+        self.assertRaises(NameError, units.add_unit, 'spam', '2*eggs')
+        
+    def test_compile_library(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            libfile = os.path.join(tmpdir, 'unitLib.ini')
+            with open(libfile, 'w') as out:
+                out.write(resource_string(units.__name__, 
+                                          'unitLibdefault.ini'))
+                out.write('furlong: 201.168*m, Horse racing\n')
+            units.compile_library(libfile)
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, 
+                                                        'unitLib.dat')))
+            
+            x = units.PhysicalQuantity('1m/s')
+            x.convert_to_unit('furlong/h')
+            self.assertAlmostEqual(x.value, 3600./201.168, 10)
+        finally:
+            shutil.rmtree(tmpdir)
+        
+        # The precompiled default library matches the library file.
+        default = dict([(name, (unit.names, unit.factor, unit.powers, 
+                                unit.offset))
+                        for name, unit in units.import_library(
+                            resource_stream(units.__name__, 
+                                            'unitLibdefault.ini')
+                            ).unit_table.items()])
+        for i in range(2):  # The first import may precompile.
+            lib = units.import_default_library()
+            self.assertEqual(default, 
+                             dict([(name, (unit.names, unit.factor,
+                                           unit.powers, unit.offset))
+                                   for name, unit in lib.unit_table.items()]))
+        # Units defined as another unit are still the same object.
+        self.assertTrue(lib.unit_table['degK'] is lib.unit_table['K'])
+
 
 class test_NumberDict(unittest.TestCase):
 
@@ -788,6 +843,17 @@ class test__PhysicalUnit(unittest.TestCase):
 
 
 class test__moduleFunctions(unittest.TestCase):
+    def test_get_conversion_tuple(self):
+        scale, offset = units.get_conversion_tuple('degC', 'degF')
+        self.assertAlmostEqual(100.*scale + offset, 212., 10)
+        self.assertAlmostEqual(-40.*scale + offset, -40., 10)
+        
+        scale, offset = units.get_conversion_tuple('ft', 'inch')
+        self.assertAlmostEqual(scale, 12., 10)
+        self.assertEqual(offset, 0.)
+        
+        self.assertRaises(TypeError, units.get_conversion_tuple, 'ft', 'kg')
+        
     def test_add_unit(self):
         try:
             units.add_unit('ft','20*m')
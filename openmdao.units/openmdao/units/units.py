@@ -18,14 +18,13 @@ Justin Gray."""
 
 import re, ConfigParser
 import os.path
+import marshal
+import zlib
+from cStringIO import StringIO
 
 from math import sin, cos, tan, floor, pi
 
 # pylint: disable-msg=E0611,F0401, E1101
-try: 
-    from pkg_resources import resource_stream
-except ImportError: 
-    pass
 
 #Class definitions
 
@@ -539,6 +538,152 @@ class PhysicalUnit(object):
 
 _UNIT_CACHE = {}
 
+# A unit expression is made of numbers, names, parentheses and the
+# operators *, /, ** and unary - or +.
+_UNIT_TOKEN = re.compile(r'''\s*(?:
+    (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?) |
+    (?P<name>[A-Za-z_]\w*) |
+    (?P<op>\*\*|[-+*/()])
+    )''', re.VERBOSE)
+
+
+class _UnitExpression(object):
+    """
+    Evaluates a unit expression such as ``kg*m/s**2`` without using eval.
+    The operators have the same precedence and associativity as in Python,
+    and each name is resolved by calling `lookup`.
+    """
+
+    def __init__(self, text, lookup):
+        self.text = text
+        self.lookup = lookup
+        self.tokens = []
+        pos = 0
+        end = len(text.rstrip())
+        while pos < end:
+            match = _UNIT_TOKEN.match(text, pos)
+            if match is None:
+                self._error()
+            kind = match.lastgroup
+            token = match.group(kind)
+            if kind == 'number':
+                if token.isdigit():
+                    token = int(token)
+                else:
+                    token = float(token)
+            self.tokens.append((kind, token))
+            pos = match.end()
+        self.tokens.append((None, None))
+        self.pos = 0
+
+    def _error(self):
+        """Raise a SyntaxError for this expression."""
+        raise SyntaxError("invalid unit expression '%s'" % self.text)
+
+    def _next(self):
+        """Return the current token and advance to the next one."""
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def _accept(self, *ops):
+        """Consume and return the current operator if it is one of `ops`."""
+        kind, token = self.tokens[self.pos]
+        if kind == 'op' and token in ops:
+            self.pos += 1
+            return token
+        return None
+
+    def evaluate(self):
+        """Return the value of the whole expression."""
+        value = self._sum()
+        if self.tokens[self.pos][0] is not None:
+            self._error()
+        return value
+
+    def _sum(self):
+        """sum: product (('+' | '-') product)*"""
+        value = self._product()
+        while True:
+            op = self._accept('+', '-')
+            if op == '+':
+                value = value + self._product()
+            elif op == '-':
+                value = value - self._product()
+            else:
+                return value
+
+    def _product(self):
+        """product: unary (('*' | '/') unary)*"""
+        value = self._unary()
+        while True:
+            op = self._accept('*', '/')
+            if op == '*':
+                value = value * self._unary()
+            elif op == '/':
+                value = value / self._unary()
+            else:
+                return value
+
+    def _unary(self):
+        """unary: ('-' | '+') unary | power"""
+        op = self._accept('-', '+')
+        if op == '-':
+            return -self._unary()
+        elif op == '+':
+            return +self._unary()
+        return self._power()
+
+    def _power(self):
+        """power: atom ['**' unary]"""
+        value = self._atom()
+        if self._accept('**'):
+            value = value ** self._unary()
+        return value
+
+    def _atom(self):
+        """atom: number | name | '(' sum ')'"""
+        kind, token = self._next()
+        if kind == 'number':
+            return token
+        elif kind == 'name':
+            return self.lookup(token)
+        elif kind == 'op' and token == '(':
+            value = self._sum()
+            if not self._accept(')'):
+                self._error()
+            return value
+        self._error()
+
+
+def _find_prefixed_unit(name):
+    """Return the unit called `name`. If it isn't in the unit_table but is
+    a known unit with a one or two letter prefix, it is added first."""
+    try:
+        return _UNIT_LIB.unit_table[name]
+    except KeyError:
+        pass
+    
+    for i in (1, 2):
+        prefix, base = name[:i], name[i:]
+        if prefix in _UNIT_LIB.prefixes and base in _UNIT_LIB.unit_table:
+            add_unit(name, _UNIT_LIB.prefixes[prefix]* \
+                           _UNIT_LIB.unit_table[base])
+            return _UNIT_LIB.unit_table[name]
+    
+    raise ValueError("no unit named '%s' is defined" % name)
+
+
+def _find_defined_unit(name):
+    """Return the unit or constant called `name` for a unit definition."""
+    try:
+        return _UNIT_LIB.unit_table[name]
+    except KeyError:
+        if name == 'pi':
+            return pi
+        raise NameError("name '%s' is not defined" % name)
+
+
 def _find_unit(unit):
     """Find unit helper function."""
     if isinstance(unit, str):
@@ -546,43 +691,9 @@ def _find_unit(unit):
         try:
             unit = _UNIT_CACHE[name]
         except KeyError:
-            try: 
-                unit = eval(name, {'__builtins__':None}, _UNIT_LIB.unit_table)
-            except Exception: 
-                
-                # This unit might include prefixed units that aren't in the
-                # unit_table. We must parse them ALL and add them to the
-                # unit_table.
-                
-                # First character of a unit is always alphabet or $.
-                # Remaining characters may include numbers.
-                regex = re.compile('[A-Z,a-z]{1}[A-Z,a-z,0-9]*')
-                
-                for item in regex.findall(name):
-                    #check if this was a compound unit, so each substring might
-                    # be a unit
-                    try: 
-                        eval(item, {'__builtins__':None}, _UNIT_LIB.unit_table)
-                    except Exception: #maybe is a prefixed unit then
-                        #check for single letter prefix before unit
-                        if(item[0] in _UNIT_LIB.prefixes and \
-                           item[1:] in _UNIT_LIB.unit_table):
-                            add_unit(item, _UNIT_LIB.prefixes[item[0]]* \
-                                     _UNIT_LIB.unit_table[item[1:]])
-                        
-                        #check for double letter prefix before unit
-                        elif(item[0:2] in _UNIT_LIB.prefixes and \
-                             item[2:] in _UNIT_LIB.unit_table):
-                            add_unit(item, _UNIT_LIB.prefixes[item[0:2]]* \
-                                      _UNIT_LIB.unit_table[item[2:]])
-                        
-                        #no prefixes found, unknown unit
-                        else:
-                            raise ValueError("no unit named '%s' is defined"
-                                             % item)
-            
-                unit = eval(name, {'__builtins__':None}, _UNIT_LIB.unit_table)
-        
+            # Prefixed units that aren't in the unit_table yet are added
+            # as they are found.
+            unit = _UnitExpression(name, _find_prefixed_unit).evaluate()
             _UNIT_CACHE[name] = unit
 
     if not isinstance(unit, PhysicalUnit):
@@ -620,8 +731,7 @@ def add_unit(name, unit, comment=''):
     if comment:
         _UNIT_LIB.help.append((name, comment, unit))
     if isinstance(unit, str):
-        unit = eval(unit, {'__builtins__':None, 'pi':pi},
-                           _UNIT_LIB.unit_table)
+        unit = _UnitExpression(unit, _find_defined_unit).evaluate()
     unit.set_name(name)
     if name in _UNIT_LIB.unit_table:
         if (_UNIT_LIB.unit_table[name].factor!=unit.factor or \
@@ -763,12 +873,147 @@ def convert_units(value, units, convunits):
     pq = PhysicalQuantity(value, units)
     pq.convert_to_unit(convunits)
     return pq.value
+
+def get_conversion_tuple(units, convunits):
+    """Return the (scale, offset) pair that converts a value given in
+    units to convunits as value*scale + offset. Raises TypeError if
+    the units are not compatible.
+    """
+    factor, offset = _find_unit(units).conversion_tuple_to(_find_unit(convunits))
+    return (factor, offset*factor)
     
 
-try:
-    default_lib = resource_stream(__name__, 'unitLibdefault.ini')
-except NameError: #pck_resources was not imported, try __file__
-    default_lib = open(os.path.join(os.path.dirname(__file__), 
-                                   'unitLibDefault.ini'))
-import_library(default_lib)
+
+# The default library is also kept in precompiled form, so that importing
+# this module doesn't have to parse and evaluate every unit definition.
+_DEFAULT_LIB = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'unitLibdefault.ini')
+_COMPILED_VERSION = 1
+
+
+def _source_key(source):
+    """Identifies the library text a precompiled library was made from."""
+    return (_COMPILED_VERSION, len(source), zlib.crc32(source))
+
+
+def _dump_library(source):
+    """Return the current library as data that marshal can save."""
+    units = []
+    index = {}
+    table = {}
+    # Units defined as another unit share the same object, so each
+    # object is saved only once.
+    for name, unit in _UNIT_LIB.unit_table.items():
+        if id(unit) not in index:
+            index[id(unit)] = len(units)
+            units.append((dict(unit.names), unit.factor, unit.powers,
+                          unit.offset))
+        table[name] = index[id(unit)]
+    sections = [(section, [(option, value) 
+                           for option, value in _UNIT_LIB.items(section, 
+                                                                raw=True)
+                           if isinstance(value, basestring)])
+                for section in _UNIT_LIB.sections()]
+    return {'key': _source_key(source),
+            'units': units,
+            'table': table,
+            'sections': sections,
+            'defined': [name for name, unit in _UNIT_LIB.items('units', 
+                                                               raw=True)],
+            'prefixes': _UNIT_LIB.prefixes,
+            'base_names': _UNIT_LIB.base_names,
+            'base_types': _UNIT_LIB.base_types,
+            'help': [(name, comment, unit if isinstance(unit, str) else None)
+                     for name, comment, unit in _UNIT_LIB.help]}
+
+
+def _load_library(data):
+    """Replace the current library with one saved by :func:`_dump_library`."""
+    global _UNIT_LIB 
+    global _UNIT_CACHE
+    units = [PhysicalUnit(NumberDict(names), factor, powers, offset)
+             for names, factor, powers, offset in data['units']]
+    lib = ConfigParser.ConfigParser()
+    lib.optionxform = _do_nothing
+    for section, options in data['sections']:
+        lib.add_section(section)
+        for option, value in options:
+            lib.set(section, option, value)
+    lib.unit_table = dict([(name, units[i]) 
+                           for name, i in data['table'].items()])
+    for name in data['defined']:
+        lib.set('units', name, lib.unit_table[name])
+    lib.prefixes = data['prefixes']
+    lib.base_names = data['base_names']
+    lib.base_types = data['base_types']
+    lib.help = [(name, comment, lib.unit_table[name] if unit is None else unit)
+                for name, comment, unit in data['help']]
+    _UNIT_CACHE = {}
+    _UNIT_LIB = lib
+    return _UNIT_LIB
+
+
+def compile_library(libfilename, compiledfilename=None):
+    """
+    Import the units library in `libfilename` and save it in precompiled
+    form, which :func:`import_default_library` loads instead of the library
+    file while the library file is unchanged.
+
+    libfilename: string
+        Name of the units library file.
+
+    compiledfilename: string
+        Name of the precompiled file. The default is `libfilename` with
+        a ``.dat`` extension.
+    """
+    if compiledfilename is None:
+        compiledfilename = os.path.splitext(libfilename)[0] + '.dat'
+    with open(libfilename, 'rb') as inp:
+        source = inp.read()
+    import_library(StringIO(source))
+    _save_library(source, compiledfilename)
+    return _UNIT_LIB
+
+
+def _save_library(source, compiledfilename):
+    """Save the current library, imported from `source`, in precompiled
+    form."""
+    # Write to a temporary file first so a partially written file is never
+    # loaded.
+    tmpname = '%s.%d.tmp' % (compiledfilename, os.getpid())
+    try:
+        with open(tmpname, 'wb') as out:
+            marshal.dump(_dump_library(source), out)
+        if os.path.exists(compiledfilename):
+            os.remove(compiledfilename)
+        os.rename(tmpname, compiledfilename)
+    finally:
+        if os.path.exists(tmpname):
+            os.remove(tmpname)
+
+
+def import_default_library():
+    """
+    Imports the default units library, replacing any existing definitions.
+    The precompiled library is used if it is up to date; otherwise it is
+    regenerated if possible.
+    """
+    compiledfilename = os.path.splitext(_DEFAULT_LIB)[0] + '.dat'
+    with open(_DEFAULT_LIB, 'rb') as inp:
+        source = inp.read()
+    try:
+        with open(compiledfilename, 'rb') as inp:
+            data = marshal.load(inp)
+        if data['key'] == _source_key(source):
+            return _load_library(data)
+    except (IOError, EOFError, ValueError, TypeError, KeyError):
+        pass
+    import_library(StringIO(source))
+    try:
+        _save_library(source, compiledfilename)
+    except (IOError, OSError):  # Installed read-only.
+        pass
+    return _UNIT_LIB
+
+import_default_library()
 
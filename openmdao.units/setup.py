@@ -1,6 +1,7 @@
 
 import os,sys
 from setuptools import setup
+from setuptools.command.build_py import build_py
 
 here = os.path.dirname(os.path.realpath(__file__))
 sys.path.insert(0, os.path.normpath(os.path.join(here,
@@ -8,6 +9,18 @@ sys.path.insert(0, os.path.normpath(os.path.join(here,
                                                  'units')))
 import releaseinfo
 
+
+class _build_py(build_py):
+    """Also precompiles the default units library in the build directory."""
+
+    def run(self):
+        build_py.run(self)
+        libfile = os.path.join(self.build_lib, 'openmdao', 'units',
+                               'unitLibdefault.ini')
+        if not self.dry_run and os.path.exists(libfile):
+            import units
+            units.compile_library(libfile)
+
 setup(name='openmdao.units',
       version=releaseinfo.__version__,
       license = "CeCILL-C",
@@ -16,6 +29,7 @@ setup(name='openmdao.units',
       package_data = {'units': ['unitLibdefault.ini']},
       include_package_data=True,
       zip_safe=False,
+      cmdclass={'build_py': _build_py},
       url='http://openmdao.org',
       )
 
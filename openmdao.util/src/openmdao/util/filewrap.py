@@ -6,6 +6,7 @@ Note: This is a work in progress.
 
 import re
 import logging
+from bisect import bisect_left, bisect_right
 
 from pyparsing import CaselessLiteral, Combine, OneOrMore, Optional, \
                       TokenConverter, Word, nums, oneOf, printables, \
@@ -122,10 +123,8 @@ class ToInf(TokenConverter):
         return float('inf')
     
     
-def _parse_line(delimiters=' \t'):
-    """Parse a single data line that may contain string or numerical data.
-    Float and Int 'words' are converted to their appropriate type. 
-    Exponentiation is supported, as are NaN and Inf."""
+def _textchars(delimiters):
+    """Returns the characters that may appear in a string field."""
     
     # Somewhat of a hack, but we can only use printables if the delimiter is
     # just whitespace. Otherwise, some seprators (like ',' or '=') potentially
@@ -145,7 +144,18 @@ def _parse_line(delimiters=' \t'):
             if symbol not in delimiters:
                 textchars = textchars + symbol
                 
-    string_text = Word(textchars)
+    return textchars
+
+
+_INF_WORDS = "Inf -Inf"
+_NAN_WORDS = "NaN nan NaN% NaNQ NaNS qNaN sNaN 1.#SNAN 1.#QNAN -1.#IND"
+
+def _parse_line(delimiters=' \t'):
+    """Parse a single data line that may contain string or numerical data.
+    Float and Int 'words' are converted to their appropriate type. 
+    Exponentiation is supported, as are NaN and Inf."""
+    
+    string_text = Word(_textchars(delimiters))
         
     digits = Word(nums)
     dot = "."
@@ -163,9 +173,7 @@ def _parse_line(delimiters=' \t'):
     # special case for a float written like "3e5"
     mixed_exp = ToFloat(Combine( digits + ee + Optional(sign) + digits ))
     
-    nan = ToInf(oneOf("Inf -Inf")) | \
-          ToNan(oneOf("NaN nan NaN%  NaNQ NaNS qNaN sNaN " + \
-                        "1.#SNAN 1.#QNAN -1.#IND"))
+    nan = ToInf(oneOf(_INF_WORDS)) | ToNan(oneOf(_NAN_WORDS))
     
     # sep = Literal(" ") | Literal("\n")
     
@@ -174,6 +182,180 @@ def _parse_line(delimiters=' \t'):
     
     return data
 
+# Regular expressions for the numeric forms recognized by _parse_line.
+_INT_RE = re.compile(r'[+-]?\d+\Z')
+_FLOAT_RE = re.compile(r'([+-]?(\d+\.\d*|\.\d+)([eEdD][+-]?\d+)?|'
+                       r'\d+[eEdD][+-]?\d+)\Z')
+
+_TOKENIZERS = {}
+
+class _Tokenizer(object):
+    """Splits lines into fields with the same results as the grammar returned
+    by ``_parse_line(delimiters)``. Lines of plain numbers and words are
+    handled with regular expressions, anything else is passed to pyparsing.
+    Since pyparsing elements take the default whitespace in effect when they
+    are created, a tokenizer is only valid for the whitespace `white`."""
+    
+    def __init__(self, delimiters, white):
+        
+        self.delimiters = delimiters
+        self.textchars = frozenset(_textchars(delimiters))
+        if white:
+            self.split = re.compile('[%s]+' % re.escape(white)).split
+        else:
+            self.split = None
+        self.parser = None
+        
+        self.words = {}
+        for word in _INF_WORDS.split():
+            self.words[word] = float('inf')
+        for word in _NAN_WORDS.split():
+            self.words[word] = float('nan')
+        self.prefixes = tuple(self.words)
+        
+    def parse(self, line):
+        """Parse `line` with pyparsing."""
+        
+        if self.parser is None:
+            self.parser = _parse_line(self.delimiters)
+        return list(self.parser.parseString(line))
+        
+    def tokenize(self, line):
+        """Returns a list of the fields in `line`."""
+        
+        if self.split is None:
+            return self.parse(line)
+        
+        # pyparsing stops at line terminators which aren't whitespace.
+        fields = []
+        for word in self.split(line.rstrip('\r\n')):
+            if not word:
+                continue
+            
+            value = self.words.get(word)
+            if value is not None:
+                fields.append(value)
+            elif word.startswith(self.prefixes):
+                return self.parse(line)
+            elif word[0] in '0123456789+-.':
+                if _INT_RE.match(word):
+                    fields.append(int(word))
+                elif _FLOAT_RE.match(word):
+                    try:
+                        fields.append(float(word.replace('D', 'E')))
+                    except ValueError:
+                        return self.parse(line)
+                else:
+                    return self.parse(line)
+            elif self.textchars.issuperset(word):
+                fields.append(word)
+            else:
+                return self.parse(line)
+            
+        if not fields:
+            return self.parse(line)
+        return fields
+    
+def _tokenize(line, delimiters=' \t'):
+    """Returns the fields of a single data line, as parsed by the grammar
+    from ``_parse_line(delimiters)``."""
+    
+    white = ParserElement.DEFAULT_WHITE_CHARS
+    try:
+        tokenizer = _TOKENIZERS[(delimiters, white)]
+    except KeyError:
+        tokenizer = _Tokenizer(delimiters, white)
+        _TOKENIZERS[(delimiters, white)] = tokenizer
+    return tokenizer.tokenize(line)
+
+
+class _AnchorIndex(object):
+    """Records which rows of `data` contain each anchor that has been
+    searched for, so that repeated searches don't rescan the file."""
+    
+    def __init__(self, data):
+        
+        self.data = data
+        self.rows = {}
+        self.text = None
+        self.offsets = None
+        
+    def find_rows(self, anchor):
+        """Returns the sorted rows containing `anchor`."""
+        
+        try:
+            return self.rows[anchor]
+        except KeyError:
+            pass
+        
+        if not anchor:
+            rows = range(len(self.data))
+        else:
+            if self.text is None:
+                self.text = ''.join(self.data)
+                self.offsets = offsets = [0]
+                total = 0
+                for length in map(len, self.data):
+                    total += length
+                    offsets.append(total)
+            text = self.text
+            offsets = self.offsets
+            
+            # Lines don't necessarily end with a newline, so a match may
+            # span lines.
+            rows = []
+            size = len(anchor)
+            pos = text.find(anchor)
+            while pos >= 0:
+                row = bisect_right(offsets, pos) - 1
+                if pos + size <= offsets[row+1]:
+                    rows.append(row)
+                    pos = text.find(anchor, offsets[row+1])
+                else:
+                    pos = text.find(anchor, pos+1)
+            
+        self.rows[anchor] = rows
+        return rows
+    
+    def update(self, row):
+        """Record a change to the line at `row`."""
+        
+        self.text = None
+        self.offsets = None
+        
+        if row < 0:
+            row += len(self.data)
+        line = self.data[row]
+        for anchor, rows in self.rows.items():
+            i = bisect_left(rows, row)
+            present = i < len(rows) and rows[i] == row
+            if line.find(anchor) > -1:
+                if not present:
+                    rows.insert(i, row)
+            elif present:
+                del rows[i]
+            
+    def find(self, anchor, occurrence, current_row, anchored):
+        """Returns the row of the given `occurrence` of `anchor` as searched
+        for by ``mark_anchor``, or None if there isn't one."""
+        
+        rows = self.find_rows(anchor)
+        if occurrence > 0:
+            # When starting from an existing anchor, the text after it on the
+            # anchor line can't contain the new anchor.
+            if anchored:
+                current_row += 1
+            i = bisect_left(rows, current_row) + occurrence - 1
+            if i < len(rows):
+                return rows[i]
+        else:
+            # Reverse searches skip the last line when anchored.
+            if anchored and rows and rows[-1] == len(self.data)-1:
+                rows = rows[:-1]
+            if -occurrence <= len(rows):
+                return rows[occurrence]
+        return None
+
 
 class InputFileGenerator(object):
     """Utility to generate an input file from a template.
@@ -191,6 +373,7 @@ class InputFileGenerator(object):
         self.data = []
         self.current_row = 0
         self.anchored = False
+        self._index = None
     
     def set_template_file(self, filename):
         """Set the name of the template file to be used The template
@@ -213,6 +396,19 @@ class InputFileGenerator(object):
         
         self.output_filename = filename
 
+    def _get_index(self):
+        """Returns the anchor index for the current data."""
+        
+        if self._index is None or self._index.data is not self.data:
+            self._index = _AnchorIndex(self.data)
+        return self._index
+        
+    def _changed(self, j):
+        """Updates the anchor index after a change to line `j`."""
+        
+        if self._index is not None and self._index.data is self.data:
+            self._index.update(j)
+
     def set_delimiters(self, delimiter):
         """Lets you change the delimiter that is used to identify field
         boundaries.
@@ -240,47 +436,15 @@ class InputFileGenerator(object):
         if not isinstance(occurrence, int):
             raise ValueError("The value for occurrence must be an integer")
         
-        instance = 0
-        if occurrence > 0:
-            count = 0
-            for line in self.data[self.current_row:]:
-                
-                # If we are marking a new anchor from an existing anchor, and
-                # the anchor is mid-line, then we still search the line, but
-                # only after the anchor.
-                if count == 0 and self.anchored:
-                    line = line.split(anchor)[-1]
-
-                if line.find(anchor) > -1:
-                    
-                    instance += 1
-                    if instance == occurrence:
-                        self.current_row += count
-                        self.anchored = True
-                        return
-            
-                count += 1
-                
-        elif occurrence < 0:
-            count = len(self.data)-1
-            for line in reversed(self.data):
-                
-                # If we are marking a new anchor from an existing anchor, and
-                # the anchor is mid-line, then we still search the line, but
-                # only before the anchor.
-                if count == len(self.data)-1 and self.anchored:
-                    line = line.split(anchor)[0]
-
-                if line.find(anchor) > -1:
-                    instance += -1
-                    if instance == occurrence:
-                        self.current_row = count
-                        self.anchored = True
-                        return
-            
-                count -= 1
-        else:
+        if occurrence == 0:
             raise ValueError("0 is not valid for an anchor occurrence.")
+        
+        row = self._get_index().find(anchor, occurrence, self.current_row,
+                                     self.anchored)
+        if row is not None:
+            self.current_row = row
+            self.anchored = True
+            return
             
         raise RuntimeError("Could not find pattern %s in template file %s" % \
                            (anchor, self.template_filename))
@@ -308,6 +472,7 @@ class InputFileGenerator(object):
         newline = re.sub(self.reg, sub.replace, line)
         
         self.data[j] = newline
+        self._changed(j)
         
     def transfer_array(self, value, row_start, field_start, field_end,
                        row_end=None, sep=", "):
@@ -355,6 +520,7 @@ class InputFileGenerator(object):
             
             newline = re.sub(self.reg, sub.replace_array, line)
             self.data[j] = newline
+            self._changed(j)
             
         # Sometimes an array is too large for the example in the template
         # This is resolved by adding more fields at the end
@@ -373,6 +539,7 @@ class InputFileGenerator(object):
             raise ValueError("Array is too small for the template.")
         
         self.data[j] += "\n"
+        self._changed(j)
         
     def transfer_2Darray(self, value, row_start, row_end, field_start,
                        field_end, sep=", "):
@@ -412,6 +579,7 @@ class InputFileGenerator(object):
             
             newline = re.sub(self.reg, sub.replace_array, line)
             self.data[j] = newline
+            self._changed(j)
             
             sub.current_location = 0
             sub.counter = 0
@@ -427,6 +595,7 @@ class InputFileGenerator(object):
             row number to clear, relative to current anchor."""
 
         self.data[self.current_row + row] = "\n"
+        self._changed(self.current_row + row)
         
     def generate(self):
         """Use the template file to generate the input file."""
@@ -451,6 +620,7 @@ class FileParser(object):
         
         self.current_row = 0
         self.anchored = False
+        self._index = None
         
     def set_file(self, filename):
         """Set the name of the file that will be generated.
@@ -484,6 +654,13 @@ class FileParser(object):
         self.delimiter = delimiter
         if delimiter != "columns":
             ParserElement.setDefaultWhitespaceChars(str(delimiter))
+
+    def _get_index(self):
+        """Returns the anchor index for the current data."""
+        
+        if self._index is None or self._index.data is not self.data:
+            self._index = _AnchorIndex(self.data)
+        return self._index
             
     def mark_anchor(self, anchor, occurrence=1):
         """Marks the location of a landmark, which lets you describe data by
@@ -502,47 +679,15 @@ class FileParser(object):
         if not isinstance(occurrence, int):
             raise ValueError("The value for occurrence must be an integer")
         
-        instance = 0
-        if occurrence > 0:
-            count = 0
-            for line in self.data[self.current_row:]:
-                
-                # If we are marking a new anchor from an existing anchor, and
-                # the anchor is mid-line, then we still search the line, but
-                # only after the anchor.
-                if count == 0 and self.anchored:
-                    line = line.split(anchor)[-1]
-
-                if line.find(anchor) > -1:
-                    
-                    instance += 1
-                    if instance == occurrence:
-                        self.current_row += count
-                        self.anchored = True
-                        return
-            
-                count += 1
-                
-        elif occurrence < 0:
-            count = len(self.data)-1
-            for line in reversed(self.data):
-                
-                # If we are marking a new anchor from an existing anchor, and
-                # the anchor is mid-line, then we still search the line, but
-                # only before the anchor.
-                if count == len(self.data)-1 and self.anchored:
-                    line = line.split(anchor)[0]
-
-                if line.find(anchor) > -1:
-                    instance += -1
-                    if instance == occurrence:
-                        self.current_row = count
-                        self.anchored = True
-                        return
-            
-                count -= 1
-        else:
+        if occurrence == 0:
             raise ValueError("0 is not valid for an anchor occurrence.")
+        
+        row = self._get_index().find(anchor, occurrence, self.current_row,
+                                     self.anchored)
+        if row is not None:
+            self.current_row = row
+            self.anchored = True
+            return
             
         raise RuntimeError("Could not find pattern %s in output file %s" % \
                            (anchor, self.filename))
@@ -599,9 +744,9 @@ class FileParser(object):
             else:
                 line = line[(field-1):(fieldend)]
             
-            # Let pyparsing figure out if this is a number, and return it
+            # Let the tokenizer figure out if this is a number, and return it
             # as a float or int as appropriate
-            data = _parse_line().parseString(line)
+            data = _tokenize(line)
             
             # data might have been split if it contains whitespace. If so,
             # just return the whole string
@@ -610,7 +755,7 @@ class FileParser(object):
             else:
                 return data[0]
         else:
-            data = _parse_line(self.delimiter).parseString(line)
+            data = _tokenize(line, self.delimiter)
             return data[field-1]
 
     def transfer_keyvar(self, key, field, occurrence=1, rowoffset=0):
@@ -636,31 +781,27 @@ class FileParser(object):
             msg = "The value for occurrence must be a nonzero integer"
             raise ValueError(msg)
         
-        instance = 0
+        # Rows are counted from the anchor for forward searches and from the
+        # end of the file for reverse searches.
+        rows = self._get_index().find_rows(key)
+        i = bisect_left(rows, self.current_row)
         if occurrence > 0:
-            row = 0
-            for line in self.data[self.current_row:]:
-                if line.find(key) > -1:
-                    instance += 1
-                    if instance == occurrence:
-                        break
-            
-                row += 1
+            i += occurrence - 1
+            if i < len(rows):
+                row = rows[i] - self.current_row
+            else:
+                row = max(len(self.data) - self.current_row, 0)
                 
         elif occurrence < 0:
-            row = -1
-            for line in reversed(self.data[self.current_row:]):
-                if line.find(key) > -1:
-                    instance += -1
-                    if instance == occurrence:
-                        break
-            
-                row -= 1
+            if -occurrence <= len(rows) - i:
+                row = rows[occurrence] - len(self.data)
+            else:
+                row = -max(len(self.data) - self.current_row, 0) - 1
         
         j = self.current_row + row + rowoffset
         line = self.data[j]
         
-        fields = _parse_line(self.delimiter).parseString(line.replace(key,"KeyField"))
+        fields = _tokenize(line.replace(key, "KeyField"), self.delimiter)
         
         return fields[field]
 
@@ -706,9 +847,9 @@ class FileParser(object):
                 # Stripping whitespace may be controversial.
                 line = line.strip()
                 
-                # Let pyparsing figure out if this is a number, and return it
-                # as a float or int as appropriate
-                parsed = _parse_line().parseString(line)
+                # Let the tokenizer figure out if this is a number, and return
+                # it as a float or int as appropriate
+                parsed = _tokenize(line)
                 
                 newdata = array(parsed[:])
                 # data might have been split if it contains whitespace. If the
@@ -719,7 +860,7 @@ class FileParser(object):
                 data = append(data, newdata)
                 
             else:
-                parsed = _parse_line(self.delimiter).parseString(line)
+                parsed = _tokenize(line, self.delimiter)
                 if i == j2-j1-1:
                     data = append(data, array(parsed[(fieldstart-1):fieldend]))
                 else:
@@ -769,7 +910,7 @@ class FileParser(object):
             else:
                 line = lines[0][(fieldstart-1):]
                 
-            parsed = _parse_line().parseString(line)
+            parsed = _tokenize(line)
             row = array(parsed[:])
             data = zeros(shape=(abs(j2-j1), len(row)))
             data[0, :] = row
@@ -780,11 +921,11 @@ class FileParser(object):
                 else:
                     line = line[(fieldstart-1):]
                 
-                parsed = _parse_line().parseString(line)
+                parsed = _tokenize(line)
                 data[i+1, :] = array(parsed[:])
                 
         else:
-            parsed = _parse_line(self.delimiter).parseString(lines[0])
+            parsed = _tokenize(lines[0], self.delimiter)
             if fieldend:
                 row = array(parsed[(fieldstart-1):fieldend])
             else:
@@ -794,7 +935,7 @@ class FileParser(object):
             data[0, :] = row
     
             for i, line in enumerate(list(lines[1:])):
-                parsed = _parse_line(self.delimiter).parseString(line)
+                parsed = _tokenize(line, self.delimiter)
                 
                 if fieldend:
                     try:
@@ -0,0 +1,147 @@
+"""
+Directory-based store of files produced by deterministic computations,
+keyed by a hash of their inputs.
+"""
+
+import cPickle
+import glob
+import hashlib
+import os.path
+import shutil
+import tempfile
+
+_MANIFEST = 'manifest.pkl'
+
+
+class ResultCache(object):
+    """
+    Stores copies of result files in subdirectories of `directory`, one per
+    key. Entries are evicted in least recently used order when the total size
+    of stored files exceeds `max_size` bytes. Multiple processes may share
+    a directory.
+
+    directory: string
+        Path to the cache directory, created if necessary.
+
+    max_size: int
+        Maximum total size (bytes) of stored files. If zero, the size is
+        unlimited.
+    """
+
+    def __init__(self, directory, max_size=0):
+        self.directory = os.path.abspath(directory)
+        self.max_size = max_size
+        if not os.path.exists(self.directory):
+            try:
+                os.makedirs(self.directory)
+            except OSError:
+                if not os.path.isdir(self.directory):  # Not just a race.
+                    raise
+
+    @staticmethod
+    def make_key(items=(), paths=()):
+        """
+        Return a key for the hashable representation of `items` and the
+        contents of the files in `paths`.
+        """
+        digest = hashlib.sha1()
+        for item in items:
+            digest.update(repr(item))
+        for path in paths:
+            digest.update(repr(path))
+            with open(path, 'rb') as inp:
+                while True:
+                    data = inp.read(1 << 16)
+                    if not data:
+                        break
+                    digest.update(data)
+        return digest.hexdigest()
+
+    def store(self, key, paths, data=None):
+        """
+        Record copies of the files in `paths` along with `data` (which must
+        be picklable) under `key`. Returns False if `key` already existed.
+        """
+        entry = os.path.join(self.directory, key)
+        if os.path.exists(entry):
+            return False
+
+        tmpdir = tempfile.mkdtemp(prefix='tmp-', dir=self.directory)
+        size = 0
+        try:
+            for i, path in enumerate(paths):
+                shutil.copy(path, os.path.join(tmpdir, str(i)))
+                size += os.path.getsize(path)
+            with open(os.path.join(tmpdir, _MANIFEST), 'wb') as out:
+                cPickle.dump((list(paths), size, data), out,
+                             cPickle.HIGHEST_PROTOCOL)
+            os.rename(tmpdir, entry)
+        except OSError:
+            # Another process stored this key concurrently.
+            shutil.rmtree(tmpdir, ignore_errors=True)
+            if os.path.exists(entry):
+                return False
+            raise
+        except Exception:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+            raise
+
+        self.evict()
+        return True
+
+    def restore(self, key):
+        """
+        Copy files recorded under `key` back to their original paths.
+        Returns the recorded data, or None if `key` isn't in the cache.
+        """
+        entry = os.path.join(self.directory, key)
+        manifest = os.path.join(entry, _MANIFEST)
+        try:
+            with open(manifest, 'rb') as inp:
+                paths, size, data = cPickle.load(inp)
+            for i, path in enumerate(paths):
+                dirname = os.path.dirname(path)
+                if dirname and not os.path.exists(dirname):
+                    os.makedirs(dirname)
+                shutil.copy(os.path.join(entry, str(i)), path)
+        except (IOError, OSError):
+            return None  # Missing, or evicted while restoring.
+
+        # Record use for LRU eviction.
+        try:
+            os.utime(manifest, None)
+        except OSError:
+            pass
+        return data
+
+    def evict(self):
+        """ Remove least recently used entries until within `max_size`. """
+        if not self.max_size:
+            return
+        entries = []
+        total = 0
+        for manifest in glob.glob(os.path.join(self.directory, '*', _MANIFEST)):
+            if os.path.basename(os.path.dirname(manifest)).startswith('tmp-'):
+                continue  # Being stored.
+            try:
+                with open(manifest, 'rb') as inp:
+                    size = cPickle.load(inp)[1]
+                used = os.path.getmtime(manifest)
+            except (IOError, OSError, EOFError):
+                continue
+            entries.append((used, size, os.path.dirname(manifest)))
+            total += size
+
+        entries.sort()
+        while total > self.max_size and entries:
+            used, size, entry = entries.pop(0)
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """ Remove all entries. """
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
@@ -2,12 +2,16 @@ import os.path
 import signal
 import subprocess
 import sys
+import threading
 import time
 
 PIPE = subprocess.PIPE
 STDOUT = subprocess.STDOUT
 DEV_NULL = 'nul:' if sys.platform == 'win32' else '/dev/null'
 
+# Seconds to wait after terminating a timed-out process before killing it.
+KILL_DELAY = 5.
+
 
 class CalledProcessError(subprocess.CalledProcessError):
     """ :class:`subprocess.CalledProcessError` plus `errormsg` attribute. """
@@ -102,44 +106,67 @@ class ShellProc(subprocess.Popen):
 
     def wait(self, poll_delay=0., timeout=0.):
         """
-        Polls for command completion or timeout.
+        Waits for command completion or timeout.
         Closes any files implicitly opened.
         Returns ``(return_code, error_msg)``.
 
         poll_delay: float (seconds)
-            Time to delay between polling for command completion.
-            A value of zero uses an internal default.
+            Not used; completion is detected as soon as the command exits.
+            Retained for compatibility.
 
         timeout: float (seconds)
             Maximum time to wait for command completion.
             A value of zero implies an infinite maximum wait.
+            On timeout the command is terminated (and killed if it hasn't
+            exited after another `KILL_DELAY` seconds).
         """
         return_code = None
+        self._timed_out = False
+        self._timers = []
         try:
-            if poll_delay <= 0:
-                poll_delay = max(0.1, timeout/100.)
-                poll_delay = min(10., poll_delay)
-            npolls = int(timeout / poll_delay) + 1
-
-            time.sleep(poll_delay)
-            return_code = self.poll()
-            while return_code is None:
-                npolls -= 1
-                if (timeout > 0) and (npolls < 0):
-                    self.terminate()
-                    break
-                time.sleep(poll_delay)
-                return_code = self.poll()
+            if timeout > 0:
+                self._start_timer(timeout, self._timeout_expired)
+            return_code = subprocess.Popen.wait(self)
         finally:
+            for timer in self._timers:
+                timer.cancel()
             self.close_files()
 
-        # self.returncode set by self.poll().
+        if self._timed_out:
+            return_code = None
+
+        # self.returncode set by Popen.wait().
         if return_code is not None:
             self.errormsg = self.error_message(return_code)
         else:
             self.errormsg = 'Timed out'
         return (return_code, self.errormsg)
 
+    def _start_timer(self, delay, function):
+        """ Start timer which calls `function` after `delay` seconds. """
+        timer = threading.Timer(delay, function)
+        timer.daemon = True
+        self._timers.append(timer)
+        timer.start()
+
+    def _timeout_expired(self):
+        """ Terminate timed-out command, kill if it doesn't stop. """
+        if self.returncode is None:
+            self._timed_out = True
+            self._start_timer(KILL_DELAY, self._kill)
+            try:
+                self.terminate()
+            except OSError:
+                pass  # Already reaped.
+
+    def _kill(self):
+        """ Kill timed-out command which didn't terminate. """
+        if self.returncode is None:
+            try:
+                self.kill()
+            except OSError:
+                pass  # Already reaped.
+
     def error_message(self, return_code):
         """
         Return error message for `return_code`.
@@ -186,8 +213,7 @@ def call(args, stdin=None, stdout=None, stderr=None, env=None,
         Environment variables for the command.
 
     poll_delay: float (seconds)
-        Time to delay between polling for command completion.
-        A value of zero uses an internal default.
+        Not used; retained for compatibility.
 
     timeout: float (seconds)
         Maximum time to wait for command completion.
@@ -218,8 +244,7 @@ def check_call(args, stdin=None, stdout=None, stderr=None, env=None,
         Environment variables for the command.
 
     poll_delay: float (seconds)
-        Time to delay between polling for command completion.
-        A value of zero uses an internal default.
+        Not used; retained for compatibility.
 
     timeout: float (seconds)
         Maximum time to wait for command completion.
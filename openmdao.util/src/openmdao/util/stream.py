@@ -235,6 +235,59 @@ class Stream(object):
 
         return data.reshape(shape, order=order) if reshape else data
 
+    def map_floats(self, shape, order='C', full_record=False):
+        """
+        Returns floats as a :mod:`numpy` array of `shape` which is a view of
+        the file contents via :class:`numpy.memmap`. Data is only read from
+        the file as it is accessed, and changes to the array are not written
+        back to the file. The file must not be truncated or rewritten while
+        the array is in use. Only valid if `binary`.
+
+        shape: tuple(int)
+            Dimensions of returned array.
+
+        order: string
+            If 'C', the data is in row-major order.
+            If 'Fortran', the data is in column-major order.
+
+        full_record: bool
+            If True, then read surrounding recordmarks.
+            Only meaningful if `unformatted`.
+        """
+        if not self.binary:
+            raise RuntimeError('map_floats() requires binary data')
+
+        reshape = False
+        count = 1
+        try:
+            for size in shape:
+                count *= size
+            reshape = True
+        except TypeError:
+            count = shape
+
+        if full_record and self.unformatted:
+            reclen = self.read_recordmark()
+            if reclen != self.reclen_floats(count):
+                raise RuntimeError('unexpected recordlength %d' % reclen)
+
+        # Byte order is part of the dtype, so no byteswap is needed.
+        dtype = numpy.dtype(numpy.float32 if self.single_precision
+                                          else numpy.float64)
+        dtype = dtype.newbyteorder('>' if self.big_endian else '<')
+        offset = self.file.tell()
+        data = numpy.memmap(self.file, dtype=dtype, mode='c', offset=offset,
+                            shape=(count,))
+        self.file.seek(offset + self.reclen_floats(count))
+
+        if full_record and self.unformatted:
+            reclen2 = self.read_recordmark()
+            if reclen2 != reclen:
+                raise RuntimeError('mismatched recordlength %d vs. %d'
+                                   %  (reclen2, reclen))
+
+        return data.reshape(shape, order=order) if reshape else data
+
     def read_recordmark(self):
         """ Returns value of next recordmark. """
         fmt = '>' if self.big_endian else '<'
@@ -318,6 +371,8 @@ class Stream(object):
                     arr = numpy.array(data, dtype=numpy.int64)
             elif data.itemsize != _SZ_INT:
                 arr = numpy.array(data, dtype=numpy.int32)
+            if not arr.dtype.isnative:  # For example, a mapped file.
+                arr = arr.astype(arr.dtype.newbyteorder('='))
 
             if self.need_byteswap:
                 arr.byteswap(True)
@@ -404,6 +459,8 @@ class Stream(object):
                     arr = numpy.array(data, dtype=numpy.float32)
             elif data.itemsize != _SZ_DOUBLE:
                 arr = numpy.array(data, dtype=numpy.float64)
+            if not arr.dtype.isnative:  # For example, a mapped file.
+                arr = arr.astype(arr.dtype.newbyteorder('='))
 
             if self.need_byteswap:
                 arr.byteswap(True)
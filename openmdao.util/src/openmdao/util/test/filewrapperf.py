@@ -0,0 +1,105 @@
+"""
+Measure FileParser time to locate anchors and read arrays from a large
+output file, using the original pyparsing-per-line approach and the
+current tokenizer and anchor index.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from openmdao.util import filewrap
+from openmdao.util.filewrap import FileParser, _parse_line
+
+
+def write_file(path, blocks, rows):
+    """ Write an output file with `blocks` blocks of `rows` rows each. """
+    with open(path, 'w') as out:
+        for block in range(blocks):
+            out.write(' ITERATION %d\n' % block)
+            for row in range(rows):
+                out.write(' %d %.6E %.6E %.6E 1.0D-03 %d\n'
+                          % (row, block*0.1, row*1.5, -row*2.5, row+block))
+        out.write(' CONVERGED\n')
+
+
+def pyparsing_tokenize(line, delimiters=' \t'):
+    """ Tokenize as `FileParser` originally did, building the grammar
+    for every line. """
+    return _parse_line(delimiters).parseString(line)
+
+
+class LinearIndex(object):
+    """ Locates anchors by scanning lines, as `FileParser` originally did. """
+
+    def __init__(self, data):
+        self.data = data
+
+    def find_rows(self, anchor):
+        return [i for i, line in enumerate(self.data)
+                if line.find(anchor) > -1]
+
+    def find(self, anchor, occurrence, current_row, anchored):
+        instance = 0
+        count = 0
+        for line in self.data[current_row:]:
+            if count == 0 and anchored:
+                line = line.split(anchor)[-1]
+            if line.find(anchor) > -1:
+                instance += 1
+                if instance == occurrence:
+                    return current_row + count
+            count += 1
+        return None
+
+
+def read_blocks(path, blocks, rows):
+    """ Return seconds to read every block, and the sum of the data. """
+    start = time.time()
+    parser = FileParser()
+    parser.set_file(path)
+    total = 0.
+    for block in range(blocks):
+        parser.mark_anchor('ITERATION')
+        total += parser.transfer_array(1, 2, rows, 4).sum()
+    total += parser.transfer_keyvar('CONVERGED', 0, -1) == 'KeyField'
+    return (time.time() - start, total)
+
+
+def main():
+    """ Report read times for a range of file sizes. """
+    rows = 20
+    tokenize = filewrap._tokenize
+    index = filewrap._AnchorIndex
+    tmpdir = tempfile.mkdtemp()
+    path = os.path.join(tmpdir, 'output.dat')
+    try:
+        print '%8s %10s %14s %14s %8s' % ('blocks', 'lines', 'original (s)',
+                                          'current (s)', 'speedup')
+        for blocks in (10, 100, 500):
+            write_file(path, blocks, rows)
+
+            filewrap._tokenize = pyparsing_tokenize
+            filewrap._AnchorIndex = LinearIndex
+            try:
+                original, expected = read_blocks(path, blocks, rows)
+            finally:
+                filewrap._tokenize = tokenize
+                filewrap._AnchorIndex = index
+
+            current, total = read_blocks(path, blocks, rows)
+            if total != expected:
+                raise RuntimeError('Results differ: %s vs. %s'
+                                   % (total, expected))
+
+            print '%8d %10d %14.3f %14.3f %8.1f' \
+                  % (blocks, blocks*(rows+1)+1, original, current,
+                     original/current)
+    finally:
+        os.remove(path)
+        os.rmdir(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,8 +5,10 @@ Testing the file wrapping utilities.
 import unittest, os
 
 from numpy import array, isnan, isinf
+from pyparsing import ParserElement
 
-from openmdao.util.filewrap import InputFileGenerator, FileParser
+from openmdao.util.filewrap import InputFileGenerator, FileParser, \
+                                   _parse_line, _tokenize
 
 
 class TestCase(unittest.TestCase):
@@ -585,7 +587,85 @@ class TestCase(unittest.TestCase):
         val = op.transfer_var(4, 4)
         self.assertEqual(val, '#$%')
         
-
+    def test_tokenize(self):
+        
+        # The fast tokenizer must agree with the pyparsing grammar.
+        lines = [" 1 -2 +3 1.5 .5 1. 3e5 1.0D+05 abc\n",
+                 " NaN nan Inf -Inf 1.#QNAN -1.#IND NaN%\n",
+                 " -3e5 1.5e 12abc Infinity nano +abc\n",
+                 "c=1,2,Word,6\n",
+                 "d=C:/abc/def,a+b*c^2,(%#%),!true\r\n",
+                 "a 'quoted' \"text\" \n",
+                 "   \n"]
+        
+        def parse(func, line, delims):
+            try:
+                fields = func(line, delims)
+            except Exception, err:
+                return str(err)
+            return [str(field) for field in fields]
+        
+        olddelims = ParserElement.DEFAULT_WHITE_CHARS
+        try:
+            for delims in (' \t', ' \t,=', ', '):
+                ParserElement.setDefaultWhitespaceChars(delims)
+                for line in lines:
+                    expected = parse(lambda line, delims:
+                                     _parse_line(delims).parseString(line),
+                                     line, delims)
+                    self.assertEqual(parse(_tokenize, line, delims), expected)
+        finally:
+            ParserElement.setDefaultWhitespaceChars(olddelims)
+        
+    def test_anchor_index(self):
+        
+        template = "Anchor 1\n" + \
+                   "Anchor 2\n" + \
+                   "Junk\n" + \
+                   "Anchor 3\n"
+        
+        outfile = open(self.templatename, 'w')
+        outfile.write(template)
+        outfile.close()
+        
+        gen = InputFileGenerator()
+        gen.set_template_file(self.templatename)
+        gen.set_generated_file(self.filename)
+        
+        gen.mark_anchor('Anchor', 2)
+        self.assertEqual(gen.current_row, 1)
+        gen.mark_anchor('Anchor')
+        self.assertEqual(gen.current_row, 3)
+        
+        # Substitutions change which lines contain an anchor.
+        gen.reset_anchor()
+        gen.transfer_var('Anchor', 2, 1)
+        gen.transfer_var('Junk', 3, 1)
+        gen.mark_anchor('Anchor', 3)
+        self.assertEqual(gen.current_row, 2)
+        gen.mark_anchor('Anchor', -1)
+        self.assertEqual(gen.current_row, 2)
+        
+        gen.clearline(0)
+        gen.reset_anchor()
+        gen.mark_anchor('Anchor', -1)
+        self.assertEqual(gen.current_row, 1)
+        
+        # A new file is indexed again.
+        parser = FileParser()
+        outfile = open(self.filename, 'w')
+        outfile.write(template)
+        outfile.close()
+        parser.set_file(self.filename)
+        parser.mark_anchor('Anchor', -1)
+        self.assertEqual(parser.transfer_var(0, 2), 3)
+        self.assertEqual(parser.transfer_keyvar('Anchor', 1, -2), 2)
+        
+        parser.data = ["Junk\n", "Anchor 4\n"]
+        parser.reset_anchor()
+        parser.mark_anchor('Anchor')
+        self.assertEqual(parser.transfer_var(0, 2), 4)
+        
             
 if __name__ == '__main__':
     import nose
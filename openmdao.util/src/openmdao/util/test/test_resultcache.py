@@ -0,0 +1,92 @@
+"""
+Test ResultCache.
+"""
+
+import os.path
+import shutil
+import sys
+import tempfile
+import unittest
+
+from openmdao.util.resultcache import ResultCache
+
+
+class TestCase(unittest.TestCase):
+    """ Test ResultCache. """
+
+    def setUp(self):
+        self.startdir = os.getcwd()
+        self.tempdir = tempfile.mkdtemp()
+        os.chdir(self.tempdir)
+
+    def tearDown(self):
+        os.chdir(self.startdir)
+        shutil.rmtree(self.tempdir)
+
+    def _write(self, path, data):
+        with open(path, 'w') as out:
+            out.write(data)
+
+    def _read(self, path):
+        with open(path, 'r') as inp:
+            return inp.read()
+
+    def test_key(self):
+        self._write('in1', 'hello')
+        self._write('in2', 'hello')
+        key = ResultCache.make_key(['cmd'], ['in1'])
+        self.assertEqual(key, ResultCache.make_key(['cmd'], ['in1']))
+        self.assertNotEqual(key, ResultCache.make_key(['cmd2'], ['in1']))
+        self.assertNotEqual(key, ResultCache.make_key(['cmd'], ['in2']))
+        self._write('in1', 'goodbye')
+        self.assertNotEqual(key, ResultCache.make_key(['cmd'], ['in1']))
+
+    def test_store_restore(self):
+        cache = ResultCache('cache')
+        os.mkdir('sub')
+        self._write('out1', 'result 1')
+        self._write(os.path.join('sub', 'out2'), 'result 2')
+
+        self.assertEqual(cache.restore('abc'), None)
+        self.assertTrue(cache.store('abc', ['out1', os.path.join('sub', 'out2')],
+                                    {'return_code': 0}))
+        self.assertFalse(cache.store('abc', ['out1']))
+
+        os.remove('out1')
+        shutil.rmtree('sub')
+        self.assertEqual(cache.restore('abc'), {'return_code': 0})
+        self.assertEqual(self._read('out1'), 'result 1')
+        self.assertEqual(self._read(os.path.join('sub', 'out2')), 'result 2')
+
+        # Another instance sharing the directory.
+        self.assertEqual(ResultCache('cache').restore('abc'),
+                         {'return_code': 0})
+
+        cache.clear()
+        self.assertEqual(cache.restore('abc'), None)
+
+    def test_evict(self):
+        cache = ResultCache('cache', max_size=25)
+        for i, key in enumerate(('a', 'b', 'c')):
+            self._write('out', '%d' % i * 10)
+            cache.store(key, ['out'])
+            manifest = os.path.join('cache', key, 'manifest.pkl')
+            os.utime(manifest, (1000+i, 1000+i))
+
+        # Oldest entry was evicted.
+        self.assertEqual(cache.restore('a'), None)
+        self.assertEqual(sorted(os.listdir('cache')), ['b', 'c'])
+
+        # Restoring 'b' makes 'c' least recently used.
+        cache.restore('b')
+        self._write('out', 'x' * 10)
+        cache.store('d', ['out'])
+        self.assertEqual(sorted(os.listdir('cache')), ['b', 'd'])
+
+
+if __name__ == '__main__':
+    sys.argv.append('--cover-package=openmdao.util')
+    sys.argv.append('--cover-erase')
+    import nose
+    nose.runmodule()
+
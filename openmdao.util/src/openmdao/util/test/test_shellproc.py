@@ -6,8 +6,11 @@ import logging
 import os.path
 import signal
 import sys
+import time
 import unittest
 
+import nose
+
 from openmdao.util.shellproc import call, check_call, CalledProcessError, \
                                     ShellProc
 
@@ -60,6 +63,26 @@ class TestCase(unittest.TestCase):
             if os.path.exists('stderr'):
                 os.remove('stderr')
 
+    def test_wait(self):
+        logging.debug('')
+        logging.debug('test_wait')
+
+        if sys.platform == 'win32':
+            raise nose.SkipTest('Requires sleep command')
+
+        # Completion is detected without waiting for poll_delay.
+        start = time.time()
+        return_code, error_msg = call('sleep 0.1', poll_delay=10)
+        self.assertEqual(return_code, 0)
+        self.assertTrue(time.time() - start < 5)
+
+        # Timeout terminates the command.
+        start = time.time()
+        return_code, error_msg = call('sleep 30', timeout=0.5)
+        self.assertEqual(return_code, None)
+        self.assertEqual(error_msg, 'Timed out')
+        self.assertTrue(time.time() - start < 15)
+
     def test_errormsg(self):
         logging.debug('')
         logging.debug('test_errormsg')
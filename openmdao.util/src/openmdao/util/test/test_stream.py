@@ -560,6 +560,58 @@ class TestCase(unittest.TestCase):
             new_data = stream.read_floats((5, 2), order='Fortran')
         numpy.testing.assert_array_equal(new_data, arr2d)
 
+    def test_map(self):
+        logging.debug('')
+        logging.debug('test_map')
+
+        data = numpy.arange(24, dtype=numpy.float32).reshape((2, 3, 4),
+                                                             order='F')
+        for big_endian in (False, True):
+            with open(self.filename, 'wb') as out:
+                stream = Stream(out, binary=True, big_endian=big_endian,
+                                single_precision=True, unformatted=True)
+                stream.write_int(1, full_record=True)
+                stream.write_floats(data, order='Fortran', full_record=True)
+                stream.write_int(2, full_record=True)
+            with open(self.filename, 'rb') as inp:
+                stream = Stream(inp, binary=True, big_endian=big_endian,
+                                single_precision=True, unformatted=True)
+                self.assertEqual(stream.read_int(full_record=True), 1)
+                new_data = stream.map_floats(data.shape, order='Fortran',
+                                             full_record=True)
+                self.assertEqual(stream.read_int(full_record=True), 2)
+            self.assertTrue(isinstance(new_data, numpy.memmap))
+            numpy.testing.assert_array_equal(new_data, data)
+
+            # Changes aren't written to the file.
+            new_data[1, 2, 3] = 42.
+            with open(self.filename, 'rb') as inp:
+                stream = Stream(inp, binary=True, big_endian=big_endian,
+                                single_precision=True, unformatted=True)
+                stream.read_int(full_record=True)
+                numpy.testing.assert_array_equal(
+                    stream.read_floats(data.shape, order='Fortran',
+                                       full_record=True), data)
+
+            # Writing mapped data (to another file, since the mapped file
+            # must not be changed while in use).
+            filename = self.filename + '.new'
+            try:
+                with open(filename, 'wb') as out:
+                    stream = Stream(out, binary=True, single_precision=True)
+                    stream.write_floats(new_data, order='Fortran')
+                with open(filename, 'rb') as inp:
+                    stream = Stream(inp, binary=True, single_precision=True)
+                    self.assertEqual(stream.read_floats(data.size)[-1], 42.)
+            finally:
+                os.remove(filename)
+            del new_data  # Release mapped file.
+
+        with open(self.filename, 'r') as inp:
+            stream = Stream(inp)
+            assert_raises(self, 'stream.map_floats(4)', globals(), locals(),
+                          RuntimeError, 'map_floats() requires binary data')
+
     def test_misc(self):
         logging.debug('')
         logging.debug('test_misc')